@@ -1,12 +1,15 @@
 # backend/app.py
 import os
 import mysql.connector
-from flask import Flask
+from flask import Flask, jsonify
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from dotenv import load_dotenv
 
 from db import get_connection
+from utils.youtube_quota import init_quota_tracking
+from utils.youtube_retry import CircuitOpenError
+from utils.stats_collector import start_collector
 
 # import blueprint
 from routes.Unregistered_User.register_user import register_bp
@@ -24,6 +27,7 @@ from routes.Admin.subscription_plans import subscription_plans_bp
 from routes.Admin.get_users import user_bp
 from routes.Admin.manage_users import manage_users_bp
 from routes.Admin.manage_subscriptions import subscription_admin_bp
+from routes.Admin.youtube_stats import youtube_stats_bp
 
 from routes.YouTube.centrality_metrics import centrality_bp
 from routes.YouTube.video_sentiment import sentiment_bp
@@ -62,6 +66,15 @@ CORS(
 app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET", "change-me-in-env")
 jwt = JWTManager(app)
 
+# --- YouTube quota accounting (per request / route / user) ---
+init_quota_tracking(app)
+
+
+# YouTube upstream is unhealthy: fail fast instead of tying up workers behind timeouts
+@app.errorhandler(CircuitOpenError)
+def youtube_unavailable(e):
+    return jsonify({"error": str(e)}), 503
+
 # --- blueprints ---
 app.register_blueprint(register_bp)
 app.register_blueprint(payment_bp)
@@ -87,6 +100,7 @@ app.register_blueprint(enhanced_analyzer_bp)
 app.register_blueprint(user_bp, url_prefix="/api/admin")
 app.register_blueprint(subscription_admin_bp, url_prefix="/api/admin")
 app.register_blueprint(manage_users_bp, url_prefix="/api/admin")
+app.register_blueprint(youtube_stats_bp, url_prefix="/api/admin")
 
 
 @app.route("/api/ping")
@@ -139,8 +153,22 @@ def init_db():
 # Run after app is created and routes are registered (gunicorn import will execute this)
 RUN_DB_INIT = os.getenv("RUN_DB_INIT", "0").lower() in ("1", "true", "yes")
 
-if RUN_DB_INIT:
-    init_db()
+# Background snapshots of channel / video statistics (growth history for the forecasts)
+RUN_STATS_COLLECTOR = os.getenv("RUN_STATS_COLLECTOR", "0").lower() in ("1", "true", "yes")
+
+
+def run_startup_tasks():
+    if RUN_DB_INIT:
+        init_db()
+    if RUN_STATS_COLLECTOR:
+        start_collector()
+
+
+# Once per server process: `python app.py` (__main__) and gunicorn's import (app). Worker processes
+# of a multiprocessing pool (e.g. the sentiment pool) re-import the main module as __mp_main__
+# and must not create tables or start another collector.
+if __name__ != "__mp_main__":
+    run_startup_tasks()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+# models/ChannelIndex.py
+from db import get_connection
+
+
+class ChannelIndex:
+    """
+    Resolution index for YouTube channels: channel id -> uploads playlist + title,
+    plus aliases (@handles, /user/ names, /c/ custom URLs) -> channel id.
+    Lives next to YouTubeChannel but is not tied to an owner, so any channel we ever
+    looked up (including competitors) only costs quota once.
+    """
+
+    def __init__(self, youtube_channel_id, uploads_playlist_id, channel_name=None, resolved_at=None):
+        self.youtube_channel_id = youtube_channel_id
+        self.uploads_playlist_id = uploads_playlist_id
+        self.channel_name = channel_name
+        self.resolved_at = resolved_at
+
+    @classmethod
+    def from_row(cls, row):
+        if not row:
+            return None
+        return cls(
+            youtube_channel_id=row["youtube_channel_id"],
+            uploads_playlist_id=row["uploads_playlist_id"],
+            channel_name=row.get("channel_name"),
+            resolved_at=row.get("resolved_at"),
+        )
+
+    def to_dict(self):
+        return {
+            "channelId": self.youtube_channel_id,
+            "uploadsPlaylistId": self.uploads_playlist_id,
+            "channelName": self.channel_name or "",
+        }
+
+    @classmethod
+    def find_many(cls, channel_ids):
+        """Return {youtube_channel_id: ChannelIndex} for the ids that are indexed."""
+        channel_ids = [cid for cid in dict.fromkeys(channel_ids) if cid]
+        if not channel_ids:
+            return {}
+
+        conn = get_connection()
+        cursor = conn.cursor(dictionary=True)
+
+        placeholders = ",".join(["%s"] * len(channel_ids))
+        cursor.execute(f"""
+            SELECT youtube_channel_id, uploads_playlist_id, channel_name, resolved_at
+            FROM YouTubeChannelIndex
+            WHERE youtube_channel_id IN ({placeholders})
+        """, tuple(channel_ids))
+        rows = cursor.fetchall()
+
+        cursor.close()
+        conn.close()
+        return {row["youtube_channel_id"]: cls.from_row(row) for row in rows}
+
+    @staticmethod
+    def upsert_many(entries):
+        """entries: list of (youtube_channel_id, uploads_playlist_id, channel_name)."""
+        if not entries:
+            return 0
+
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.executemany("""
+            INSERT INTO YouTubeChannelIndex (youtube_channel_id, uploads_playlist_id, channel_name)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                uploads_playlist_id = VALUES(uploads_playlist_id),
+                channel_name = VALUES(channel_name)
+        """, entries)
+        conn.commit()
+        affected = cursor.rowcount
+
+        cursor.close()
+        conn.close()
+        return affected
+
+    @staticmethod
+    def find_alias(alias):
+        """Return the channel id stored for a normalized alias (e.g. '@mkbhd', 'user/google'), or None."""
+        conn = get_connection()
+        cursor = conn.cursor(dictionary=True)
+
+        cursor.execute("""
+            SELECT youtube_channel_id
+            FROM YouTubeChannelAlias
+            WHERE alias = %s
+        """, (alias,))
+        row = cursor.fetchone()
+
+        cursor.close()
+        conn.close()
+        return row["youtube_channel_id"] if row else None
+
+    @staticmethod
+    def save_alias(alias, youtube_channel_id):
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            INSERT INTO YouTubeChannelAlias (alias, youtube_channel_id)
+            VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE youtube_channel_id = VALUES(youtube_channel_id)
+        """, (alias, youtube_channel_id))
+        conn.commit()
+
+        cursor.close()
+        conn.close()
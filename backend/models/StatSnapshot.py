@@ -0,0 +1,194 @@
+# models/StatSnapshot.py
+from datetime import timedelta
+from db import get_connection
+
+# Downsampling tiers: (age in days, SQL bucket expression). Older rows keep only the
+# latest snapshot of each bucket.
+DOWNSAMPLE_TIERS = [
+    (14, "DATE(captured_at)"),
+    (180, "YEARWEEK(captured_at, 3)"),
+]
+
+
+class StatSnapshot:
+    """
+    Append-only statistics history: ChannelStatSnapshot (subscribers / views / videos per channel)
+    and VideoStatSnapshot (views / likes / comments per video). Times are UTC.
+    """
+
+    @staticmethod
+    def tracked_channel_ids():
+        """Every distinct channel linked by a user (YouTubeChannel)."""
+        conn = get_connection()
+        cursor = conn.cursor(dictionary=True)
+
+        cursor.execute("""
+            SELECT DISTINCT youtube_channel_id
+            FROM YouTubeChannel
+            WHERE youtube_channel_id IS NOT NULL AND youtube_channel_id <> ''
+        """)
+        rows = cursor.fetchall()
+
+        cursor.close()
+        conn.close()
+        return [row["youtube_channel_id"] for row in rows]
+
+    @staticmethod
+    def add_channel_snapshots(captured_at, entries):
+        """entries: list of (youtube_channel_id, subscriber_count, view_count, video_count)."""
+        if not entries:
+            return 0
+
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.executemany("""
+            INSERT IGNORE INTO ChannelStatSnapshot
+                (youtube_channel_id, captured_at, subscriber_count, view_count, video_count)
+            VALUES (%s, %s, %s, %s, %s)
+        """, [(cid, captured_at, subs, views, videos) for cid, subs, views, videos in entries])
+        conn.commit()
+        affected = cursor.rowcount
+
+        cursor.close()
+        conn.close()
+        return affected
+
+    @staticmethod
+    def add_video_snapshots(captured_at, entries):
+        """entries: list of (youtube_video_id, view_count, like_count, comment_count)."""
+        if not entries:
+            return 0
+
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.executemany("""
+            INSERT IGNORE INTO VideoStatSnapshot
+                (youtube_video_id, captured_at, view_count, like_count, comment_count)
+            VALUES (%s, %s, %s, %s, %s)
+        """, [(vid, captured_at, views, likes, comments) for vid, views, likes, comments in entries])
+        conn.commit()
+        affected = cursor.rowcount
+
+        cursor.close()
+        conn.close()
+        return affected
+
+    @staticmethod
+    def latest_captured_at():
+        """Time of the newest channel snapshot (naive UTC), or None when there is none yet."""
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT MAX(captured_at) FROM ChannelStatSnapshot")
+        row = cursor.fetchone()
+
+        cursor.close()
+        conn.close()
+        return row[0] if row else None
+
+    @staticmethod
+    def channel_series(youtube_channel_id, since=None):
+        """Snapshots of one channel, oldest first: [{captured_at, subscribers, views, videos}]."""
+        conn = get_connection()
+        cursor = conn.cursor(dictionary=True)
+
+        sql = """
+            SELECT captured_at, subscriber_count, view_count, video_count
+            FROM ChannelStatSnapshot
+            WHERE youtube_channel_id = %s
+        """
+        params = [youtube_channel_id]
+        if since is not None:
+            sql += " AND captured_at >= %s"
+            params.append(since)
+        sql += " ORDER BY captured_at"
+
+        cursor.execute(sql, tuple(params))
+        rows = cursor.fetchall()
+
+        cursor.close()
+        conn.close()
+        return [
+            {
+                "captured_at": row["captured_at"],
+                "subscribers": int(row["subscriber_count"]),
+                "views": int(row["view_count"]),
+                "videos": int(row["video_count"]),
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def video_series(youtube_video_ids, since=None):
+        """Snapshots of many videos, oldest first: {video_id: [{captured_at, views, likes, comments}]}."""
+        if not youtube_video_ids:
+            return {}
+
+        conn = get_connection()
+        cursor = conn.cursor(dictionary=True)
+
+        placeholders = ", ".join(["%s"] * len(youtube_video_ids))
+        sql = f"""
+            SELECT youtube_video_id, captured_at, view_count, like_count, comment_count
+            FROM VideoStatSnapshot
+            WHERE youtube_video_id IN ({placeholders})
+        """
+        params = list(youtube_video_ids)
+        if since is not None:
+            sql += " AND captured_at >= %s"
+            params.append(since)
+        sql += " ORDER BY youtube_video_id, captured_at"
+
+        cursor.execute(sql, tuple(params))
+        rows = cursor.fetchall()
+
+        cursor.close()
+        conn.close()
+
+        series = {}
+        for row in rows:
+            series.setdefault(row["youtube_video_id"], []).append({
+                "captured_at": row["captured_at"],
+                "views": int(row["view_count"]),
+                "likes": int(row["like_count"]),
+                "comments": int(row["comment_count"]),
+            })
+        return series
+
+    @staticmethod
+    def downsample(now):
+        """Thin old rows to one per bucket (see DOWNSAMPLE_TIERS). Returns rows deleted."""
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        deleted = 0
+        for table, key in (("ChannelStatSnapshot", "youtube_channel_id"), ("VideoStatSnapshot", "youtube_video_id")):
+            for age_days, bucket in DOWNSAMPLE_TIERS:
+                cutoff = now - timedelta(days=age_days)
+                cursor.execute(f"""
+                    DELETE s FROM {table} s
+                    JOIN (
+                        SELECT {key} AS k, {bucket} AS b, MAX(captured_at) AS keep_at
+                        FROM {table}
+                        WHERE captured_at < %s
+                        GROUP BY {key}, {bucket}
+                    ) latest ON latest.k = s.{key} AND latest.b = {bucket.replace("captured_at", "s.captured_at")}
+                    WHERE s.captured_at < %s AND s.captured_at < latest.keep_at
+                """, (cutoff, cutoff))
+                deleted += cursor.rowcount
+                conn.commit()
+
+        cursor.close()
+        conn.close()
+        return deleted
+
+    @staticmethod
+    def try_lock(name, conn):
+        """Named MySQL lock on conn so only one worker collects at a time (released with the connection)."""
+        cursor = conn.cursor()
+        cursor.execute("SELECT GET_LOCK(%s, 0)", (name,))
+        row = cursor.fetchone()
+        cursor.close()
+        return bool(row and row[0] == 1)
@@ -0,0 +1,82 @@
+# models/UploadsSync.py
+import json
+from db import get_connection
+
+
+class UploadsSync:
+    """
+    Known video ids of one uploads playlist, newest first.
+    is_complete means the list reaches the end of the playlist (nothing older to page for).
+    """
+
+    def __init__(self, uploads_playlist_id, video_ids=None, is_complete=False,
+                 full_synced_at=None, synced_at=None):
+        self.uploads_playlist_id = uploads_playlist_id
+        self.video_ids = video_ids or []
+        self.is_complete = bool(is_complete)
+        self.full_synced_at = full_synced_at
+        self.synced_at = synced_at
+
+    @property
+    def newest_video_id(self):
+        return self.video_ids[0] if self.video_ids else None
+
+    @classmethod
+    def from_row(cls, row):
+        if not row:
+            return None
+        try:
+            video_ids = json.loads(row["video_ids"] or "[]")
+        except ValueError:
+            video_ids = []
+        return cls(
+            uploads_playlist_id=row["uploads_playlist_id"],
+            video_ids=video_ids,
+            is_complete=row.get("is_complete"),
+            full_synced_at=row.get("full_synced_at"),
+            synced_at=row.get("synced_at"),
+        )
+
+    @classmethod
+    def find(cls, uploads_playlist_id):
+        conn = get_connection()
+        cursor = conn.cursor(dictionary=True)
+
+        cursor.execute("""
+            SELECT uploads_playlist_id, video_ids, is_complete, full_synced_at, synced_at
+            FROM YouTubeUploadsSync
+            WHERE uploads_playlist_id = %s
+        """, (uploads_playlist_id,))
+        row = cursor.fetchone()
+
+        cursor.close()
+        conn.close()
+        return cls.from_row(row)
+
+    @staticmethod
+    def save(uploads_playlist_id, video_ids, is_complete, full_sync=False):
+        """Upsert the id list; full_sync also moves full_synced_at forward."""
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(f"""
+            INSERT INTO YouTubeUploadsSync
+                (uploads_playlist_id, newest_video_id, video_ids, video_count, is_complete)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                newest_video_id = VALUES(newest_video_id),
+                video_ids = VALUES(video_ids),
+                video_count = VALUES(video_count),
+                is_complete = VALUES(is_complete)
+                {", full_synced_at = CURRENT_TIMESTAMP" if full_sync else ""}
+        """, (
+            uploads_playlist_id,
+            video_ids[0] if video_ids else None,
+            json.dumps(video_ids),
+            len(video_ids),
+            bool(is_complete),
+        ))
+        conn.commit()
+
+        cursor.close()
+        conn.close()
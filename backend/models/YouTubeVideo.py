@@ -0,0 +1,101 @@
+# models/YouTubeVideo.py
+from db import get_connection
+
+
+class YouTubeVideo:
+    """
+    Locally stored metadata for one video (title, publish date, thumbnail, duration).
+    A video has its snippet once published_at is set and its contentDetails once
+    duration_seconds is set.
+    """
+
+    def __init__(self, youtube_video_id, title=None, published_at=None, thumbnail_url=None,
+                 duration_seconds=None, created_at=None, updated_at=None):
+        self.youtube_video_id = youtube_video_id
+        self.title = title
+        self.published_at = published_at
+        self.thumbnail_url = thumbnail_url
+        self.duration_seconds = duration_seconds
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_row(cls, row):
+        if not row:
+            return None
+        return cls(
+            youtube_video_id=row["youtube_video_id"],
+            title=row.get("title"),
+            published_at=row.get("published_at"),
+            thumbnail_url=row.get("thumbnail_url"),
+            duration_seconds=row.get("duration_seconds"),
+            created_at=row.get("created_at"),
+            updated_at=row.get("updated_at"),
+        )
+
+    def to_dict(self):
+        """Same keys fetch_video_stats uses; parts that aren't stored yet are left out."""
+        data = {}
+        if self.published_at is not None:
+            data["title"] = self.title or ""
+            data["publishedAt"] = self.published_at
+            data["thumbnail"] = self.thumbnail_url or ""
+        if self.duration_seconds is not None:
+            data["duration"] = self.duration_seconds
+        return data
+
+    @classmethod
+    def find_many(cls, video_ids):
+        """Return {youtube_video_id: YouTubeVideo} for the ids that are stored."""
+        video_ids = [vid for vid in dict.fromkeys(video_ids) if vid]
+        if not video_ids:
+            return {}
+
+        conn = get_connection()
+        cursor = conn.cursor(dictionary=True)
+
+        found = {}
+        # Keep the IN lists to a sane size for big catalogs
+        for i in range(0, len(video_ids), 500):
+            chunk = video_ids[i: i + 500]
+            placeholders = ",".join(["%s"] * len(chunk))
+            cursor.execute(f"""
+                SELECT youtube_video_id, title, published_at, thumbnail_url, duration_seconds
+                FROM YouTubeVideo
+                WHERE youtube_video_id IN ({placeholders})
+            """, tuple(chunk))
+            for row in cursor.fetchall():
+                found[row["youtube_video_id"]] = cls.from_row(row)
+
+        cursor.close()
+        conn.close()
+        return found
+
+    @staticmethod
+    def upsert_many(entries):
+        """
+        entries: list of (youtube_video_id, title, published_at, thumbnail_url, duration_seconds).
+        NULL columns never overwrite stored values, so snippet-only and duration-only writes merge.
+        """
+        if not entries:
+            return 0
+
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.executemany("""
+            INSERT INTO YouTubeVideo
+                (youtube_video_id, title, published_at, thumbnail_url, duration_seconds)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                title = COALESCE(VALUES(title), title),
+                published_at = COALESCE(VALUES(published_at), published_at),
+                thumbnail_url = COALESCE(VALUES(thumbnail_url), thumbnail_url),
+                duration_seconds = COALESCE(VALUES(duration_seconds), duration_seconds)
+        """, entries)
+        conn.commit()
+        affected = cursor.rowcount
+
+        cursor.close()
+        conn.close()
+        return affected
@@ -0,0 +1,35 @@
+from flask import Blueprint, jsonify
+from utils.auth import require_admin
+from utils.youtube_http import get_pool_stats
+from utils.youtube_cache import response_cache
+from utils.youtube_disk_cache import disk_cache
+from utils.youtube_utils import in_flight
+from utils.youtube_quota import quota_ledger
+from utils.youtube_keys import key_pool
+from utils.youtube_retry import retry_stats
+from utils import video_catalog
+from utils.sentiment import sentiment_stats
+
+youtube_stats_bp = Blueprint("youtube_stats_bp", __name__)
+
+
+@youtube_stats_bp.get("/youtube/stats")
+@require_admin
+def youtube_stats():
+    return jsonify({
+        "pool": get_pool_stats(),
+        "cache": response_cache.stats(),
+        "disk_cache": disk_cache.stats(),
+        "single_flight": in_flight.stats(),
+        "retry": retry_stats(),
+        "video_catalog": video_catalog.stats(),
+        "sentiment": sentiment_stats(),
+    }), 200
+
+
+@youtube_stats_bp.get("/youtube/quota")
+@require_admin
+def youtube_quota():
+    stats = quota_ledger.stats()
+    stats["key_pool"] = key_pool.stats()
+    return jsonify(stats), 200
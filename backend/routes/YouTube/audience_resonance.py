@@ -3,108 +3,27 @@
 from flask import Blueprint, request, jsonify
 from collections import Counter, defaultdict
 from datetime import datetime, timedelta
-import re
+import heapq
 import numpy as np
-from utils.youtube_utils import (
-    extract_channel_id,
-    fetch_basic_channel_stats,
-    fetch_video_ids,
-    fetch_video_stats,
-    fetch_video_comments,
-)
+from utils.channel_dataset import ChannelDataset
+from utils.concurrency import channel_map
+from utils.sentiment import sentiment_labels, ANALYZER_SENTIMENT_ENGINE
+from utils.topic_index import TopicIndex
+from utils.comment_features import extract_comment_features, count_flag, QUESTION, ACTION, COMMUNITY
 
 enhanced_analyzer_bp = Blueprint("enhanced_analyzer", __name__, url_prefix="/api/youtube")
 
 # ========================= IMPROVED HELPER FUNCTIONS =========================
 
-def extract_meaningful_topics(videos):
+def extract_meaningful_topics(videos, limit=20):
     """
     Extract meaningful topics from video titles using NLP techniques.
     Filters out stop words and generic terms to find actual content topics.
+    Multi-channel callers should share one TopicIndex instead (see competitor_gaps).
     """
-    # Comprehensive stop words list
-    stop_words = {
-        'about', 'with', 'what', 'this', 'that', 'from', 'have', 'been', 
-        'into', 'your', 'more', 'than', 'when', 'where', 'which', 'their',
-        'there', 'these', 'those', 'will', 'would', 'could', 'should',
-        'make', 'made', 'want', 'very', 'just', 'some', 'also', 'here',
-        'they', 'them', 'then', 'than', 'only', 'other', 'such', 'even',
-        'most', 'much', 'many', 'well', 'back', 'down', 'over', 'after',
-        'before', 'through', 'during', 'while', 'since', 'until', 'because',
-        'video', 'videos', 'watch', 'watching', 'episode', 'part', 'full',
-        'new', 'latest', 'updated', 'best', 'top', 'must', 'need', 'every',
-        'how', 'why', 'can', 'you', 'your', 'the', 'and', 'for', 'are',
-        'all', 'any', 'has', 'had', 'but', 'not', 'was', 'our', 'out'
-    }
-    
-    # Generic promotional words to filter
-    promotional_words = {
-        'subscribe', 'like', 'share', 'comment', 'click', 'free', 'download',
-        'link', 'description', 'channel', 'please', 'don\'t', 'forget'
-    }
-    
-    stop_words.update(promotional_words)
-    
-    all_words = []
-    all_bigrams = []
-    all_trigrams = []
-    
-    for video in videos:
-        title = video.get("title", "").lower()
-        # Remove special characters but keep spaces
-        title = re.sub(r'[^\w\s-]', '', title)
-        words = title.split()
-        
-        # Single words (4+ characters, not stop words)
-        for word in words:
-            if len(word) >= 4 and word not in stop_words and word.isalpha():
-                all_words.append(word)
-        
-        # Bigrams (2-word phrases)
-        for i in range(len(words) - 1):
-            if words[i] not in stop_words or words[i+1] not in stop_words:
-                bigram = f"{words[i]} {words[i+1]}"
-                # Filter bigrams that are meaningful
-                if len(bigram) > 7 and not all(w in stop_words for w in words[i:i+2]):
-                    all_bigrams.append(bigram)
-        
-        # Trigrams (3-word phrases) - for specialized topics
-        for i in range(len(words) - 2):
-            if not all(w in stop_words for w in words[i:i+3]):
-                trigram = f"{words[i]} {words[i+1]} {words[i+2]}"
-                if len(trigram) > 10:
-                    all_trigrams.append(trigram)
-    
-    # Count frequencies
-    word_freq = Counter(all_words)
-    bigram_freq = Counter(all_bigrams)
-    trigram_freq = Counter(all_trigrams)
-    
-    # Combine all topics with frequency threshold
-    topics = []
-    
-    # Trigrams (most specific) - require 2+ occurrences
-    for phrase, count in trigram_freq.items():
-        if count >= 2:
-            topics.append((phrase, count))
-    
-    # Bigrams - require 3+ occurrences
-    for phrase, count in bigram_freq.items():
-        if count >= 3:
-            # Don't add if already covered by a trigram
-            if not any(phrase in t[0] for t in topics):
-                topics.append((phrase, count))
-    
-    # Single words - require 5+ occurrences
-    for word, count in word_freq.items():
-        if count >= 5:
-            # Don't add if already covered by a phrase
-            if not any(word in t[0] for t in topics):
-                topics.append((word, count))
-    
-    # Sort by frequency and return top 20
-    topics.sort(key=lambda x: x[1], reverse=True)
-    return topics[:20]
+    index = TopicIndex()
+    index.add(0, videos)
+    return index.topics(0, limit=limit)
 
 def classify_content_type(video):
     """Classify video by content type"""
@@ -178,68 +97,26 @@ def engagement_quality():
     if not channel_urls:
         return jsonify({"error": "No valid channel URLs provided"}), 400
 
-    # Determine minimum video count for fair sampling
-    channel_video_counts = []
-    
-    for channel_url in channel_urls:
-        channel_id = extract_channel_id(channel_url)
-        if not channel_id:
-            continue
-            
-        basic = fetch_basic_channel_stats(channel_id)
-        if not basic:
-            continue
-            
-        playlist_id = basic["uploadsPlaylistId"]
-        video_ids = fetch_video_ids(playlist_id, max_videos)
-        channel_video_counts.append(len(video_ids))
-    
-    # Use minimum video count across all channels for fair comparison
-    if channel_video_counts:
-        standardized_video_count = min(min(channel_video_counts), max_videos)
-    else:
-        standardized_video_count = max_videos
-
-    all_channels_quality = []
+    dataset = ChannelDataset(channel_urls, max_videos)
+    standardized_video_count = dataset.sample_size
 
-    for idx, channel_url in enumerate(channel_urls):
-        is_primary = (idx == 0)
-        channel_id = extract_channel_id(channel_url)
-        
-        if not channel_id:
-            continue
+    def analyze_channel_quality(entry):
+        is_primary = entry.is_primary
+        channel_id = entry.channel_id
+        channel_name = entry.channel_name
+        channel_url = entry.url
 
-        basic = fetch_basic_channel_stats(channel_id)
-        if not basic:
-            continue
-
-        channel_name = basic.get("channelName", f"Channel {idx + 1}")
-        playlist_id = basic["uploadsPlaylistId"]
-        
-        # Use standardized count for all channels
-        video_ids = fetch_video_ids(playlist_id, standardized_video_count)
-        
-        if not video_ids:
-            continue
-
-        videos = fetch_video_stats(video_ids, with_snippet=True)
-        
-        # Fetch comments
-        all_comments = []
-        for video_id, video in zip(video_ids[:standardized_video_count], videos):
-            comments = fetch_video_comments(video_id, max_comments_per_video)
-            for comment in comments:
-                comment["video_id"] = video_id
-                comment["video_title"] = video.get("title", "")
-            all_comments.extend(comments)
+        all_comments = dataset.comments(entry, max_comments_per_video)
 
         if not all_comments:
-            continue
+            return None
 
         # ENGAGEMENT QUALITY METRICS
+        # One pass per comment: lowercase / split once, all phrase lists in one regex
+        features = extract_comment_features(all_comments)
         
         # 1. Comment Depth Analysis
-        comment_lengths = [len(c.get("text", "").split()) for c in all_comments]
+        comment_lengths = [f.word_count for f in features]
         avg_comment_length = sum(comment_lengths) / len(comment_lengths) if comment_lengths else 0
         
         depth_distribution = {
@@ -249,92 +126,43 @@ def engagement_quality():
         }
         
         # 2. Question Rate
-        questions = [c for c in all_comments if "?" in c.get("text", "")]
-        question_rate = len(questions) / len(all_comments) * 100 if all_comments else 0
+        question_rate = count_flag(features, QUESTION) / len(all_comments) * 100 if all_comments else 0
         
         # 3. Action Indicators
-        action_words = ["tried", "bought", "purchased", "using", "implemented", "applied", "started", "watching", "subscribed"]
-        action_comments = [
-            c for c in all_comments 
-            if any(word in c.get("text", "").lower() for word in action_words)
-        ]
-        action_rate = len(action_comments) / len(all_comments) * 100 if all_comments else 0
+        action_rate = count_flag(features, ACTION) / len(all_comments) * 100 if all_comments else 0
         
         # 4. Community Building Indicators
-        community_indicators = ["@", "agree with", "like you said", "same here", "me too", "also"]
-        community_comments = [
-            c for c in all_comments
-            if any(indicator in c.get("text", "").lower() for indicator in community_indicators)
-        ]
-        community_rate = len(community_comments) / len(all_comments) * 100 if all_comments else 0
-        
-        # 5. Sentiment Analysis (positive, neutral, negative)
-        positive_words = {
-            "love", "great", "awesome", "amazing", "excellent", "perfect", "best",
-            "fantastic", "wonderful", "incredible", "brilliant", "thanks", "helpful",
-            "appreciate", "useful", "informative", "inspiring", "beautiful", "nice",
-            "good", "better", "enjoyed", "loved", "outstanding", "superb"
-        }
-        negative_words = {
-            "bad", "terrible", "awful", "horrible", "worst", "hate", "disappointed",
-            "poor", "useless", "waste", "boring", "confusing", "wrong", "misleading",
-            "disappointing", "clickbait", "dislike", "annoying", "stupid", "sucks", "trash"
-        }
-        spam_indicators = {"first", "like if", "subscribe", "check out my", "click here", "🔥" * 3}
+        community_rate = count_flag(features, COMMUNITY) / len(all_comments) * 100 if all_comments else 0
         
-        def analyze_sentiment(text):
-            """Classify sentiment of a comment"""
-            text_lower = text.lower()
-            words = set(text_lower.split())
-            
-            pos_count = len(words & positive_words)
-            neg_count = len(words & negative_words)
-            
-            if pos_count > neg_count:
-                return "positive"
-            elif neg_count > pos_count:
-                return "negative"
-            else:
-                return "neutral"
-        
-        meaningful_comments = []
-        spam_comments = []
+        # 5. Sentiment Analysis (positive, neutral, negative) - shared engine, see utils/sentiment.py
+        # Spam / very short comments are left out
+        meaningful = [(c, f) for c, f in zip(all_comments, features) if f.meaningful]
+        meaningful_comments = [c for c, _ in meaningful]
         sentiment_counts = {"positive": 0, "negative": 0, "neutral": 0}
         categorized_comments = []
         
         # Track sentiment over time - group by month
         sentiment_by_month = defaultdict(lambda: {"positive": 0, "negative": 0, "neutral": 0, "total": 0})
-        
-        for comment in all_comments:
-            text = comment.get("text", "")
-            text_lower = text.lower()
-            words = set(text_lower.split())
+
+        # One batch for all meaningful comments of this channel
+        meaningful_sentiments = sentiment_labels(
+            [c.get("text", "") for c in meaningful_comments], engine=ANALYZER_SENTIMENT_ENGINE
+        )
+
+        for (comment, feature), sentiment in zip(meaningful, meaningful_sentiments):
+            sentiment_counts[sentiment] += 1
             
-            # Check if spam
-            if any(spam in text_lower for spam in spam_indicators) or len(words) < 3:
-                spam_comments.append(comment)
-            else:
-                meaningful_comments.append(comment)
-                sentiment = analyze_sentiment(text)
-                sentiment_counts[sentiment] += 1
-                
-                # Track sentiment by month
-                published_at = comment.get("publishedAt", "")
-                if published_at:
-                    try:
-                        dt = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-                        month_key = dt.strftime("%Y-%m")
-                        sentiment_by_month[month_key][sentiment] += 1
-                        sentiment_by_month[month_key]["total"] += 1
-                    except:
-                        pass
-                
-                categorized_comments.append({
-                    "text": text,
-                    "sentiment": sentiment,
-                    "video_title": comment.get("video_title", ""),
-                    "publishedAt": comment.get("publishedAt", "")
-                })
+            # Track sentiment by month
+            if feature.month:
+                sentiment_by_month[feature.month][sentiment] += 1
+                sentiment_by_month[feature.month]["total"] += 1
+            
+            categorized_comments.append({
+                "text": comment.get("text", ""),
+                "sentiment": sentiment,
+                "video_title": comment.get("video_title", ""),
+                "publishedAt": comment.get("publishedAt", "")
+            })
         
         # Create sentiment timeline (only if we have data)
         sentiment_timeline = []
@@ -432,13 +260,13 @@ def engagement_quality():
             })
 
         # Top quality comments (real examples from data)
-        top_quality_comments = sorted(
-            meaningful_comments,
-            key=lambda c: len(c.get("text", "").split()),
-            reverse=True
-        )[:5]
+        top_quality_comments = heapq.nlargest(
+            5,
+            zip(meaningful, meaningful_sentiments),
+            key=lambda pair: pair[0][1].word_count
+        )
 
-        all_channels_quality.append({
+        return {
             "channel_url": channel_url,
             "channel_id": channel_id,
             "channel_name": channel_name,
@@ -463,14 +291,17 @@ def engagement_quality():
             "top_quality_comments": [
                 {
                     "text": c.get("text", ""),
-                    "word_count": len(c.get("text", "").split()),
+                    "word_count": feature.word_count,
                     "video_title": c.get("video_title", ""),
-                    "sentiment": analyze_sentiment(c.get("text", ""))
+                    "sentiment": sentiment
                 }
-                for c in top_quality_comments
+                for (c, feature), sentiment in top_quality_comments
             ],
             "insights": insights
-        })
+        }
+
+    # Channels run concurrently; results keep request order (primary first)
+    all_channels_quality = [r for r in channel_map(analyze_channel_quality, dataset.channels()) if r]
 
     if not all_channels_quality:
         return jsonify({"error": "No engagement quality data found"}), 404
@@ -534,9 +365,9 @@ def engagement_quality():
         "has_comparison": len(all_channels_quality) > 1,
         "sampling_metadata": {
             "videos_per_channel": standardized_video_count,
-            "is_standardized": len(set(channel_video_counts)) > 1 if channel_video_counts else False,
-            "original_counts": dict(zip(channel_urls[:len(channel_video_counts)], channel_video_counts))
-        } if len(channel_video_counts) > 0 else {}
+            "is_standardized": dataset.is_standardized,
+            "original_counts": dataset.original_counts
+        } if dataset.video_counts else {}
     }), 200
 
 
@@ -920,50 +751,17 @@ def retention_heatmap():
     if not channel_urls:
         return jsonify({"error": "No valid channel URLs provided"}), 400
 
-    # Determine minimum video count for fair sampling
-    channel_video_counts = []
-    
-    for channel_url in channel_urls:
-        channel_id = extract_channel_id(channel_url)
-        if not channel_id:
-            continue
-            
-        basic = fetch_basic_channel_stats(channel_id)
-        if not basic:
-            continue
-            
-        playlist_id = basic["uploadsPlaylistId"]
-        video_ids = fetch_video_ids(playlist_id, max_videos)
-        channel_video_counts.append(len(video_ids))
-    
-    # Use minimum video count across all channels
-    if channel_video_counts:
-        standardized_video_count = min(min(channel_video_counts), max_videos)
-    else:
-        standardized_video_count = max_videos
-
-    all_channels_retention = []
-
-    for idx, channel_url in enumerate(channel_urls):
-        is_primary = (idx == 0)
-        channel_id = extract_channel_id(channel_url)
-        
-        if not channel_id:
-            continue
+    dataset = ChannelDataset(channel_urls, max_videos)
+    standardized_video_count = dataset.sample_size
 
-        basic = fetch_basic_channel_stats(channel_id)
-        if not basic:
-            continue
-
-        channel_name = basic.get("channelName", f"Channel {idx + 1}")
-        playlist_id = basic["uploadsPlaylistId"]
-        video_ids = fetch_video_ids(playlist_id, standardized_video_count)
-        
-        if not video_ids:
-            continue
+    def analyze_channel_retention(entry):
+        is_primary = entry.is_primary
+        channel_id = entry.channel_id
+        channel_name = entry.channel_name
+        channel_url = entry.url
 
         # IMPROVED: Fetch videos with duration data
-        videos = fetch_video_stats(video_ids, with_snippet=True, with_duration=True)
+        videos = dataset.videos(entry, with_duration=True)
         
         # Calculate engagement rate and ratios for each video
         for video in videos:
@@ -1134,7 +932,7 @@ def retention_heatmap():
                 "impact": "high"
             })
 
-        all_channels_retention.append({
+        return {
             "channel_url": channel_url,
             "channel_id": channel_id,
             "channel_name": channel_name,
@@ -1158,7 +956,10 @@ def retention_heatmap():
                 "avg_comment_ratio": round(avg_comment_ratio, 5),
                 "estimation_method": "multi-factor engagement analysis"
             }
-        })
+        }
+
+    # Channels run concurrently; results keep request order (primary first)
+    all_channels_retention = [r for r in channel_map(analyze_channel_retention, dataset.channels()) if r]
 
     if not all_channels_retention:
         return jsonify({"error": "No retention data found"}), 404
@@ -1172,9 +973,9 @@ def retention_heatmap():
         "has_comparison": len(all_channels_retention) > 1,
         "sampling_metadata": {
             "videos_per_channel": standardized_video_count,
-            "is_standardized": len(set(channel_video_counts)) > 1 if channel_video_counts else False,
-            "original_counts": dict(zip(channel_urls[:len(channel_video_counts)], channel_video_counts))
-        } if len(channel_video_counts) > 0 else {}
+            "is_standardized": dataset.is_standardized,
+            "original_counts": dataset.original_counts
+        } if dataset.video_counts else {}
     }), 200
 
 
@@ -1195,52 +996,29 @@ def competitor_gaps():
     except ValueError:
         max_videos = 50
 
+    # "count" (default) or "tfidf": rank each channel's topics against all linked channels
+    topic_scoring = request.args.get("topicScoring", "count").lower()
+
     channel_urls = [url.strip() for url in urls_param.split(",") if url.strip()]
     
     if len(channel_urls) < 2:
         return jsonify({"error": "Need at least 2 channels for gap analysis"}), 400
 
-    # Determine minimum video count
-    channel_video_counts = []
-    for channel_url in channel_urls:
-        channel_id = extract_channel_id(channel_url)
-        if not channel_id:
-            continue
-        basic = fetch_basic_channel_stats(channel_id)
-        if not basic:
-            continue
-        playlist_id = basic["uploadsPlaylistId"]
-        video_ids = fetch_video_ids(playlist_id, max_videos)
-        channel_video_counts.append(len(video_ids))
-    
-    standardized_video_count = min(min(channel_video_counts), max_videos) if channel_video_counts else max_videos
-
-    all_channels_data = []
-
-    for idx, channel_url in enumerate(channel_urls):
-        is_primary = (idx == 0)
-        channel_id = extract_channel_id(channel_url)
-        
-        if not channel_id:
-            continue
+    dataset = ChannelDataset(channel_urls, max_videos)
+    standardized_video_count = dataset.sample_size
 
-        basic = fetch_basic_channel_stats(channel_id)
-        if not basic:
-            continue
+    topic_index = TopicIndex()
 
-        channel_name = basic.get("channelName", f"Channel {idx + 1}")
-        playlist_id = basic["uploadsPlaylistId"]
-        
-        # Use standardized count
-        video_ids = fetch_video_ids(playlist_id, standardized_video_count)
-        
-        if not video_ids:
-            continue
+    def analyze_channel_gaps(entry):
+        is_primary = entry.is_primary
+        channel_id = entry.channel_id
+        channel_name = entry.channel_name
+        channel_url = entry.url
 
-        videos = fetch_video_stats(video_ids, with_snippet=True)
+        videos = dataset.videos(entry)
         
-        # Extract real topics from video titles
-        meaningful_topics = extract_meaningful_topics(videos)
+        # Index real topics from video titles (picked once every channel is indexed)
+        topic_index.add(entry.index, videos)
         
         # Content type distribution - real data
         content_types = [classify_content_type(v) for v in videos]
@@ -1275,12 +1053,12 @@ def competitor_gaps():
         avg_views = sum(v.get("views", 0) for v in videos) / len(videos) if videos else 0
         avg_engagement = sum(v["engagement_rate"] for v in videos) / len(videos) if videos else 0
         
-        all_channels_data.append({
+        return {
             "channel_url": channel_url,
             "channel_id": channel_id,
             "channel_name": channel_name,
             "is_primary": is_primary,
-            "topics": meaningful_topics,
+            "topic_key": entry.index,
             "content_types": dict(content_type_dist),
             "avg_posting_frequency_days": round(avg_posting_frequency, 1),
             "videos_per_month": round(30 / avg_posting_frequency, 1) if avg_posting_frequency > 0 else 0,
@@ -1288,11 +1066,17 @@ def competitor_gaps():
             "avg_engagement": round(avg_engagement, 4),
             "total_videos": len(videos),
             "videos_analyzed": standardized_video_count
-        })
+        }
+
+    # Channels run concurrently; results keep request order (primary first)
+    all_channels_data = [r for r in channel_map(analyze_channel_gaps, dataset.channels()) if r]
 
     if len(all_channels_data) < 2:
         return jsonify({"error": "Need data from at least 2 channels"}), 404
 
+    for channel in all_channels_data:
+        channel["topics"] = topic_index.topics(channel.pop("topic_key"), scoring=topic_scoring)
+
     primary = all_channels_data[0]
     competitors = all_channels_data[1:]
 
@@ -1449,6 +1233,6 @@ def competitor_gaps():
         "sampling_metadata": {
             "videos_per_channel": standardized_video_count,
             "ensures_fair_comparison": True,
-            "original_counts": dict(zip(channel_urls[:len(channel_video_counts)], channel_video_counts))
-        } if len(channel_video_counts) > 0 else {}
+            "original_counts": dataset.original_counts
+        } if dataset.video_counts else {}
     }), 200
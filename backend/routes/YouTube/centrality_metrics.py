@@ -1,7 +1,7 @@
 from flask import Blueprint, request, jsonify
+from utils.channel_index import get_uploads_playlist_id
 from utils.youtube_utils import (
     extract_channel_id,
-    fetch_basic_channel_stats,
     fetch_video_ids,
     fetch_video_stats
 )
@@ -264,8 +264,9 @@ def centrality_metrics():
 
     try:
         # Fetch videos
-        basic = fetch_basic_channel_stats(channel_id)
-        playlist_id = basic["uploadsPlaylistId"]
+        playlist_id = get_uploads_playlist_id(channel_id)
+        if not playlist_id:
+            return jsonify({"error": "Channel not found"}), 404
         video_ids = fetch_video_ids(playlist_id, 50)
         videos = fetch_video_stats(video_ids, with_snippet=True)
 
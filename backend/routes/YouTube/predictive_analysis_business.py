@@ -2,75 +2,98 @@
 
 from flask import Blueprint, request, jsonify
 import math
-from datetime import datetime, timedelta
 from utils.youtube_utils import (
     extract_channel_id,
     fetch_basic_channel_stats,
     fetch_video_ids,
     fetch_video_stats,
 )
+from utils.growth_history import (
+    load_channel_history,
+    observed_subscriber_growth,
+    observed_view_momentum,
+    load_video_history,
+    observed_video_velocity,
+)
+from utils.concurrency import channel_map
+from utils.video_frame import VideoFrame
 
 predictive_bp = Blueprint("predictive_analysis", __name__, url_prefix="/api/youtube")
 
 
 def calculate_engagement_rate(videos):
-    """Calculate engagement rate from video statistics"""
-    if not videos:
+    """Calculate engagement rate from video statistics (list of videos or VideoFrame)"""
+    frame = VideoFrame.of(videos)
+    if not len(frame):
         return 0
     
-    total_views = sum(v.get("views", 0) for v in videos)
-    total_engagement = sum(v.get("likes", 0) + v.get("comments", 0) for v in videos)
+    total_views = int(frame.views.sum())
+    total_engagement = int(frame.likes.sum() + frame.comments.sum())
     
     return total_engagement / total_views if total_views > 0 else 0
 
 
 def calculate_avg_views(videos):
     """Calculate average views per video"""
-    if not videos:
+    frame = VideoFrame.of(videos)
+    if not len(frame):
         return 0
-    return sum(v.get("views", 0) for v in videos) / len(videos)
+    return float(frame.views.mean())
 
 
-def predict_subscriber_growth(videos, current_subscribers):
+def _project_subscriber_growth(current_subscribers, monthly_growth_rate, confidence, trend_strength, source):
+    """Compound a monthly growth rate into the 3/6/12 month prediction payload"""
+    predicted_3_months = int(current_subscribers * ((1 + monthly_growth_rate) ** 3))
+    predicted_6_months = int(current_subscribers * ((1 + monthly_growth_rate) ** 6))
+    predicted_12_months = int(current_subscribers * ((1 + monthly_growth_rate) ** 12))
+    
+    growth_3_months = predicted_3_months - current_subscribers
+    growth_6_months = predicted_6_months - current_subscribers
+    growth_12_months = predicted_12_months - current_subscribers
+    
+    monthly_avg_growth = int(growth_6_months / 6)
+    growth_rate_6_months = (growth_6_months / current_subscribers * 100) if current_subscribers > 0 else 0
+    
+    return {
+        "predicted_3_months": predicted_3_months,
+        "predicted_6_months": predicted_6_months,
+        "predicted_12_months": predicted_12_months,
+        "growth_3_months": growth_3_months,
+        "growth_6_months": growth_6_months,
+        "growth_12_months": growth_12_months,
+        "monthly_avg_growth": monthly_avg_growth,
+        "growth_rate_6_months": round(growth_rate_6_months, 2),
+        "confidence": confidence,
+        "trend_strength": int(trend_strength),
+        "monthly_growth_rate": round(monthly_growth_rate * 100, 2),
+        "source": source
+    }
+
+
+def predict_subscriber_growth(videos, current_subscribers, history=None):
     """
     Predict subscriber growth for 3, 6, and 12 months
     Returns detailed growth predictions with confidence levels
+    With enough stored snapshots (history) the observed growth rate is used,
+    otherwise the rate is estimated from recent video performance
     """
-    if not videos or len(videos) < 3:
-        return {
-            "predicted_3_months": current_subscribers,
-            "predicted_6_months": current_subscribers,
-            "predicted_12_months": current_subscribers,
-            "growth_3_months": 0,
-            "growth_6_months": 0,
-            "growth_12_months": 0,
-            "monthly_avg_growth": 0,
-            "growth_rate_6_months": 0,
-            "confidence": "low",
-            "trend_strength": 0,
-            "monthly_growth_rate": 0
-        }
+    observed = observed_subscriber_growth(history)
+    if observed:
+        momentum = observed_view_momentum(history)
+        trend_strength = min(100, max(0, 50 + momentum)) if momentum is not None else 50
+        return _project_subscriber_growth(
+            current_subscribers,
+            observed["monthly_growth_rate"],
+            observed["confidence"],
+            trend_strength,
+            "history"
+        )
     
-    # Get videos with dates
-    dated_videos = []
-    for v in videos:
-        pub = v.get("publishedAt")
-        if pub:
-            try:
-                date = datetime.fromisoformat(pub.replace("Z", "+00:00"))
-                engagement = 0
-                views = v.get("views", 0)
-                if views > 0:
-                    engagement = (v.get("likes", 0) + v.get("comments", 0)) / views
-                dated_videos.append({
-                    "date": date,
-                    "views": views,
-                    "engagement": engagement
-                })
-            except:
-                pass
+    frame = VideoFrame.of(videos)
+    # Videos with dates, oldest first
+    dated = frame.dated() if len(frame) >= 3 else frame
     
-    if len(dated_videos) < 3:
+    if len(dated) < 3:
         return {
             "predicted_3_months": current_subscribers,
             "predicted_6_months": current_subscribers,
@@ -85,29 +108,23 @@ def predict_subscriber_growth(videos, current_subscribers):
             "monthly_growth_rate": 0
         }
     
-    dated_videos.sort(key=lambda x: x["date"])
-    
     # Calculate time span
-    first_date = dated_videos[0]["date"]
-    last_date = dated_videos[-1]["date"]
-    days_span = (last_date - first_date).days
+    days_span = dated.span_days()
     
     if days_span < 30:
         confidence = "low"
-        months_of_data = days_span / 30
     elif days_span < 90:
         confidence = "medium"
-        months_of_data = days_span / 30
     else:
         confidence = "high"
-        months_of_data = days_span / 30
     
     # Calculate growth trend using linear regression on recent performance
-    recent_videos = dated_videos[-15:] if len(dated_videos) > 15 else dated_videos
+    recent = dated.take(slice(-15, None))
+    recent_views = recent.views.astype(float)
     
     # Estimate historical subscriber count based on view patterns
-    avg_engagement = sum(v["engagement"] for v in recent_videos) / len(recent_videos)
-    avg_views = sum(v["views"] for v in recent_videos) / len(recent_videos)
+    avg_engagement = float(recent.engagement.mean())
+    avg_views = float(recent_views.mean())
     
     # Estimate monthly growth rate based on video performance
     # Better engagement and views = higher growth rate
@@ -131,12 +148,13 @@ def predict_subscriber_growth(videos, current_subscribers):
     monthly_growth_rate = base_growth_rate + engagement_boost + views_boost
     
     # Calculate trend strength (0-100)
-    recent_half = recent_videos[len(recent_videos)//2:]
-    older_half = recent_videos[:len(recent_videos)//2]
+    half = len(recent_views) // 2
+    recent_half = recent_views[half:]
+    older_half = recent_views[:half]
     
     if len(recent_half) > 0 and len(older_half) > 0:
-        recent_avg_views = sum(v["views"] for v in recent_half) / len(recent_half)
-        older_avg_views = sum(v["views"] for v in older_half) / len(older_half)
+        recent_avg_views = float(recent_half.mean())
+        older_avg_views = float(older_half.mean())
         
         if older_avg_views > 0:
             trend_change = ((recent_avg_views - older_avg_views) / older_avg_views) * 100
@@ -153,62 +171,18 @@ def predict_subscriber_growth(videos, current_subscribers):
         monthly_growth_rate *= 0.7  # Declining growth
     
     # Calculate predictions using compound growth
-    predicted_3_months = int(current_subscribers * ((1 + monthly_growth_rate) ** 3))
-    predicted_6_months = int(current_subscribers * ((1 + monthly_growth_rate) ** 6))
-    predicted_12_months = int(current_subscribers * ((1 + monthly_growth_rate) ** 12))
-    
-    growth_3_months = predicted_3_months - current_subscribers
-    growth_6_months = predicted_6_months - current_subscribers
-    growth_12_months = predicted_12_months - current_subscribers
-    
-    monthly_avg_growth = int(growth_6_months / 6)
-    growth_rate_6_months = (growth_6_months / current_subscribers * 100) if current_subscribers > 0 else 0
-    
-    return {
-        "predicted_3_months": predicted_3_months,
-        "predicted_6_months": predicted_6_months,
-        "predicted_12_months": predicted_12_months,
-        "growth_3_months": growth_3_months,
-        "growth_6_months": growth_6_months,
-        "growth_12_months": growth_12_months,
-        "monthly_avg_growth": monthly_avg_growth,
-        "growth_rate_6_months": round(growth_rate_6_months, 2),
-        "confidence": confidence,
-        "trend_strength": int(trend_strength),
-        "monthly_growth_rate": round(monthly_growth_rate * 100, 2)
-    }
+    return _project_subscriber_growth(current_subscribers, monthly_growth_rate, confidence, trend_strength, "videos")
 
 
 def predict_engagement_growth(videos, current_engagement):
     """
     Predict how engagement will change over the next 6 months
     """
-    if not videos or len(videos) < 5:
-        return {
-            "current_engagement_rate": current_engagement,
-            "predicted_6m_engagement": current_engagement,
-            "engagement_change": 0,
-            "engagement_change_percent": 0,
-            "trend": "stable",
-            "factors": []
-        }
+    frame = VideoFrame.of(videos)
+    # Engagement per dated video, oldest first
+    engagement = frame.dated().engagement if len(frame) >= 5 else frame.engagement
     
-    # Get videos with dates and engagement
-    dated_videos = []
-    for v in videos:
-        pub = v.get("publishedAt")
-        if pub:
-            try:
-                date = datetime.fromisoformat(pub.replace("Z", "+00:00"))
-                views = v.get("views", 0)
-                engagement = 0
-                if views > 0:
-                    engagement = (v.get("likes", 0) + v.get("comments", 0)) / views
-                dated_videos.append({"date": date, "engagement": engagement})
-            except:
-                pass
-    
-    if len(dated_videos) < 5:
+    if len(engagement) < 5:
         return {
             "current_engagement_rate": current_engagement,
             "predicted_6m_engagement": current_engagement,
@@ -218,17 +192,15 @@ def predict_engagement_growth(videos, current_engagement):
             "factors": []
         }
     
-    dated_videos.sort(key=lambda x: x["date"])
-    
     # Split into thirds to analyze trend
-    third = len(dated_videos) // 3
-    old_third = dated_videos[:third]
-    mid_third = dated_videos[third:2*third]
-    recent_third = dated_videos[2*third:]
+    third = len(engagement) // 3
+    old_third = engagement[:third]
+    mid_third = engagement[third:2*third]
+    recent_third = engagement[2*third:]
     
-    avg_old = sum(v["engagement"] for v in old_third) / len(old_third) if old_third else 0
-    avg_mid = sum(v["engagement"] for v in mid_third) / len(mid_third) if mid_third else 0
-    avg_recent = sum(v["engagement"] for v in recent_third) / len(recent_third) if recent_third else 0
+    avg_old = float(old_third.mean()) if len(old_third) else 0
+    avg_mid = float(mid_third.mean()) if len(mid_third) else 0
+    avg_recent = float(recent_third.mean()) if len(recent_third) else 0
     
     # Calculate trend
     if avg_old > 0:
@@ -274,66 +246,63 @@ def predict_engagement_growth(videos, current_engagement):
     }
 
 
-def calculate_growth_momentum(videos):
+def _momentum_from_change(change_percent):
+    if change_percent > 15:
+        trend = "growing"
+        score = min(100, 65 + change_percent)
+    elif change_percent < -15:
+        trend = "declining"
+        score = max(0, 50 + change_percent)
+    else:
+        trend = "stable"
+        score = 50 + change_percent
+    
+    return {"trend": trend, "score": int(score)}
+
+
+def calculate_growth_momentum(videos, history=None):
     """
     Calculate if channel is growing, stable, or declining
     Returns: 'growing', 'stable', 'declining' and a score 0-100
+    Prefers the channel's stored view history (daily view gain, newer vs older half)
     """
-    if not videos or len(videos) < 5:
-        return {"trend": "stable", "score": 50}
+    change_percent = observed_view_momentum(history)
+    if change_percent is not None:
+        return _momentum_from_change(change_percent)
     
-    dated_videos = []
-    for v in videos:
-        pub = v.get("publishedAt")
-        if pub:
-            try:
-                date = datetime.fromisoformat(pub.replace("Z", "+00:00"))
-                dated_videos.append({"date": date, "views": v.get("views", 0)})
-            except:
-                pass
+    frame = VideoFrame.of(videos)
+    dated = frame.dated() if len(frame) >= 5 else frame
     
-    if len(dated_videos) < 5:
+    if len(dated) < 5:
         return {"trend": "stable", "score": 50}
     
-    dated_videos.sort(key=lambda x: x["date"])
-    recent = dated_videos[-10:]
+    recent = dated.views[-10:].astype(float)
     
     # Compare recent half vs older half
     mid = len(recent) // 2
-    old_avg = sum(v["views"] for v in recent[:mid]) / mid if mid > 0 else 0
-    new_avg = sum(v["views"] for v in recent[mid:]) / (len(recent) - mid) if len(recent) - mid > 0 else 0
+    old_avg = float(recent[:mid].mean()) if mid > 0 else 0
+    new_avg = float(recent[mid:].mean()) if len(recent) - mid > 0 else 0
     
     if old_avg == 0:
         return {"trend": "stable", "score": 50}
     
     change_percent = ((new_avg - old_avg) / old_avg) * 100
-    
-    if change_percent > 15:
-        trend = "growing"
-        score = min(100, 65 + change_percent)
-    elif change_percent < -15:
-        trend = "declining"
-        score = max(0, 50 + change_percent)
-    else:
-        trend = "stable"
-        score = 50 + change_percent
-    
-    return {"trend": trend, "score": int(score)}
+    return _momentum_from_change(change_percent)
 
 
 def calculate_content_consistency(videos):
     """How consistent is the channel's performance"""
-    if not videos or len(videos) < 3:
+    frame = VideoFrame.of(videos)
+    if len(frame) < 3:
         return 50
     
-    views = [v.get("views", 0) for v in videos]
-    avg_views = sum(views) / len(views)
+    views = frame.views.astype(float)
+    avg_views = float(views.mean())
     
     if avg_views == 0:
         return 50
     
-    variance = sum((v - avg_views) ** 2 for v in views) / len(views)
-    std_dev = math.sqrt(variance)
+    std_dev = float(views.std())  # population standard deviation
     cv = std_dev / avg_views  # Coefficient of variation
     
     # Lower CV = more consistent (better)
@@ -346,11 +315,12 @@ def calculate_audience_quality_score(videos, subscribers):
     Calculate how valuable the audience is (0-100)
     Based on engagement and subscriber ratio
     """
-    if not videos:
+    frame = VideoFrame.of(videos)
+    if not len(frame):
         return 50
     
-    engagement_rate = calculate_engagement_rate(videos)
-    avg_views = calculate_avg_views(videos)
+    engagement_rate = calculate_engagement_rate(frame)
+    avg_views = calculate_avg_views(frame)
     
     # Engagement score (0-50 points)
     engagement_score = min(50, engagement_rate * 10000)
@@ -556,6 +526,50 @@ def generate_competitive_insights(primary_data, competitor_data_list, growth_com
     return insights
 
 
+def analyze_business_channel(channel_id, channel_url, max_videos, require_videos=False):
+    """
+    Full metrics + predictions for one channel of a business analysis (None if unavailable).
+    Self-contained so the primary and every competitor can run side by side.
+    """
+    basic = fetch_basic_channel_stats(channel_id)
+    if not basic:
+        return None
+
+    video_ids = fetch_video_ids(basic["uploadsPlaylistId"], max_videos)
+    # Columnar: publish times parsed once, every metric below is a NumPy reduction
+    videos = fetch_video_stats(video_ids, with_snippet=True, as_frame=True)
+    if require_videos and not len(videos):
+        return None
+
+    history = load_channel_history(channel_id)
+    video_history = load_video_history(video_ids)
+
+    avg_views = calculate_avg_views(videos)
+    engagement = calculate_engagement_rate(videos)
+
+    # NEW: Subscriber predictions
+    sub_predictions = predict_subscriber_growth(videos, basic["subscriberCount"], history)
+    sub_predictions["current_subscribers"] = basic["subscriberCount"]
+
+    return {
+        "channel_id": channel_id,
+        "channel_url": channel_url,
+        "subscribers": basic["subscriberCount"],
+        "total_views": basic["viewCount"],
+        "video_count": len(videos),
+        "avg_views_per_video": int(avg_views),
+        "engagement_rate": round(engagement, 4),
+        "growth_momentum": calculate_growth_momentum(videos, history),
+        # Views per day recent uploads keep gaining, from stored snapshots (None without history)
+        "recent_video_velocity": observed_video_velocity(video_history),
+        "consistency_score": calculate_content_consistency(videos),
+        "audience_quality": calculate_audience_quality_score(videos, basic["subscriberCount"]),
+        "subscriber_predictions": sub_predictions,
+        # NEW: Engagement predictions
+        "engagement_predictions": predict_engagement_growth(videos, engagement)
+    }
+
+
 @predictive_bp.route("/business.analysis", methods=["GET"])
 def business_analysis():
     """
@@ -577,91 +591,27 @@ def business_analysis():
     if not primary_id:
         return jsonify({"error": "Invalid primary channel URL"}), 400
     
-    primary_basic = fetch_basic_channel_stats(primary_id)
-    if not primary_basic:
-        return jsonify({"error": "Failed to fetch primary channel data"}), 400
-    
-    primary_video_ids = fetch_video_ids(primary_basic["uploadsPlaylistId"], max_videos)
-    primary_videos = fetch_video_stats(primary_video_ids, with_snippet=True)
-    
-    # Calculate primary channel metrics
-    primary_avg_views = calculate_avg_views(primary_videos)
-    primary_engagement = calculate_engagement_rate(primary_videos)
-    primary_growth = calculate_growth_momentum(primary_videos)
-    primary_consistency = calculate_content_consistency(primary_videos)
-    primary_audience_quality = calculate_audience_quality_score(primary_videos, primary_basic["subscriberCount"])
-    
-    # NEW: Subscriber predictions
-    primary_sub_predictions = predict_subscriber_growth(primary_videos, primary_basic["subscriberCount"])
-    primary_sub_predictions["current_subscribers"] = primary_basic["subscriberCount"]
-    
-    # NEW: Engagement predictions
-    primary_engagement_predictions = predict_engagement_growth(primary_videos, primary_engagement)
-    
-    primary_data = {
-        "channel_id": primary_id,
-        "channel_url": primary_url,
-        "subscribers": primary_basic["subscriberCount"],
-        "total_views": primary_basic["viewCount"],
-        "video_count": len(primary_videos),
-        "avg_views_per_video": int(primary_avg_views),
-        "engagement_rate": round(primary_engagement, 4),
-        "growth_momentum": primary_growth,
-        "consistency_score": primary_consistency,
-        "audience_quality": primary_audience_quality,
-        "subscriber_predictions": primary_sub_predictions,
-        "engagement_predictions": primary_engagement_predictions
-    }
-    
-    # Fetch competitor channels
-    competitor_data_list = []
-    competitor_names = []
-    
+    # Primary first, then competitors; incomplete competitors are skipped
+    tasks = [(primary_id, primary_url, False)]  # (channel_id, channel_url, require_videos)
     if competitor_urls_param:
-        competitor_urls = [url.strip() for url in competitor_urls_param.split(",") if url.strip()]
-        
-        for comp_url in competitor_urls:
-            comp_id = extract_channel_id(comp_url)
-            if not comp_id:
-                continue
-            
-            comp_basic = fetch_basic_channel_stats(comp_id)
-            if not comp_basic:
-                continue
-            
-            comp_video_ids = fetch_video_ids(comp_basic["uploadsPlaylistId"], max_videos)
-            comp_videos = fetch_video_stats(comp_video_ids, with_snippet=True)
-            
-            if not comp_videos:
-                continue
-            
-            comp_avg_views = calculate_avg_views(comp_videos)
-            comp_engagement = calculate_engagement_rate(comp_videos)
-            comp_growth = calculate_growth_momentum(comp_videos)
-            comp_consistency = calculate_content_consistency(comp_videos)
-            comp_audience_quality = calculate_audience_quality_score(comp_videos, comp_basic["subscriberCount"])
-            
-            # NEW: Competitor predictions
-            comp_sub_predictions = predict_subscriber_growth(comp_videos, comp_basic["subscriberCount"])
-            comp_sub_predictions["current_subscribers"] = comp_basic["subscriberCount"]
-            comp_engagement_predictions = predict_engagement_growth(comp_videos, comp_engagement)
-            
-            competitor_data_list.append({
-                "channel_id": comp_id,
-                "channel_url": comp_url,
-                "subscribers": comp_basic["subscriberCount"],
-                "total_views": comp_basic["viewCount"],
-                "video_count": len(comp_videos),
-                "avg_views_per_video": int(comp_avg_views),
-                "engagement_rate": round(comp_engagement, 4),
-                "growth_momentum": comp_growth,
-                "consistency_score": comp_consistency,
-                "audience_quality": comp_audience_quality,
-                "subscriber_predictions": comp_sub_predictions,
-                "engagement_predictions": comp_engagement_predictions
-            })
-            
-            competitor_names.append(f"Competitor {len(competitor_names) + 1}")
+        for comp_url in (url.strip() for url in competitor_urls_param.split(",")):
+            comp_id = extract_channel_id(comp_url) if comp_url else None
+            if comp_id:
+                tasks.append((comp_id, comp_url, True))
+
+    # Every channel's fetch + compute pipeline runs concurrently; results keep request order
+    results = channel_map(
+        lambda task: analyze_business_channel(task[0], task[1], max_videos, require_videos=task[2]),
+        tasks
+    )
+
+    primary_data = results[0]
+    if not primary_data:
+        return jsonify({"error": "Failed to fetch primary channel data"}), 400
+    primary_sub_predictions = primary_data["subscriber_predictions"]
+
+    competitor_data_list = [data for data in results[1:] if data]
+    competitor_names = [f"Competitor {i + 1}" for i in range(len(competitor_data_list))]
     
     # NEW: Growth timeline comparisons
     growth_comparisons = []
@@ -5,6 +5,7 @@ from utils.youtube_utils import (
     fetch_video_ids,
     fetch_video_stats,
 )
+from utils.growth_history import load_channel_history, observed_subscriber_growth, history_chart
 import numpy as np
 
 subscriber_predict_bp = Blueprint(
@@ -28,6 +29,29 @@ def predict_subscribers():
 
     subs = basic["subscriberCount"]
 
+    # Stored snapshots (background collector) give an observed growth rate when there are enough
+    history = load_channel_history(channel_id)
+    observed = observed_subscriber_growth(history)
+
+    def project(months, rate):
+        return int(subs * ((1 + rate) ** months))
+
+    if observed:
+        rate = observed["monthly_growth_rate"]
+        return jsonify({
+            "currentSubscribers": subs,
+            "monthlyGrowthRate": round(rate * 100, 2),
+            "prediction": {
+                "3_months": project(3, rate),
+                "6_months": project(6, rate),
+                "12_months": project(12, rate),
+            },
+            "source": "history",
+            "historyDays": observed["days"],
+            "confidence": observed["confidence"],
+            "history": history_chart(history),
+        }), 200
+
     # recent videos
     playlist_id = basic["uploadsPlaylistId"]
     video_ids = fetch_video_ids(playlist_id, 20)
@@ -37,7 +61,8 @@ def predict_subscribers():
         return jsonify({
             "currentSubscribers": subs,
             "monthlyGrowthRate": 0,
-            "prediction": {}
+            "prediction": {},
+            "history": history_chart(history),
         })
 
     avg_views = np.mean([v["views"] for v in videos])
@@ -54,20 +79,19 @@ def predict_subscribers():
     # growth % per month (capped for realism)
     monthly_growth_rate = min(0.15, engagement_score / max(subs, 1))
 
-    def project(months):
-        return int(subs * ((1 + monthly_growth_rate) ** months))
-
     return jsonify({
         "currentSubscribers": subs,
         "monthlyGrowthRate": round(monthly_growth_rate * 100, 2),
         "prediction": {
-            "3_months": project(3),
-            "6_months": project(6),
-            "12_months": project(12),
+            "3_months": project(3, monthly_growth_rate),
+            "6_months": project(6, monthly_growth_rate),
+            "12_months": project(12, monthly_growth_rate),
         },
         "inputs": {
             "avgViews": int(avg_views),
             "avgLikes": int(avg_likes),
             "avgComments": int(avg_comments),
-        }
+        },
+        "source": "videos",
+        "history": history_chart(history),
     }), 200
@@ -1,16 +1,87 @@
 # backend/routes/YouTube/video_correlation.py
 
 from flask import Blueprint, request, jsonify
+from utils.channel_index import get_uploads_playlist_id
 from utils.youtube_utils import (
     extract_channel_id,
-    fetch_basic_channel_stats,
     fetch_video_ids,
     fetch_video_stats,
 )
+import numpy as np
 import pandas as pd
 
 video_corr_bp = Blueprint("video_correlation", __name__, url_prefix="/api/youtube")
 
+MAX_NETWORK_VIDEOS = 5000
+# Without topK every pair above the threshold is an edge (n^2/2 of them), so dense graphs stay small
+MAX_DENSE_NETWORK_VIDEOS = 500
+# Rows of the correlation matrix computed at a time (memory: rows x videos floats)
+EDGE_BLOCK_ROWS = 256
+
+
+def correlation_edges(metrics, threshold, top_k=0, block_rows=EDGE_BLOCK_ROWS):
+    """
+    Pearson correlation between every pair of rows of `metrics` (videos x metrics), built
+    block by block with matrix products instead of a pairwise Python loop.
+    top_k=0: every pair (i < j) with r >= threshold, in row-major order.
+    top_k>0: each node keeps only its k strongest edges with r >= threshold (an edge survives
+    if either end keeps it), so dense graphs stay at most n * k edges.
+    Rows with zero variance have no correlation (NaN) and get no edges.
+    Returns (source_index, target_index, weight) arrays.
+    """
+    metrics = np.asarray(metrics, dtype=float)
+    n = len(metrics)
+
+    # Row-standardize: r(i, j) is then the dot product of rows i and j
+    centered = metrics - metrics.mean(axis=1, keepdims=True)
+    norms = np.sqrt((centered ** 2).sum(axis=1))
+    valid = norms > 0
+    z = np.zeros_like(centered)
+    z[valid] = centered[valid] / norms[valid, None]
+
+    k = min(top_k, n - 1)
+    cols = np.arange(n)
+    sources, targets, weights = [], [], []
+
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        rows = np.arange(start, stop)
+
+        r = np.clip(z[start:stop] @ z.T, -1.0, 1.0)
+        usable = valid[start:stop, None] & valid[None, :] & (r >= threshold)
+
+        if k > 0:
+            usable[rows - start, rows] = False  # no self loops
+            r = np.where(usable, r, -np.inf)
+            best = np.argpartition(-r, k - 1, axis=1)[:, :k]
+            best_r = np.take_along_axis(r, best, axis=1)
+            keep = np.isfinite(best_r)
+            i = np.broadcast_to(rows[:, None], best.shape)[keep]
+            j = best[keep]
+            sources.append(np.minimum(i, j))
+            targets.append(np.maximum(i, j))
+            weights.append(best_r[keep])
+        else:
+            usable &= cols[None, :] > rows[:, None]  # upper triangle only
+            ii, jj = np.nonzero(usable)
+            sources.append(ii + start)
+            targets.append(jj)
+            weights.append(r[ii, jj])
+
+    if not sources:
+        return np.array([], dtype=int), np.array([], dtype=int), np.array([])
+
+    sources = np.concatenate(sources)
+    targets = np.concatenate(targets)
+    weights = np.concatenate(weights)
+
+    if k > 0:
+        # Same edge kept from both ends: dedupe, ordered by (source, target)
+        _, first = np.unique(sources * n + targets, return_index=True)
+        sources, targets, weights = sources[first], targets[first], weights[first]
+
+    return sources, targets, weights
+
 
 @video_corr_bp.route("/videos.correlationNetwork", methods=["GET"])
 def video_correlation_network():
@@ -27,16 +98,22 @@ def video_correlation_network():
     except ValueError:
         threshold = 0.7
 
+    # topK: opt-in, strongest edges per node for large graphs (0 = every edge above the threshold)
+    try:
+        top_k = int(request.args.get("topK", "0"))
+    except ValueError:
+        top_k = 0
+    top_k = max(0, top_k)
+
     try:
         max_videos = int(request.args.get("maxVideos", "10"))
     except ValueError:
         max_videos = 200
+    max_videos = max(1, min(max_videos, MAX_NETWORK_VIDEOS if top_k else MAX_DENSE_NETWORK_VIDEOS))
 
-    basic = fetch_basic_channel_stats(channel_id)
-    if not basic:
+    playlist_id = get_uploads_playlist_id(channel_id)
+    if not playlist_id:
         return jsonify({"error": "Channel not found"}), 404
-
-    playlist_id = basic["uploadsPlaylistId"]
     video_ids = fetch_video_ids(playlist_id, max_videos)
     if not video_ids:
         return jsonify({"nodes": [], "edges": []}), 200
@@ -52,24 +129,13 @@ def video_correlation_network():
     metric_cols = ["views", "likes", "comments"]
     df[metric_cols] = df[metric_cols].astype(float)
 
-    df_metrics = df[metric_cols]
-    corr_matrix = df_metrics.T.corr(method="pearson")
-
-    n = df.shape[0]
-    edges = []
-    for i in range(n):
-        for j in range(i + 1, n):
-            r = corr_matrix.iat[i, j]
-            if pd.isna(r):
-                continue
-            if r >= threshold:
-                edges.append(
-                    {
-                        "source": df.iloc[i]["id"],
-                        "target": df.iloc[j]["id"],
-                        "weight": round(float(r), 3),
-                    }
-                )
+    sources, targets, weights = correlation_edges(df[metric_cols].to_numpy(), threshold, top_k)
+
+    ids = df["id"].to_numpy()
+    edges = [
+        {"source": s, "target": t, "weight": w}
+        for s, t, w in zip(ids[sources].tolist(), ids[targets].tolist(), np.round(weights, 3).tolist())
+    ]
 
     df["views_zscore"] = (
         (df["views"] - df["views"].mean())
@@ -83,6 +149,7 @@ def video_correlation_network():
     return jsonify({
         "nodes": nodes,
         "edges": edges,
+        "topK": top_k,
         "rawMetrics": df[
             ["id","title","views","likes","comments","publishedAt","thumbnail"]
         ].to_dict(orient="records")
@@ -123,11 +190,9 @@ def video_similarity_network():
     except ValueError:
         threshold = -1
 
-    basic = fetch_basic_channel_stats(channel_id)
-    if not basic:
+    playlist_id = get_uploads_playlist_id(channel_id)
+    if not playlist_id:
         return jsonify({"error": "Channel not found"}), 404
-
-    playlist_id = basic["uploadsPlaylistId"]
     video_ids = fetch_video_ids(playlist_id, pool_max)
     if not video_ids:
         return jsonify({"nodes": [], "edges": [], "rawMetrics": []}), 200
@@ -1,9 +1,10 @@
 # backend/routes/YouTube/video_correlation_business.py
 
 from flask import Blueprint, request, jsonify
+from utils.channel_index import get_uploads_playlist_id
+from utils.concurrency import channel_map
 from utils.youtube_utils import (
     extract_channel_id,
-    fetch_basic_channel_stats,
     fetch_video_ids,
     fetch_video_stats,
 )
@@ -63,23 +64,27 @@ def performance_comparison():
     all_videos = []
     channel_metrics = []
 
-    # Fetch data for each channel
-    for channel_url in channel_urls:
+    def fetch_channel(channel_url):
         channel_id = extract_channel_id(channel_url)
         if not channel_id:
-            continue
-
-        basic = fetch_basic_channel_stats(channel_id)
-        if not basic:
-            continue
+            return None
 
-        playlist_id = basic["uploadsPlaylistId"]
+        playlist_id = get_uploads_playlist_id(channel_id)
+        if not playlist_id:
+            return None
         video_ids = fetch_video_ids(playlist_id, max_videos)
         
         if not video_ids:
+            return None
+
+        return channel_url, channel_id, fetch_video_stats(video_ids, with_snippet=True)
+
+    # Fetch data for every channel concurrently; results keep request order
+    for fetched in channel_map(fetch_channel, channel_urls):
+        if not fetched:
             continue
 
-        videos = fetch_video_stats(video_ids, with_snippet=True)
+        channel_url, channel_id, videos = fetched
         
         if not videos:
             continue
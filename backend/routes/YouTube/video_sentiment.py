@@ -1,13 +1,13 @@
 from flask import Blueprint, request, jsonify
+from utils.channel_index import get_uploads_playlist_id
 from utils.youtube_utils import (
     extract_channel_id,
     fetch_video_ids,
     fetch_video_comments,
-    fetch_basic_channel_stats,
-    fetch_video_title,
-    fetch_video_stats,
+    fetch_video_titles,
 )
-from textblob import TextBlob
+from utils.concurrency import bounded_map, submit
+from utils.sentiment import polarity_scores, sentiment_label
 import pandas as pd
 import traceback
 
@@ -42,7 +42,9 @@ def sentiment_analysis():
         if video_ids_param:
             video_ids = [vid.strip() for vid in video_ids_param.split(",") if vid.strip()]
         else:
-            playlist_id = fetch_basic_channel_stats(channel_id)["uploadsPlaylistId"]
+            playlist_id = get_uploads_playlist_id(channel_id)
+            if not playlist_id:
+                return jsonify({"error": "Channel not found"}), 404
             video_ids = fetch_video_ids(playlist_id, max_videos)
 
         if not video_ids:
@@ -51,11 +53,19 @@ def sentiment_analysis():
         # --------------------------------------------------
         # 2. Fetch comments (WITH publishedAt)
         # --------------------------------------------------
+        # Titles for every video in one bulk lookup (local catalog first) while the
+        # per-video comment threads are fetched in parallel
+        titles_future = submit(fetch_video_titles, video_ids)
+        comments_per_video = bounded_map(
+            lambda vid: fetch_video_comments(vid, max_comments=300),
+            video_ids
+        )
+        titles = titles_future.result()
+
         all_comments = []
 
-        for vid in video_ids:
-            comments = fetch_video_comments(vid, max_comments=300)
-            title = fetch_video_title(vid) or vid
+        for vid, comments in zip(video_ids, comments_per_video):
+            title = titles.get(vid) or vid
 
             for c in comments:
                 all_comments.append({
@@ -71,14 +81,11 @@ def sentiment_analysis():
         # --------------------------------------------------
         # 3. Sentiment analysis
         # --------------------------------------------------
-        for c in all_comments:
-            blob = TextBlob(c["text"])
-            polarity = blob.sentiment.polarity
-            c["sentiment"] = (
-                "positive" if polarity > 0 else
-                "negative" if polarity < 0 else
-                "neutral"
-            )
+        # One batch call to the shared sentiment engine (utils/sentiment.py)
+        polarities = polarity_scores([c["text"] for c in all_comments])
+
+        for c, polarity in zip(all_comments, polarities):
+            c["sentiment"] = sentiment_label(polarity)
             c["polarity_score"] = round(polarity, 3)
 
         # --------------------------------------------------
@@ -143,20 +150,24 @@ def sentiment_video_titles():
         except ValueError:
             max_videos = 50
 
-        playlist_id = fetch_basic_channel_stats(channel_id)["uploadsPlaylistId"]
+        playlist_id = get_uploads_playlist_id(channel_id)
+        if not playlist_id:
+            return jsonify({"error": "Channel not found"}), 404
         video_ids = fetch_video_ids(playlist_id, max_videos)
 
         if not video_ids:
             return jsonify({"videos": []}), 200
 
-        videos = fetch_video_stats(video_ids, with_snippet=True)
+        # Titles only: no statistics needed, known videos come straight from the local catalog
+        titles = fetch_video_titles(video_ids)
 
         simplified = [
             {
-                "id": v["id"],
-                "title": v.get("title") or v["id"]
+                "id": vid,
+                "title": titles[vid] or vid
             }
-            for v in videos
+            for vid in video_ids
+            if vid in titles
         ]
 
         return jsonify({"videos": simplified}), 200
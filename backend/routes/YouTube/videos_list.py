@@ -1,9 +1,9 @@
 # backend/routes/YouTube/videos_list.py
 
 from flask import Blueprint, request, jsonify
+from utils.channel_index import get_uploads_playlist_id
 from utils.youtube_utils import (
     extract_channel_id,
-    fetch_basic_channel_stats,
     fetch_video_ids,
     fetch_video_stats,
 )
@@ -23,12 +23,10 @@ def videos_list():
     if not channel_id:
         return jsonify({"error": "Invalid channel URL"}), 400
 
-    basic = fetch_basic_channel_stats(channel_id)
-    if not basic:
+    playlist_id = get_uploads_playlist_id(channel_id)
+    if not playlist_id:
         return jsonify({"error": "Channel not found"}), 404
 
-    playlist_id = basic["uploadsPlaylistId"]
-
     video_ids = fetch_video_ids(playlist_id, max_videos)
     if not video_ids:
         return jsonify({"totalLikes": 0, "totalComments": 0}), 200
@@ -65,11 +63,9 @@ def videos_catalog():
     if not channel_id:
         return jsonify({"error": "Invalid channel URL"}), 400
 
-    basic = fetch_basic_channel_stats(channel_id)
-    if not basic:
+    playlist_id = get_uploads_playlist_id(channel_id)
+    if not playlist_id:
         return jsonify({"error": "Channel not found"}), 404
-
-    playlist_id = basic["uploadsPlaylistId"]
     video_ids = fetch_video_ids(playlist_id, max_videos)
     if not video_ids:
         return jsonify({"videos": []}), 200
@@ -144,6 +144,72 @@ CREATE TABLE YouTubeChannel (
   KEY idx_owner_primary (owner_user_id, is_primary)
 ) ENGINE=InnoDB;
 
+-- Channel resolution index (any channel ever looked up, not only owned ones):
+-- channel id -> uploads playlist + title, so routes don't spend quota re-resolving it
+CREATE TABLE YouTubeChannelIndex (
+  youtube_channel_id   VARCHAR(64) NOT NULL,
+  uploads_playlist_id  VARCHAR(64) NOT NULL,
+  channel_name         VARCHAR(255),
+  resolved_at          DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (youtube_channel_id)
+) ENGINE=InnoDB;
+
+-- @handles, /user/ names and /c/ custom URLs -> channel id
+CREATE TABLE YouTubeChannelAlias (
+  alias               VARCHAR(255) NOT NULL,
+  youtube_channel_id  VARCHAR(64) NOT NULL,
+  created_at          DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (alias),
+  KEY idx_alias_channel (youtube_channel_id)
+) ENGINE=InnoDB;
+
+-- Known uploads of a channel (newest first) so playlistItems can be synced incrementally:
+-- only pages newer than newest_video_id are fetched, the rest is merged from here
+CREATE TABLE YouTubeUploadsSync (
+  uploads_playlist_id  VARCHAR(64) NOT NULL,
+  newest_video_id      VARCHAR(32),
+  video_ids            MEDIUMTEXT NOT NULL,
+  video_count          INT NOT NULL DEFAULT 0,
+  is_complete          BOOLEAN NOT NULL DEFAULT FALSE,
+  full_synced_at       DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  synced_at            DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (uploads_playlist_id)
+) ENGINE=InnoDB;
+
+-- Video metadata that (almost) never changes: snippet + contentDetails, fetched once per video.
+-- Only statistics are refetched; published_at keeps the API's ISO string as-is.
+-- duration_seconds is NULL until contentDetails has been fetched for the video.
+CREATE TABLE YouTubeVideo (
+  youtube_video_id  VARCHAR(32) NOT NULL,
+  title             VARCHAR(512),
+  published_at      VARCHAR(32),
+  thumbnail_url     VARCHAR(512),
+  duration_seconds  INT,
+  created_at        DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  updated_at        DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (youtube_video_id)
+) ENGINE=InnoDB;
+
+-- Append-only statistics history written by the snapshot collector (utils/stats_collector.py).
+-- Older rows are downsampled in place: one per day after 14 days, one per week after 180 days.
+CREATE TABLE ChannelStatSnapshot (
+  youtube_channel_id  VARCHAR(64) NOT NULL,
+  captured_at         DATETIME NOT NULL,
+  subscriber_count    BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  view_count          BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  video_count         INT UNSIGNED NOT NULL DEFAULT 0,
+  PRIMARY KEY (youtube_channel_id, captured_at)
+) ENGINE=InnoDB;
+
+CREATE TABLE VideoStatSnapshot (
+  youtube_video_id    VARCHAR(32) NOT NULL,
+  captured_at         DATETIME NOT NULL,
+  view_count          BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  like_count          INT UNSIGNED NOT NULL DEFAULT 0,
+  comment_count       INT UNSIGNED NOT NULL DEFAULT 0,
+  PRIMARY KEY (youtube_video_id, captured_at)
+) ENGINE=InnoDB;
+
 -- now link CreatorProfile.primary_channel_id → YouTubeChannel
 ALTER TABLE CreatorProfile
   ADD CONSTRAINT fk_cp_primary_channel
@@ -0,0 +1,124 @@
+# backend/utils/channel_dataset.py
+
+import threading
+from utils.youtube_utils import (
+    extract_channel_id,
+    fetch_video_ids,
+    fetch_video_stats,
+    fetch_video_comments,
+)
+from utils.channel_index import resolve_channels
+from utils.concurrency import bounded_map
+
+# Request-scoped loader for the multi-channel analyzer endpoints. Every channel is resolved
+# and its uploads listed exactly once; the fair-sampling size (fewest videos any channel has,
+# capped at maxVideos) is computed from those lists instead of a separate pre-pass, and video
+# stats / comments are fetched lazily once per channel and reused by whoever asks again.
+
+
+class ChannelEntry:
+    def __init__(self, index, url, channel_id, channel_name, playlist_id, video_ids):
+        self.index = index
+        self.url = url
+        self.channel_id = channel_id
+        self.channel_name = channel_name
+        self.playlist_id = playlist_id
+        self.all_video_ids = video_ids
+        self.is_primary = index == 0
+
+
+class ChannelDataset:
+    def __init__(self, channel_urls, max_videos):
+        self.channel_urls = channel_urls
+        self.max_videos = max_videos
+
+        channel_ids = [extract_channel_id(url) for url in channel_urls]
+        # One multi-id channels call resolves every channel that isn't indexed yet
+        basics = resolve_channels([cid for cid in channel_ids if cid])
+
+        found = [
+            (idx, url, channel_id, basics[channel_id])
+            for idx, (url, channel_id) in enumerate(zip(channel_urls, channel_ids))
+            if channel_id and channel_id in basics
+        ]
+        # Uploads of all channels are listed concurrently
+        id_lists = bounded_map(lambda item: fetch_video_ids(item[3]["uploadsPlaylistId"], max_videos), found)
+
+        self.entries = [
+            ChannelEntry(
+                idx,
+                url,
+                channel_id,
+                basic.get("channelName", f"Channel {idx + 1}"),
+                basic["uploadsPlaylistId"],
+                video_ids,
+            )
+            for (idx, url, channel_id, basic), video_ids in zip(found, id_lists)
+        ]
+
+        # Use minimum video count across all channels for fair comparison
+        self.video_counts = [len(e.all_video_ids) for e in self.entries]
+        if self.video_counts:
+            self.sample_size = min(min(self.video_counts), max_videos)
+        else:
+            self.sample_size = max_videos
+
+        self._videos = {}
+        self._comments = {}
+        self._lock = threading.Lock()
+
+    @property
+    def is_standardized(self):
+        return len(set(self.video_counts)) > 1 if self.video_counts else False
+
+    @property
+    def original_counts(self):
+        """channel URL -> videos found before standardizing."""
+        return {e.url: len(e.all_video_ids) for e in self.entries}
+
+    def channels(self):
+        """Resolved channels in request order (primary first) that have videos to analyze."""
+        return [e for e in self.entries if self.video_ids(e)]
+
+    def video_ids(self, entry):
+        return entry.all_video_ids[:self.sample_size]
+
+    def videos(self, entry, with_duration: bool = False):
+        """Stats (+ snippet, + duration if asked) of the channel's sampled videos, fetched once."""
+        with self._lock:
+            cached = self._videos.get((entry.channel_id, True))
+            if cached is None and not with_duration:
+                cached = self._videos.get((entry.channel_id, False))
+        if cached is not None:
+            return cached
+
+        videos = fetch_video_stats(self.video_ids(entry), with_snippet=True, with_duration=with_duration)
+        with self._lock:
+            self._videos[(entry.channel_id, with_duration)] = videos
+        return videos
+
+    def comments(self, entry, max_per_video: int):
+        """
+        Comments of the channel's sampled videos, each tagged with video_id / video_title.
+        Videos are fetched concurrently; the result keeps video order.
+        """
+        key = (entry.channel_id, max_per_video)
+        with self._lock:
+            cached = self._comments.get(key)
+        if cached is not None:
+            return cached
+
+        titles = {v["id"]: v.get("title", "") for v in self.videos(entry)}
+        video_ids = self.video_ids(entry)
+        per_video = bounded_map(lambda vid: fetch_video_comments(vid, max_per_video), video_ids)
+
+        all_comments = []
+        for video_id, comments in zip(video_ids, per_video):
+            for comment in comments:
+                comment["video_id"] = video_id
+                comment["video_title"] = titles.get(video_id, "")
+            all_comments.extend(comments)
+
+        with self._lock:
+            self._comments[key] = all_comments
+        return all_comments
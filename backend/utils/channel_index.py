@@ -0,0 +1,184 @@
+# backend/utils/channel_index.py
+
+import threading
+import requests
+from urllib.parse import urlparse
+from models.ChannelIndex import ChannelIndex
+from utils.youtube_utils import youtube_get
+from utils.youtube_quota import QuotaBudgetExceeded, mark_partial
+from utils.youtube_retry import CircuitOpenError
+from utils.concurrency import bounded_map
+from utils.fail_soft_db import FailSoftDB
+
+# channel id -> uploads playlist + title. Backed by the YouTubeChannelIndex table with an
+# in-process memo in front, so after the first lookup resolving a channel costs no quota
+# (and usually no DB round trip either). Every DB call fails soft (utils/fail_soft_db.py): if
+# MySQL is unavailable we fall back to the API, exactly like before the index existed.
+
+INDEX_FIELDS = "etag,items(id,contentDetails/relatedPlaylists/uploads,snippet/title)"
+
+_memo = {}
+_alias_memo = {}
+_lock = threading.Lock()
+_db = FailSoftDB("Channel index")
+
+
+def _remember(entries):
+    with _lock:
+        for channel_id, uploads, name in entries:
+            _memo[channel_id] = {"uploadsPlaylistId": uploads, "channelName": name or ""}
+
+
+def remember_channel(channel_id: str, uploads_playlist_id: str, channel_name: str = ""):
+    """Write-through from any call that already fetched the channel (e.g. fetch_basic_channel_stats)."""
+    if not channel_id or not uploads_playlist_id:
+        return
+
+    with _lock:
+        known = _memo.get(channel_id)
+    if known and known["uploadsPlaylistId"] == uploads_playlist_id and known["channelName"] == (channel_name or ""):
+        return
+
+    entries = [(channel_id, uploads_playlist_id, channel_name or "")]
+    _remember(entries)
+    _db.call("write", ChannelIndex.upsert_many, entries)
+
+
+def resolve_channels(channel_ids):
+    """
+    Resolve many channel ids at once -> {channel_id: {"uploadsPlaylistId", "channelName"}}.
+    Memo first, then one DB query for the rest, then multi-id channels calls (50 ids per unit)
+    for what is still missing. Unknown / deleted channels are simply absent from the result.
+    """
+    channel_ids = [cid for cid in dict.fromkeys(channel_ids) if cid]
+    result = {}
+
+    with _lock:
+        for cid in channel_ids:
+            if cid in _memo:
+                result[cid] = _memo[cid]
+
+    missing = [cid for cid in channel_ids if cid not in result]
+    if missing:
+        rows = _db.call("read", ChannelIndex.find_many, missing, default={})
+
+        found = [(cid, row.uploads_playlist_id, row.channel_name) for cid, row in rows.items()]
+        _remember(found)
+        for cid, uploads, name in found:
+            result[cid] = {"uploadsPlaylistId": uploads, "channelName": name or ""}
+
+    missing = [cid for cid in channel_ids if cid not in result]
+    if missing:
+        batches = [missing[i: i + 50] for i in range(0, len(missing), 50)]
+
+        def fetch_batch(batch):
+            try:
+                return youtube_get("channels", {
+                    "part": "snippet,contentDetails",
+                    "id": ",".join(batch),
+                    "maxResults": 50,
+                }, fields=INDEX_FIELDS)
+            except QuotaBudgetExceeded:
+                mark_partial()
+                return {}
+            except (requests.RequestException, CircuitOpenError) as e:
+                # Only this batch's channels stay unresolved; the rest of the request goes on
+                print(f"Skipped channels batch starting at {batch[0]}: {e}")
+                mark_partial()
+                return {}
+
+        fetched = []
+        for data in bounded_map(fetch_batch, batches):
+            for item in data.get("items", []):
+                uploads = item.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+                if item.get("id") and uploads:
+                    fetched.append((item["id"], uploads, item.get("snippet", {}).get("title", "")))
+
+        _remember(fetched)
+        _db.call("write", ChannelIndex.upsert_many, fetched)
+
+        for cid, uploads, name in fetched:
+            result[cid] = {"uploadsPlaylistId": uploads, "channelName": name}
+
+    return result
+
+
+def get_uploads_playlist_id(channel_id: str):
+    """Uploads playlist id for a channel, or None if the channel does not exist."""
+    info = resolve_channels([channel_id]).get(channel_id)
+    return info["uploadsPlaylistId"] if info else None
+
+
+def parse_channel_alias(url_or_id: str):
+    """
+    Turn handle / legacy URLs into a normalized alias:
+      @name, youtube.com/@name      -> "@name"
+      youtube.com/user/name         -> "user/name"
+      youtube.com/c/name            -> "c/name"
+    Returns None for anything else.
+    """
+    if not url_or_id:
+        return None
+
+    value = url_or_id.strip()
+    if value.startswith("@"):
+        return value.split("/")[0].lower()
+
+    try:
+        parsed = urlparse(value if "://" in value else "https://" + value)
+        parts = [p for p in parsed.path.split("/") if p]
+    except Exception:
+        return None
+
+    if not parts:
+        return None
+    if parts[0].startswith("@"):
+        return parts[0].lower()
+    if parts[0] in ("user", "c") and len(parts) > 1:
+        return f"{parts[0]}/{parts[1].lower()}"
+    return None
+
+
+def resolve_alias(alias: str):
+    """Channel id for a normalized alias (memo -> DB -> channels?forHandle / forUsername), or None."""
+    if not alias:
+        return None
+
+    with _lock:
+        if alias in _alias_memo:
+            return _alias_memo[alias]
+
+    channel_id = _db.call("alias read", ChannelIndex.find_alias, alias)
+
+    if not channel_id:
+        if alias.startswith("user/"):
+            params = {"forUsername": alias.split("/", 1)[1]}
+        elif alias.startswith("c/"):
+            # Custom URLs have no lookup of their own; most of them now match the channel's handle
+            params = {"forHandle": "@" + alias.split("/", 1)[1]}
+        else:
+            params = {"forHandle": alias}
+
+        params.update({"part": "snippet,contentDetails", "maxResults": 1})
+        try:
+            data = youtube_get("channels", params, fields=INDEX_FIELDS)
+        except Exception as e:
+            print(f"Channel alias lookup failed for {alias}: {e}")
+            return None
+
+        items = data.get("items", [])
+        if not items:
+            return None
+
+        item = items[0]
+        channel_id = item.get("id")
+        uploads = item.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+        if not channel_id:
+            return None
+
+        remember_channel(channel_id, uploads, item.get("snippet", {}).get("title", ""))
+        _db.call("alias write", ChannelIndex.save_alias, alias, channel_id)
+
+    with _lock:
+        _alias_memo[alias] = channel_id
+    return channel_id
@@ -0,0 +1,91 @@
+# backend/utils/comment_features.py
+
+import re
+from collections import namedtuple
+
+# Single-pass comment feature extraction for /analyzer.engagementQuality.
+# Each comment is lowercased and split once, and every phrase list (questions, action words,
+# community indicators, spam indicators) is matched by one precompiled regex. Phrases keep the
+# substring semantics the endpoint always had ("using" also counts inside "confusing").
+#
+# The result is one compact record per comment; rates and distributions are plain sums over
+# the records, so the cost stays linear even for hundreds of thousands of comments.
+
+QUESTION = 1
+ACTION = 2
+COMMUNITY = 4
+SPAM = 8
+
+ACTION_PHRASES = ("tried", "bought", "purchased", "using", "implemented", "applied", "started", "watching", "subscribed")
+COMMUNITY_PHRASES = ("@", "agree with", "like you said", "same here", "me too", "also")
+SPAM_PHRASES = ("first", "like if", "subscribe", "check out my", "click here", "🔥" * 3)
+MIN_MEANINGFUL_WORDS = 3
+
+CommentFeatures = namedtuple("CommentFeatures", ["word_count", "flags", "month", "meaningful"])
+
+
+def _or_all(values):
+    mask = 0
+    for value in values:
+        mask |= value
+    return mask
+
+
+def _compile(groups):
+    """
+    One regex for every phrase. The zero-width lookahead finds matches starting at every
+    position (so overlapping phrases from different lists are all seen); at a given position
+    the longest phrase wins, and its mask also carries every shorter phrase it starts with.
+    """
+    masks = {}
+    for flag, phrases in groups:
+        for phrase in phrases:
+            masks[phrase] = masks.get(phrase, 0) | flag
+
+    ordered = sorted(masks, key=len, reverse=True)
+    full_masks = {
+        phrase: _or_all(masks[other] for other in ordered if phrase.startswith(other))
+        for phrase in ordered
+    }
+    # The leading class of first characters lets the scanner skip most positions cheaply
+    first_chars = "".join(sorted({re.escape(p[0]) for p in ordered}))
+    pattern = re.compile("(?=[" + first_chars + "])(?=(" + "|".join(re.escape(p) for p in ordered) + "))")
+    return pattern, full_masks
+
+
+_PHRASE_RE, _PHRASE_MASKS = _compile([
+    (QUESTION, ("?",)),
+    (ACTION, ACTION_PHRASES),
+    (COMMUNITY, COMMUNITY_PHRASES),
+    (SPAM, SPAM_PHRASES),
+])
+_MONTH_RE = re.compile(r"\d{4}-\d{2}")
+
+
+def extract_comment_features(comments):
+    """One CommentFeatures record per comment, in input order."""
+    findall = _PHRASE_RE.findall
+    masks = _PHRASE_MASKS
+    month_match = _MONTH_RE.match
+
+    records = []
+    for comment in comments:
+        text_lower = comment.get("text", "").lower()
+        words = text_lower.split()
+
+        flags = 0
+        for phrase in set(findall(text_lower)):
+            flags |= masks[phrase]
+
+        # publishedAt is RFC 3339 UTC ("2024-05-01T12:00:00Z"): the month is its prefix
+        published_at = comment.get("publishedAt") or ""
+        month = published_at[:7] if month_match(published_at) else None
+
+        meaningful = not (flags & SPAM) and len(set(words)) >= MIN_MEANINGFUL_WORDS
+        records.append(CommentFeatures(len(words), flags, month, meaningful))
+
+    return records
+
+
+def count_flag(records, flag):
+    return sum(1 for r in records if r.flags & flag)
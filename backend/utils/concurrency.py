@@ -0,0 +1,113 @@
+# backend/utils/concurrency.py
+
+import os
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, Future
+
+# Per-process cap on concurrent upstream YouTube calls fanned out by one helper.
+# Keep YOUTUBE_POOL_MAXSIZE >= this value so every worker thread gets a warm socket.
+MAX_CONCURRENCY = max(1, int(os.getenv("YOUTUBE_MAX_CONCURRENCY", "8")))
+
+# Per-process cap on whole per-channel pipelines running at once (see channel_map).
+MAX_CHANNEL_CONCURRENCY = max(1, int(os.getenv("YOUTUBE_MAX_CHANNEL_CONCURRENCY", "5")))
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+_channel_executor = None
+_channel_executor_pid = None
+
+
+def _get_executor():
+    global _executor, _executor_pid
+
+    pid = os.getpid()
+    if _executor is not None and _executor_pid == pid:
+        return _executor
+
+    with _executor_lock:
+        if _executor is None or _executor_pid != pid:
+            _executor = ThreadPoolExecutor(
+                max_workers=MAX_CONCURRENCY,
+                thread_name_prefix="yt-batch",
+            )
+            _executor_pid = pid
+    return _executor
+
+
+def _in_pool():
+    return threading.current_thread().name.startswith("yt-batch")
+
+
+def submit(fn, *args):
+    """
+    Start fn(*args) on the shared pool and return a Future (run in a copy of the caller's context).
+    From inside a pool thread the call runs inline and an already-completed Future is returned.
+    """
+    if _in_pool() or MAX_CONCURRENCY == 1:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    ctx = contextvars.copy_context()
+    return _get_executor().submit(ctx.run, fn, *args)
+
+
+def bounded_map(fn, items, concurrent: bool = True):
+    """
+    Apply fn to every item and return the results in input order.
+    Runs on the shared per-process pool (at most MAX_CONCURRENCY calls in flight),
+    so total time is roughly the slowest item instead of the sum of all items.
+    Nested calls made from inside a pool thread run inline so the pool can never deadlock on itself.
+    Each call runs in a copy of the caller's context, so per-request state (e.g. quota tracking) follows it.
+    The first exception raised by fn is re-raised to the caller.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    if not concurrent or _in_pool() or len(items) == 1 or MAX_CONCURRENCY == 1:
+        return [fn(item) for item in items]
+
+    calls = [(contextvars.copy_context(), item) for item in items]
+    return list(_get_executor().map(lambda call: call[0].run(fn, call[1]), calls))
+
+
+def _get_channel_executor():
+    global _channel_executor, _channel_executor_pid
+
+    pid = os.getpid()
+    with _executor_lock:
+        if _channel_executor is None or _channel_executor_pid != pid:
+            _channel_executor = ThreadPoolExecutor(
+                max_workers=MAX_CHANNEL_CONCURRENCY,
+                thread_name_prefix="yt-channel",
+            )
+            _channel_executor_pid = pid
+    return _channel_executor
+
+
+def channel_map(fn, items):
+    """
+    Run one whole per-channel pipeline (fetch + compute) per item concurrently and return the
+    results in input order, so the primary channel stays first.
+    Uses its own executor rather than the batch pool: the pipelines themselves call bounded_map,
+    which only fans out when the caller is not a batch-pool thread. Channel threads can wait on
+    batch threads, never the other way round, so neither pool can deadlock.
+    The first exception raised by fn is re-raised to the caller.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    if threading.current_thread().name.startswith(("yt-channel", "yt-batch")) \
+            or len(items) == 1 or MAX_CHANNEL_CONCURRENCY == 1:
+        return [fn(item) for item in items]
+
+    calls = [(contextvars.copy_context(), item) for item in items]
+    return list(_get_channel_executor().map(lambda call: call[0].run(fn, call[1]), calls))
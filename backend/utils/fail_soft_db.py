@@ -0,0 +1,48 @@
+# backend/utils/fail_soft_db.py
+
+import os
+import time
+import threading
+
+# Guard for the optional MySQL-backed stores that sit behind an in-process memo (video catalog,
+# channel index, uploads sync, growth history). Their tables only save quota: when MySQL is
+# unreachable the caller falls back to the API, so a DB error is logged and swallowed. After
+# an error the store skips the database for a while instead of paying a failed connect (and
+# its timeout) on every cache miss.
+
+DB_RETRY_SECONDS = float(os.getenv("YOUTUBE_DB_RETRY_SECONDS", "30"))
+
+
+class FailSoftDB:
+    def __init__(self, name: str, retry_seconds: float = DB_RETRY_SECONDS):
+        self.name = name
+        self.retry_seconds = retry_seconds
+        self.failures = 0
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+
+    def available(self):
+        return time.time() >= self._down_until
+
+    def failed(self, action, e):
+        with self._lock:
+            self._down_until = time.time() + self.retry_seconds
+            self.failures += 1
+        print(f"{self.name} {action} failed, skipping the database for {self.retry_seconds:.0f}s: {e}")
+
+    def call(self, action, fn, *args, default=None, **kwargs):
+        """fn(*args, **kwargs), or default when the DB is backing off or the call raises."""
+        if not self.available():
+            return default
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            self.failed(action, e)
+            return default
+
+    def stats(self):
+        return {
+            "db_available": self.available(),
+            "db_failures": self.failures,
+            "db_retry_seconds": self.retry_seconds,
+        }
@@ -0,0 +1,146 @@
+# backend/utils/growth_history.py
+
+import os
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from models.StatSnapshot import StatSnapshot
+from utils.fail_soft_db import FailSoftDB
+
+# Read side of the snapshot collector (utils/stats_collector.py): turns stored channel
+# snapshots into observed growth rates for the forecasts, and the per-video snapshots of
+# recent uploads into how fast new videos keep gaining views. Everything returns None / []
+# when there is not enough history (or MySQL is unavailable, see utils/fail_soft_db.py), so
+# callers fall back to their per-video estimates.
+
+HISTORY_DAYS = int(os.getenv("YOUTUBE_HISTORY_DAYS", "365"))
+MIN_SUBSCRIBER_HISTORY_DAYS = 7
+MIN_MOMENTUM_HISTORY_DAYS = 14
+MIN_VIDEO_HISTORY_DAYS = 1
+# Uploads are newest first and only the most recent ones are snapshotted, so look no further back
+MAX_HISTORY_VIDEOS = 50
+
+_db = FailSoftDB("Growth history")
+
+
+def load_channel_history(channel_id: str, days: int = HISTORY_DAYS):
+    """Stored snapshots of a channel, oldest first ([] if none or the DB is unavailable)."""
+    if not channel_id:
+        return []
+    since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    return _db.call("channel read", StatSnapshot.channel_series, channel_id, since=since, default=[])
+
+
+def load_video_history(video_ids, days: int = HISTORY_DAYS):
+    """Stored snapshots of the newest videos, {video_id: series oldest first} ({} if none / DB down)."""
+    video_ids = [vid for vid in (video_ids or [])[:MAX_HISTORY_VIDEOS] if vid]
+    if not video_ids:
+        return {}
+    since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    return _db.call("video read", StatSnapshot.video_series, video_ids, since=since, default={})
+
+
+def _days_since_first(series):
+    first = series[0]["captured_at"]
+    return np.array([(p["captured_at"] - first).total_seconds() / 86400 for p in series])
+
+
+def observed_subscriber_growth(series):
+    """
+    Monthly compound subscriber growth fitted (log-linear least squares) on stored snapshots.
+    Returns {"monthly_growth_rate", "days", "points", "confidence"} or None if history is too short.
+    """
+    series = [p for p in series or [] if p["subscribers"] > 0]
+    if len(series) < 3:
+        return None
+
+    days = _days_since_first(series)
+    span = float(days[-1])
+    if span < MIN_SUBSCRIBER_HISTORY_DAYS:
+        return None
+
+    subs = np.array([p["subscribers"] for p in series], dtype=float)
+    slope, _ = np.polyfit(days, np.log(subs), 1)
+    monthly_growth_rate = float(np.exp(slope * 30) - 1)
+
+    if span >= 90:
+        confidence = "high"
+    elif span >= 30:
+        confidence = "medium"
+    else:
+        confidence = "low"
+
+    return {
+        "monthly_growth_rate": monthly_growth_rate,
+        "days": int(span),
+        "points": len(series),
+        "confidence": confidence,
+    }
+
+
+def observed_view_momentum(series):
+    """
+    Change (%) of the channel's daily view gain in the newer half of the history vs the older half.
+    None if there isn't enough history to compare.
+    """
+    series = series or []
+    if len(series) < 4:
+        return None
+
+    days = _days_since_first(series)
+    span = float(days[-1])
+    if span < MIN_MOMENTUM_HISTORY_DAYS:
+        return None
+
+    # Last snapshot at or before the midpoint splits the two halves (it belongs to both)
+    pivot = int(np.searchsorted(days, span / 2, side="right")) - 1
+    if pivot <= 0 or pivot >= len(series) - 1:
+        return None
+
+    views = np.array([p["views"] for p in series], dtype=float)
+    old_rate = (views[pivot] - views[0]) / (days[pivot] - days[0])
+    new_rate = (views[-1] - views[pivot]) / (days[-1] - days[pivot])
+    if old_rate <= 0:
+        return None
+
+    return float((new_rate - old_rate) / old_rate * 100)
+
+
+def observed_video_velocity(video_history):
+    """
+    Daily view gain of recent uploads measured between stored snapshots.
+    Returns {"median_daily_views", "mean_daily_views", "videos", "days"} or None without usable history.
+    """
+    rates = []
+    spans = []
+    for series in (video_history or {}).values():
+        if len(series) < 2:
+            continue
+        span = (series[-1]["captured_at"] - series[0]["captured_at"]).total_seconds() / 86400
+        if span < MIN_VIDEO_HISTORY_DAYS:
+            continue
+        rates.append(max(0, series[-1]["views"] - series[0]["views"]) / span)
+        spans.append(span)
+
+    if not rates:
+        return None
+
+    rates = np.array(rates)
+    return {
+        "median_daily_views": int(np.median(rates)),
+        "mean_daily_views": int(rates.mean()),
+        "videos": len(rates),
+        "days": int(max(spans)),
+    }
+
+
+def history_chart(series):
+    """Stored snapshots as chart points: [{"date", "subscribers", "views", "videos"}]."""
+    return [
+        {
+            "date": p["captured_at"].isoformat() + "Z",
+            "subscribers": p["subscribers"],
+            "views": p["views"],
+            "videos": p["videos"],
+        }
+        for p in series or []
+    ]
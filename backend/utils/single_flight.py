@@ -0,0 +1,75 @@
+# backend/utils/single_flight.py
+
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one.
+    The first caller (leader) runs fn; callers arriving while it is in flight
+    wait for it and receive the same result (or the same exception).
+    Exceptions listed in private_errors belong to the leader alone (e.g. its own quota
+    budget ran out): waiters don't inherit them, they try again and one becomes the new leader.
+    Nothing is remembered once the call finishes - caching is the cache's job.
+    """
+
+    def __init__(self, private_errors=()):
+        self.private_errors = tuple(private_errors)
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.retried = 0
+
+    def do(self, key, fn):
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is not None:
+                    call.waiters += 1
+                    self.coalesced += 1
+                    leader = False
+                else:
+                    call = _Call()
+                    self._calls[key] = call
+                    self.leaders += 1
+                    leader = True
+
+            if leader:
+                break
+
+            call.done.wait()
+            if call.error is None:
+                return call.result
+            if not isinstance(call.error, self.private_errors):
+                raise call.error
+            with self._lock:
+                self.retried += 1
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "upstream_calls": self.leaders,
+                "coalesced_calls": self.coalesced,
+                "retried_after_leader_error": self.retried,
+            }
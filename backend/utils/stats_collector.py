@@ -0,0 +1,167 @@
+# backend/utils/stats_collector.py
+
+import os
+import time
+import threading
+from datetime import datetime, timezone
+from db import get_connection
+from models.StatSnapshot import StatSnapshot
+from utils.youtube_utils import youtube_get, fetch_video_ids, fetch_video_stats
+from utils.channel_index import remember_channel
+from utils.concurrency import bounded_map
+
+# Background collector: every interval, snapshot subscriber / view / video counts of every
+# channel in YouTubeChannel plus per-video stats of their most recent uploads, append them to
+# ChannelStatSnapshot / VideoStatSnapshot and downsample old rows. Forecasts read this history
+# (utils/growth_history.py) instead of guessing trends from a single live reading.
+#
+# Started from app.py when RUN_STATS_COLLECTOR=1. With several workers each one runs the loop
+# on its own clock; a MySQL named lock keeps two rounds from running at once, and a round is
+# skipped when the newest stored snapshot is younger than the interval, so the fleet as a whole
+# collects once per interval no matter how many workers there are or when they started.
+# `python -m utils.stats_collector` runs a single round (e.g. from cron), subject to the same check.
+
+SNAPSHOT_INTERVAL_MINUTES = float(os.getenv("YOUTUBE_SNAPSHOT_INTERVAL_MINUTES", "360"))
+SNAPSHOT_RECENT_VIDEOS = int(os.getenv("YOUTUBE_SNAPSHOT_RECENT_VIDEOS", "15"))
+# A round that starts this close to the end of the interval still counts as due (clock jitter)
+_DUE_SLACK = 0.95
+
+SNAPSHOT_CHANNEL_FIELDS = (
+    "etag,items(id,statistics(subscriberCount,viewCount,videoCount),"
+    "contentDetails/relatedPlaylists/uploads,snippet/title)"
+)
+LOCK_NAME = "youtube_stats_collector"
+
+_thread = None
+
+
+def _utc_now():
+    # Stored as naive UTC DATETIME
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def _fetch_channel_stats(channel_ids):
+    """Fresh statistics for many channels, 50 per channels call."""
+    batches = [channel_ids[i: i + 50] for i in range(0, len(channel_ids), 50)]
+
+    def fetch_batch(batch):
+        try:
+            # use_cache=False: a snapshot must be a new reading, not a cached one
+            return youtube_get("channels", {
+                "part": "statistics,contentDetails,snippet",
+                "id": ",".join(batch),
+                "maxResults": 50,
+            }, use_cache=False, fields=SNAPSHOT_CHANNEL_FIELDS)
+        except Exception as e:
+            print(f"Snapshot: channels batch starting at {batch[0]} failed: {e}")
+            return {}
+
+    channels = []
+    for data in bounded_map(fetch_batch, batches):
+        for item in data.get("items", []):
+            stats = item.get("statistics", {})
+            uploads = item.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+            remember_channel(item["id"], uploads, item.get("snippet", {}).get("title", ""))
+            channels.append({
+                "id": item["id"],
+                "uploads": uploads,
+                "subscribers": int(stats.get("subscriberCount", 0)),
+                "views": int(stats.get("viewCount", 0)),
+                "videos": int(stats.get("videoCount", 0)),
+            })
+    return channels
+
+
+def _interval_seconds():
+    return max(60.0, SNAPSHOT_INTERVAL_MINUTES * 60)
+
+
+def collect_once(min_interval_seconds=None):
+    """
+    Run one collection round. Returns a small summary dict.
+    Skipped when another worker holds the lock, or when the newest snapshot is younger than
+    min_interval_seconds (default: the collector interval; 0 forces a round).
+    """
+    if min_interval_seconds is None:
+        min_interval_seconds = _interval_seconds()
+
+    lock_conn = get_connection()
+    try:
+        if not StatSnapshot.try_lock(LOCK_NAME, lock_conn):
+            return {"skipped": True, "reason": "another worker is collecting"}
+
+        started = time.time()
+        captured_at = _utc_now()
+
+        latest = StatSnapshot.latest_captured_at()
+        if latest is not None and min_interval_seconds > 0:
+            age = (captured_at - latest).total_seconds()
+            if age < min_interval_seconds * _DUE_SLACK:
+                return {
+                    "skipped": True,
+                    "reason": f"latest snapshot is {int(age)}s old",
+                    "due_in": round(min_interval_seconds - age),
+                }
+
+        channel_ids = StatSnapshot.tracked_channel_ids()
+        channels = _fetch_channel_stats(channel_ids) if channel_ids else []
+        StatSnapshot.add_channel_snapshots(captured_at, [
+            (c["id"], c["subscribers"], c["views"], c["videos"]) for c in channels
+        ])
+
+        video_rows = 0
+        if SNAPSHOT_RECENT_VIDEOS > 0 and channels:
+            def recent_ids(channel):
+                try:
+                    return fetch_video_ids(channel["uploads"], SNAPSHOT_RECENT_VIDEOS)
+                except Exception as e:
+                    print(f"Snapshot: uploads of {channel['id']} failed: {e}")
+                    return []
+
+            video_ids = [vid for ids in bounded_map(recent_ids, channels) for vid in ids]
+            videos = fetch_video_stats(video_ids, with_snippet=False)
+            video_rows = StatSnapshot.add_video_snapshots(captured_at, [
+                (v["id"], v["views"], v["likes"], v["comments"]) for v in videos
+            ])
+
+        removed = StatSnapshot.downsample(captured_at)
+
+        summary = {
+            "captured_at": captured_at.isoformat() + "Z",
+            "channels": len(channels),
+            "videos": video_rows,
+            "downsampled": removed,
+            "seconds": round(time.time() - started, 2),
+        }
+        print(f"Stats snapshot: {summary}")
+        return summary
+    finally:
+        lock_conn.close()
+
+
+def _run_forever():
+    interval = _interval_seconds()
+    while True:
+        wait = interval
+        try:
+            summary = collect_once()
+            # Another worker collected recently: come back when the next round is due, not a full interval later
+            if "due_in" in summary:
+                wait = min(interval, max(60.0, summary["due_in"]))
+        except Exception as e:
+            # Never let one bad round (DB / API down) kill the collector
+            print(f"Stats snapshot failed: {e}")
+        time.sleep(wait)
+
+
+def start_collector():
+    """Start the background collector thread once per process."""
+    global _thread
+    if _thread is not None or SNAPSHOT_INTERVAL_MINUTES <= 0:
+        return
+    _thread = threading.Thread(target=_run_forever, name="yt-stats-collector", daemon=True)
+    _thread.start()
+
+
+if __name__ == "__main__":
+    print(collect_once())
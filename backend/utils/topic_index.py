@@ -0,0 +1,134 @@
+# backend/utils/topic_index.py
+
+import re
+import math
+import threading
+from collections import Counter
+
+# N-gram topic index over video titles, shared by all channels of one request.
+# Titles are tokenized once into ids of a common vocabulary; words, bigrams and trigrams are
+# counted per channel as token-id tuples. Picking topics keeps the original rule: a bigram or
+# word is "already covered" when it is a substring of any topic picked before it (so "game" is
+# hidden by "games" and by "gameplay tips"). Instead of scanning every picked topic, the picked
+# phrases are kept in one newline-separated string and each candidate is a single `in` check.
+#
+# scoring="count" ranks topics by how often they occur (the classic behaviour);
+# scoring="tfidf" ranks them by count x inverse channel frequency, so topics every linked
+# channel uses sink and the ones that distinguish a channel rise.
+
+STOP_WORDS = frozenset({
+    'about', 'with', 'what', 'this', 'that', 'from', 'have', 'been',
+    'into', 'your', 'more', 'than', 'when', 'where', 'which', 'their',
+    'there', 'these', 'those', 'will', 'would', 'could', 'should',
+    'make', 'made', 'want', 'very', 'just', 'some', 'also', 'here',
+    'they', 'them', 'then', 'only', 'other', 'such', 'even',
+    'most', 'much', 'many', 'well', 'back', 'down', 'over', 'after',
+    'before', 'through', 'during', 'while', 'since', 'until', 'because',
+    'video', 'videos', 'watch', 'watching', 'episode', 'part', 'full',
+    'new', 'latest', 'updated', 'best', 'top', 'must', 'need', 'every',
+    'how', 'why', 'can', 'you', 'the', 'and', 'for', 'are',
+    'all', 'any', 'has', 'had', 'but', 'not', 'was', 'our', 'out',
+    # Generic promotional words
+    'subscribe', 'like', 'share', 'comment', 'click', 'free', 'download',
+    'link', 'description', 'channel', 'please', 'don\'t', 'forget',
+})
+
+# Minimum occurrences per channel for a phrase to count as a topic
+MIN_TRIGRAM_COUNT = 2
+MIN_BIGRAM_COUNT = 3
+MIN_WORD_COUNT = 5
+
+_STRIP_RE = re.compile(r'[^\w\s-]')
+
+
+class TopicIndex:
+    def __init__(self):
+        self.vocab = {}
+        self.words = []
+        self.channels = {}
+        self._stop_ids = set()
+        self._lock = threading.Lock()
+
+    def _token_id(self, word):
+        token_id = self.vocab.get(word)
+        if token_id is None:
+            token_id = len(self.words)
+            self.vocab[word] = token_id
+            self.words.append(word)
+            if word in STOP_WORDS:
+                self._stop_ids.add(token_id)
+        return token_id
+
+    def add(self, key, videos):
+        """Count the words / bigrams / trigrams of a channel's video titles (thread-safe)."""
+        with self._lock:
+            self._add(key, videos)
+
+    def _add(self, key, videos):
+        unigrams, bigrams, trigrams = Counter(), Counter(), Counter()
+        stop = self._stop_ids
+        words = self.words
+
+        for video in videos:
+            title = _STRIP_RE.sub('', video.get("title", "").lower())
+            ids = [self._token_id(w) for w in title.split()]
+            n = len(ids)
+
+            # Single words (4+ characters, not stop words)
+            for t in ids:
+                if t not in stop and len(words[t]) >= 4 and words[t].isalpha():
+                    unigrams[(t,)] += 1
+
+            # Bigrams (2-word phrases), at least one non-stop word
+            for i in range(n - 1):
+                a, b = ids[i], ids[i + 1]
+                if (a not in stop or b not in stop) and len(words[a]) + len(words[b]) + 1 > 7:
+                    bigrams[(a, b)] += 1
+
+            # Trigrams (3-word phrases) - for specialized topics
+            for i in range(n - 2):
+                a, b, c = ids[i], ids[i + 1], ids[i + 2]
+                if (a not in stop or b not in stop or c not in stop) and \
+                        len(words[a]) + len(words[b]) + len(words[c]) + 2 > 10:
+                    trigrams[(a, b, c)] += 1
+
+        self.channels[key] = (unigrams, bigrams, trigrams)
+
+    def _idf(self, gram):
+        total = len(self.channels)
+        df = sum(1 for counts in self.channels.values() if gram in counts[len(gram) - 1])
+        return math.log((1 + total) / (1 + df)) + 1
+
+    def topics(self, key, limit: int = 20, scoring: str = "count"):
+        """[(phrase, count)] of one channel, most relevant first."""
+        if key not in self.channels:
+            return []
+        unigrams, bigrams, trigrams = self.channels[key]
+
+        words = self.words
+
+        def phrase(gram):
+            return " ".join(words[t] for t in gram)
+
+        # Trigrams (most specific) first
+        chosen = [g for g, count in trigrams.items() if count >= MIN_TRIGRAM_COUNT]
+        covered = "\n".join(phrase(g) for g in chosen)
+
+        # Bigrams, then single words, unless contained in a topic picked before them
+        for grams, min_count in ((bigrams, MIN_BIGRAM_COUNT), (unigrams, MIN_WORD_COUNT)):
+            for g, count in grams.items():
+                if count < min_count:
+                    continue
+                text = phrase(g)
+                if text not in covered:
+                    chosen.append(g)
+                    covered += "\n" + text
+
+        counts = [self.channels[key][len(g) - 1][g] for g in chosen]
+        if scoring == "tfidf":
+            scores = [count * self._idf(g) for g, count in zip(chosen, counts)]
+        else:
+            scores = counts
+
+        ranked = sorted(zip(chosen, counts, scores), key=lambda x: x[2], reverse=True)[:limit]
+        return [(phrase(g), count) for g, count, _ in ranked]
@@ -0,0 +1,103 @@
+# backend/utils/uploads_sync.py
+
+import os
+import time
+import threading
+import requests
+from models.UploadsSync import UploadsSync
+from utils.youtube_utils import page_playlist_ids
+from utils.youtube_quota import mark_partial
+from utils.youtube_retry import CircuitOpenError
+from utils.fail_soft_db import FailSoftDB
+
+# Incremental uploads-playlist sync. Uploads playlists are ordered newest first, so once we
+# know a channel's ids we only page until the first known id shows up and prepend what's new.
+# A big channel's catalog refresh then costs one playlistItems page instead of dozens.
+# State lives in YouTubeUploadsSync with an in-process memo in front; DB errors fail soft
+# (utils/fail_soft_db.py).
+
+# Ids kept per playlist
+SYNC_MAX_IDS = int(os.getenv("YOUTUBE_UPLOADS_SYNC_MAX_IDS", "5000"))
+# Re-page from scratch now and then so deleted / re-ordered uploads drop out
+FULL_RESYNC_SECONDS = float(os.getenv("YOUTUBE_UPLOADS_FULL_RESYNC_HOURS", "168")) * 3600
+
+_memo = {}
+_lock = threading.Lock()
+_db = FailSoftDB("Uploads sync")
+
+
+def _load(playlist_id):
+    """(video_ids, is_complete, full_synced_at epoch) or None."""
+    with _lock:
+        if playlist_id in _memo:
+            return _memo[playlist_id]
+
+    row = _db.call("read", UploadsSync.find, playlist_id)
+    if row is None:
+        return None
+
+    full_synced_at = row.full_synced_at.timestamp() if row.full_synced_at else 0.0
+    state = (row.video_ids, row.is_complete, full_synced_at)
+    with _lock:
+        _memo[playlist_id] = state
+    return state
+
+
+def _store(playlist_id, video_ids, is_complete, full_sync, full_synced_at):
+    if len(video_ids) > SYNC_MAX_IDS:
+        video_ids = video_ids[:SYNC_MAX_IDS]
+        is_complete = False
+
+    with _lock:
+        _memo[playlist_id] = (video_ids, is_complete, full_synced_at)
+    _db.call("write", UploadsSync.save, playlist_id, video_ids, is_complete, full_sync=full_sync)
+
+
+def _full_sync(playlist_id, max_videos):
+    limit = max(max_videos, 50)
+    video_ids, exhausted, _ = page_playlist_ids(playlist_id, limit)
+    if len(video_ids) >= limit or exhausted:
+        # Don't persist a listing that was cut short by quota / upstream errors
+        _store(playlist_id, video_ids, exhausted, True, time.time())
+    return video_ids[:max_videos]
+
+
+def sync_uploads(playlist_id: str, max_videos: int):
+    """Newest max_videos ids of an uploads playlist, fetching only what we haven't seen yet."""
+    state = _load(playlist_id)
+    if state is None or time.time() - state[2] > FULL_RESYNC_SECONDS:
+        return _full_sync(playlist_id, max_videos)
+
+    known, is_complete, full_synced_at = state
+    # A full page costs the same unit as a short one, so always look at least 50 uploads back
+    limit = max(max_videos, 50)
+
+    try:
+        new_ids, exhausted, hit_known = page_playlist_ids(playlist_id, limit, known=set(known))
+    except (requests.RequestException, CircuitOpenError) as e:
+        # Upstream down: the ids we already know are better than an error
+        print(f"Uploads sync for {playlist_id} served from the stored list: {e}")
+        mark_partial()
+        return known[:max_videos]
+
+    if hit_known:
+        merged = new_ids + known
+    elif exhausted:
+        # Paged to the end without meeting a known id: the stored ids are gone (deleted / privated)
+        merged, is_complete = new_ids, True
+    elif len(new_ids) >= limit:
+        # More new uploads than we paged; they can't be joined to the stored list without a gap
+        _store(playlist_id, new_ids, False, False, full_synced_at)
+        return new_ids[:max_videos]
+    else:
+        # Cut short by quota / upstream errors (already flagged partial); serve but don't persist
+        return (new_ids + known)[:max_videos]
+
+    if len(merged) < max_videos and not is_complete:
+        # Asked for more history than we have stored: one full listing extends it
+        return _full_sync(playlist_id, max_videos)
+
+    if new_ids or exhausted:
+        _store(playlist_id, merged, is_complete, False, full_synced_at)
+    return merged[:max_videos]
+
@@ -0,0 +1,95 @@
+# backend/utils/video_catalog.py
+
+import os
+import threading
+from collections import OrderedDict
+from models.YouTubeVideo import YouTubeVideo
+from utils.fail_soft_db import FailSoftDB
+
+# Local store for video metadata that doesn't change once published: title, publishedAt,
+# thumbnail (snippet) and duration (contentDetails). fetch_video_stats reads through it and
+# writes back whatever it had to download, so only statistics are requested for known videos.
+# Backed by the YouTubeVideo table with a bounded in-process LRU in front; DB errors fail soft
+# (utils/fail_soft_db.py).
+
+MEMO_MAX_ENTRIES = int(os.getenv("YOUTUBE_VIDEO_CATALOG_MEMO", "50000"))
+
+SNIPPET_KEYS = ("title", "publishedAt", "thumbnail")
+
+_memo = OrderedDict()
+_lock = threading.Lock()
+_db = FailSoftDB("Video catalog")
+
+
+def _remember(metas):
+    with _lock:
+        for vid, meta in metas.items():
+            merged = dict(_memo.get(vid, {}))
+            merged.update(meta)
+            _memo[vid] = merged
+            _memo.move_to_end(vid)
+        while len(_memo) > MEMO_MAX_ENTRIES:
+            _memo.popitem(last=False)
+
+
+def has_parts(meta, with_snippet: bool, with_duration: bool):
+    if meta is None:
+        return False
+    if with_snippet and "publishedAt" not in meta:
+        return False
+    if with_duration and "duration" not in meta:
+        return False
+    return True
+
+
+def lookup(video_ids):
+    """{video_id: metadata} for every id stored locally (metadata may hold only some parts)."""
+    found = {}
+    with _lock:
+        for vid in video_ids:
+            meta = _memo.get(vid)
+            if meta is not None:
+                _memo.move_to_end(vid)
+                found[vid] = meta
+
+    missing = [vid for vid in video_ids if vid not in found]
+    if missing:
+        rows = _db.call("read", YouTubeVideo.find_many, missing, default={})
+        loaded = {vid: row.to_dict() for vid, row in rows.items()}
+        _remember(loaded)
+        found.update(loaded)
+
+    return found
+
+
+def store(metas):
+    """Write through {video_id: metadata} (any subset of title/publishedAt/thumbnail/duration)."""
+    metas = {vid: meta for vid, meta in metas.items() if meta}
+    if not metas:
+        return
+
+    _remember(metas)
+    if not _db.available():
+        return
+
+    entries = []
+    for vid, meta in metas.items():
+        has_snippet = "publishedAt" in meta
+        entries.append((
+            vid,
+            meta.get("title", "") if has_snippet else None,
+            meta["publishedAt"] if has_snippet else None,
+            meta.get("thumbnail", "") if has_snippet else None,
+            meta.get("duration"),
+        ))
+
+    _db.call("write", YouTubeVideo.upsert_many, entries)
+
+
+def stats():
+    with _lock:
+        return {
+            "memo_entries": len(_memo),
+            "memo_max_entries": MEMO_MAX_ENTRIES,
+            **_db.stats(),
+        }
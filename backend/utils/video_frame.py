@@ -0,0 +1,135 @@
+# backend/utils/video_frame.py
+
+from datetime import datetime, timezone
+import numpy as np
+
+# Columnar, array-backed view of a list of videos for the analytics hot paths.
+# Built once per channel (fetch_video_stats(..., as_frame=True) or VideoFrame.of(videos)),
+# publish times are parsed a single time into datetime64, and every metric is a NumPy
+# reduction over whole columns instead of a Python loop over dicts.
+
+
+def _parse_times(values):
+    """RFC 3339 strings -> datetime64[s] (UTC); missing / unparsable values become NaT."""
+    values = list(values)
+    # Fast path: YouTube always sends UTC "YYYY-MM-DDTHH:MM:SS[.fff]Z"
+    if all(not v or (isinstance(v, str) and v.endswith("Z")) for v in values):
+        try:
+            return np.array([v[:19] if v else "NaT" for v in values], dtype="datetime64[s]")
+        except ValueError:
+            pass
+
+    parsed = []
+    for v in values:
+        try:
+            dt = datetime.fromisoformat(v.replace("Z", "+00:00"))
+            if dt.tzinfo is not None:
+                dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+            parsed.append(np.datetime64(dt, "s"))
+        except (AttributeError, TypeError, ValueError):
+            parsed.append(np.datetime64("NaT", "s"))
+    return np.array(parsed, dtype="datetime64[s]")
+
+
+def _ratio(numerator, denominator):
+    """Elementwise numerator / denominator, 0 where the denominator is 0."""
+    out = np.zeros(len(denominator), dtype=float)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+class VideoFrame:
+    def __init__(self, ids, views, likes, comments, published, durations=None, titles=None):
+        self.ids = np.asarray(ids, dtype=object)
+        self.views = np.asarray(views, dtype=np.int64)
+        self.likes = np.asarray(likes, dtype=np.int64)
+        self.comments = np.asarray(comments, dtype=np.int64)
+        self.published = np.asarray(published, dtype="datetime64[s]")
+        self.durations = (
+            np.asarray(durations, dtype=np.int64) if durations is not None
+            else np.zeros(len(self.ids), dtype=np.int64)
+        )
+        self.titles = np.asarray(titles if titles is not None else [""] * len(self.ids), dtype=object)
+        self._engagement = None
+
+    @classmethod
+    def from_videos(cls, videos):
+        """Build from the video dicts returned by fetch_video_stats."""
+        return cls(
+            [v.get("id", "") for v in videos],
+            [v.get("views", 0) for v in videos],
+            [v.get("likes", 0) for v in videos],
+            [v.get("comments", 0) for v in videos],
+            _parse_times([v.get("publishedAt") for v in videos]),
+            [v.get("duration", 0) or 0 for v in videos],
+            [v.get("title", "") for v in videos],
+        )
+
+    @classmethod
+    def of(cls, videos):
+        """A VideoFrame as-is, anything else (list of dicts / None) converted."""
+        if isinstance(videos, cls):
+            return videos
+        return cls.from_videos(videos or [])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def take(self, index):
+        """Rows by integer index / mask, as a new frame."""
+        return VideoFrame(
+            self.ids[index],
+            self.views[index],
+            self.likes[index],
+            self.comments[index],
+            self.published[index],
+            self.durations[index],
+            self.titles[index],
+        )
+
+    # ----- derived columns -----
+
+    @property
+    def engagement(self):
+        """(likes + comments) / views per video, 0 for videos without views."""
+        if self._engagement is None:
+            self._engagement = _ratio(self.likes + self.comments, self.views)
+        return self._engagement
+
+    @property
+    def like_ratio(self):
+        return _ratio(self.likes, self.views)
+
+    @property
+    def comment_ratio(self):
+        return _ratio(self.comments, self.views)
+
+    def dated(self):
+        """Videos with a publish time, oldest first (stable for equal times)."""
+        valid = np.flatnonzero(~np.isnat(self.published))
+        order = valid[np.argsort(self.published[valid], kind="stable")]
+        return self.take(order)
+
+    def span_days(self):
+        """Whole days between the first and last publish time of a dated frame."""
+        if len(self) < 2:
+            return 0
+        return int((self.published[-1] - self.published[0]) // np.timedelta64(1, "D"))
+
+    # ----- interop -----
+
+    def to_videos(self):
+        """Back to the list-of-dicts shape the routes return."""
+        published = np.datetime_as_string(self.published, unit="s")
+        return [
+            {
+                "id": self.ids[i],
+                "views": int(self.views[i]),
+                "likes": int(self.likes[i]),
+                "comments": int(self.comments[i]),
+                "title": self.titles[i],
+                "publishedAt": "" if np.isnat(self.published[i]) else published[i] + "Z",
+                "duration": int(self.durations[i]),
+            }
+            for i in range(len(self))
+        ]
@@ -0,0 +1,161 @@
+# backend/utils/youtube_cache.py
+
+import os
+import time
+import threading
+from collections import OrderedDict
+
+# Memory bounds for the per-process response cache
+CACHE_MAX_ENTRIES = int(os.getenv("YOUTUBE_CACHE_MAX_ENTRIES", "2048"))
+CACHE_MAX_BYTES = int(os.getenv("YOUTUBE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Seconds each endpoint stays fresh.
+# "channels:contentDetails" is a channels call without statistics, i.e. only contentDetails (uploads
+# playlist id) and / or snippet (title) - the channel index lookups. Both practically never change;
+# anything asking for statistics follows the shorter "channels" TTL.
+DEFAULT_TTLS = {
+    "channels": 300,
+    "channels:contentDetails": 7 * 24 * 3600,
+    "playlistItems": 900,
+    "videos": 300,
+    "commentThreads": 600,
+}
+DEFAULT_TTL = 300
+
+
+def _env_ttl(name, default):
+    # e.g. YOUTUBE_CACHE_TTL_PLAYLISTITEMS=1800, YOUTUBE_CACHE_TTL_CHANNELS_CONTENTDETAILS=86400
+    env_name = "YOUTUBE_CACHE_TTL_" + name.replace(":", "_").upper()
+    try:
+        return int(os.getenv(env_name, default))
+    except ValueError:
+        return default
+
+
+CACHE_TTLS = {name: _env_ttl(name, ttl) for name, ttl in DEFAULT_TTLS.items()}
+
+
+def ttl_for(endpoint: str, params: dict):
+    """Pick the TTL for a call based on its endpoint and requested parts."""
+    parts = set(str(params.get("part", "")).split(","))
+    if endpoint == "channels" and "statistics" not in parts and parts & {"contentDetails", "snippet"}:
+        return CACHE_TTLS["channels:contentDetails"]
+    return CACHE_TTLS.get(endpoint, DEFAULT_TTL)
+
+
+def make_cache_key(endpoint: str, params: dict):
+    """
+    Normalize endpoint + params into a stable key.
+    The API key is never part of the key, and param order does not matter
+    (values are stringified so maxResults=50 and "50" hit the same entry).
+    """
+    items = sorted(
+        (str(k), str(v))
+        for k, v in params.items()
+        if k != "key" and v is not None
+    )
+    return endpoint + "?" + "&".join(f"{k}={v}" for k, v in items)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with per-entry TTL, bounded by entry count and approximate bytes.
+    Cached values are shared between callers, so treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()  # key -> [value, expires_at, size, etag]
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.revalidations = 0
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, size, etag = entry
+            if expires_at <= now:
+                # Entries with an etag stay around (until LRU-evicted) so they can be revalidated
+                if not etag:
+                    self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek_stale(self, key):
+        """Return (value, etag) for an entry even if it has expired; None if absent or without etag."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or not entry[3]:
+                return None
+            return entry[0], entry[3]
+
+    def refresh(self, key, ttl: int):
+        """Extend an entry's lifetime after a 304 Not Modified."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return
+            entry[1] = time.time() + ttl
+            self._data.move_to_end(key)
+            self.revalidations += 1
+
+    def set(self, key, value, ttl: int, size: int = 0, etag: str = None):
+        if ttl <= 0 or self.max_entries <= 0 or size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+            self._data[key] = [value, time.time() + ttl, size, etag]
+            self._bytes += size
+
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._data.pop(key)
+        self._bytes -= entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "revalidations": self.revalidations,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0,
+                "ttls": dict(CACHE_TTLS),
+            }
+
+
+# Shared per-process instance used by youtube_get
+response_cache = ResponseCache()
@@ -0,0 +1,258 @@
+# backend/utils/youtube_disk_cache.py
+
+import os
+import time
+import zlib
+import sqlite3
+import threading
+
+# Shared on-disk tier for youtube_get responses.
+# Every gunicorn worker on the host opens the same SQLite file (WAL mode lets readers and
+# one writer work at the same time), and the file survives restarts, so workers start warm.
+DISK_CACHE_ENABLED = os.getenv("YOUTUBE_DISK_CACHE", "1").lower() in ("1", "true", "yes")
+# Fake-API runs (utils/youtube_fake.py) get their own file so synthetic data never mixes with real responses
+_DEFAULT_CACHE_FILE = "youtube_cache.fake.sqlite3" if os.getenv("YOUTUBE_API_MODE", "live").lower() == "fake" else "youtube_cache.sqlite3"
+DISK_CACHE_PATH = os.getenv(
+    "YOUTUBE_DISK_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", _DEFAULT_CACHE_FILE),
+)
+DISK_CACHE_MAX_BYTES = int(os.getenv("YOUTUBE_DISK_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# How often (in writes) the size cap is checked, and how far below the cap eviction trims to
+_EVICT_EVERY = 50
+_EVICT_TARGET = 0.9
+# Hit/miss counters are flushed to the shared table at most this often (seconds)
+_STATS_FLUSH_SECONDS = 10
+# Expired rows that carry an etag are kept this long so they can still be revalidated with If-None-Match
+STALE_GRACE_SECONDS = int(os.getenv("YOUTUBE_DISK_CACHE_STALE_SECONDS", str(7 * 24 * 3600)))
+# last_access is only rewritten when older than this, so hot keys don't turn every read into a write
+_TOUCH_SECONDS = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entry (
+    cache_key    TEXT PRIMARY KEY,
+    body         BLOB NOT NULL,
+    size         INTEGER NOT NULL,
+    expires_at   REAL NOT NULL,
+    last_access  REAL NOT NULL,
+    etag         TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_cache_entry_access ON cache_entry (last_access);
+CREATE TABLE IF NOT EXISTS cache_stat (
+    name   TEXT PRIMARY KEY,
+    value  INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class DiskCache:
+    """
+    SQLite-backed cache shared by all processes on a host.
+    Bodies are stored zlib-compressed; size on disk is capped with least-recently-used eviction.
+    Every method swallows sqlite / filesystem errors (opening the file can raise OSError on a
+    read-only or unwritable cache directory): a broken cache file must never fail an API request.
+    """
+
+    def __init__(self, path: str = DISK_CACHE_PATH, max_bytes: int = DISK_CACHE_MAX_BYTES, enabled: bool = DISK_CACHE_ENABLED):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._pending = {"hits": 0, "misses": 0, "evictions": 0}
+        self._last_flush = time.time()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return conn
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(cache_entry)").fetchall()]
+        if "etag" not in columns:
+            conn.execute("ALTER TABLE cache_entry ADD COLUMN etag TEXT")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        """Return (body_bytes, expires_at) for a live entry, or None."""
+        if not self.enabled:
+            return None
+
+        try:
+            now = time.time()
+            row = self._conn().execute(
+                "SELECT body, expires_at, last_access FROM cache_entry WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None or row[1] <= now:
+                self._count("misses")
+                return None
+
+            if now - row[2] > _TOUCH_SECONDS:
+                self._conn().execute(
+                    "UPDATE cache_entry SET last_access = ? WHERE cache_key = ?", (now, key)
+                )
+
+            self._count("hits")
+            return zlib.decompress(row[0]), row[1]
+        except (sqlite3.Error, zlib.error, OSError) as e:
+            print(f"Disk cache read failed for {key}: {e}")
+            return None
+
+    def get_stale(self, key):
+        """Return (body_bytes, etag) for an entry that has an etag, expired or not; None otherwise."""
+        if not self.enabled:
+            return None
+
+        try:
+            row = self._conn().execute(
+                "SELECT body, etag FROM cache_entry WHERE cache_key = ? AND etag IS NOT NULL",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            return zlib.decompress(row[0]), row[1]
+        except (sqlite3.Error, zlib.error, OSError) as e:
+            print(f"Disk cache read failed for {key}: {e}")
+            return None
+
+    def set(self, key, body: bytes, ttl: int, etag: str = None):
+        if not self.enabled or ttl <= 0:
+            return
+
+        try:
+            now = time.time()
+            compressed = zlib.compress(body, 6)
+            self._conn().execute(
+                "INSERT OR REPLACE INTO cache_entry (cache_key, body, size, expires_at, last_access, etag) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, compressed, len(compressed), now + ttl, now, etag),
+            )
+
+            with self._lock:
+                self._writes += 1
+                check = self._writes % _EVICT_EVERY == 0
+            if check:
+                self.evict()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Disk cache write failed for {key}: {e}")
+
+    def refresh(self, key, ttl: int):
+        """Extend an entry's lifetime after a 304 Not Modified, without rewriting the body."""
+        if not self.enabled:
+            return
+
+        try:
+            now = time.time()
+            self._conn().execute(
+                "UPDATE cache_entry SET expires_at = ?, last_access = ? WHERE cache_key = ?",
+                (now + ttl, now, key),
+            )
+        except (sqlite3.Error, OSError) as e:
+            print(f"Disk cache refresh failed for {key}: {e}")
+
+    def evict(self):
+        """Drop expired rows, then least-recently-used rows until under the size cap."""
+        try:
+            conn = self._conn()
+            now = time.time()
+            conn.execute(
+                "DELETE FROM cache_entry WHERE expires_at <= ? AND (etag IS NULL OR expires_at <= ?)",
+                (now, now - STALE_GRACE_SECONDS),
+            )
+
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entry").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            target = self.max_bytes * _EVICT_TARGET
+            removed = 0
+            rows = conn.execute(
+                "SELECT cache_key, size FROM cache_entry ORDER BY last_access ASC"
+            ).fetchall()
+
+            victims = []
+            for cache_key, size in rows:
+                if total <= target:
+                    break
+                victims.append((cache_key,))
+                total -= size
+                removed += 1
+
+            conn.executemany("DELETE FROM cache_entry WHERE cache_key = ?", victims)
+            self._count("evictions", removed)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Disk cache eviction failed: {e}")
+
+    def _count(self, name, amount: int = 1):
+        with self._lock:
+            self._pending[name] += amount
+            if time.time() - self._last_flush < _STATS_FLUSH_SECONDS:
+                return
+            pending = self._pending
+            self._pending = {"hits": 0, "misses": 0, "evictions": 0}
+            self._last_flush = time.time()
+
+        self._flush(pending)
+
+    def _flush(self, pending):
+        try:
+            self._conn().executemany(
+                "INSERT INTO cache_stat (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                [(name, value) for name, value in pending.items() if value],
+            )
+        except (sqlite3.Error, OSError) as e:
+            print(f"Disk cache stats flush failed: {e}")
+
+    def clear(self):
+        try:
+            self._conn().execute("DELETE FROM cache_entry")
+        except (sqlite3.Error, OSError) as e:
+            print(f"Disk cache clear failed: {e}")
+
+    def stats(self):
+        """Host-wide numbers (all workers), plus this worker's not-yet-flushed counters."""
+        if not self.enabled:
+            return {"enabled": False}
+
+        with self._lock:
+            pending = dict(self._pending)
+
+        try:
+            conn = self._conn()
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entry"
+            ).fetchone()
+            counters = dict(conn.execute("SELECT name, value FROM cache_stat").fetchall())
+        except (sqlite3.Error, OSError) as e:
+            return {"enabled": True, "error": str(e)}
+
+        hits = counters.get("hits", 0) + pending["hits"]
+        misses = counters.get("misses", 0) + pending["misses"]
+        lookups = hits + misses
+
+        return {
+            "enabled": True,
+            "path": self.path,
+            "entries": entries,
+            "compressed_bytes": size,
+            "file_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "evictions": counters.get("evictions", 0) + pending["evictions"],
+            "hit_rate": round(hits / lookups, 3) if lookups else 0,
+        }
+
+
+# Shared per-process handle (the data itself is shared by every process on the host)
+disk_cache = DiskCache()
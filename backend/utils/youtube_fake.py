@@ -0,0 +1,418 @@
+# backend/utils/youtube_fake.py
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse, parse_qs
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Offline stand-in for the YouTube Data API, for load tests / profiling without spending quota.
+#
+#   YOUTUBE_API_MODE=live    (default) real googleapis.com
+#   YOUTUBE_API_MODE=fake    serve recorded fixtures when present, synthetic data otherwise
+#   YOUTUBE_API_MODE=record  call the real API and save every 200 response as a fixture
+#
+# In fake / record mode youtube_http mounts FakeYouTubeAdapter on the shared session, so
+# youtube_get and everything above it (caches, single-flight, retries, quota) run unchanged.
+# `python -m utils.youtube_fake --port 8765` serves the same data over HTTP for other clients.
+#
+# Synthetic channels are deterministic per channel id (same id -> same videos, stats, comments).
+# Comments, pagination (nextPageToken) and etags / If-None-Match (304) behave like the real API;
+# the `fields` mask is ignored (full items are returned).
+
+API_MODE = os.getenv("YOUTUBE_API_MODE", "live").lower()
+FIXTURES_DIR = os.getenv(
+    "YOUTUBE_FAKE_FIXTURES",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "youtube_fixtures"),
+)
+
+# Synthetic channel size
+FAKE_VIDEOS_PER_CHANNEL = int(os.getenv("YOUTUBE_FAKE_VIDEOS_PER_CHANNEL", "200"))
+FAKE_COMMENTS_PER_VIDEO = int(os.getenv("YOUTUBE_FAKE_COMMENTS_PER_VIDEO", "120"))
+FAKE_SEED = os.getenv("YOUTUBE_FAKE_SEED", "0")
+
+# Latency: "50" (fixed ms) or "20-120" (uniform range, ms)
+FAKE_LATENCY_MS = os.getenv("YOUTUBE_FAKE_LATENCY_MS", "0")
+# Fault injection: share of calls that fail, picked uniformly from the listed kinds
+FAKE_FAULT_RATE = float(os.getenv("YOUTUBE_FAKE_FAULT_RATE", "0"))
+FAKE_FAULTS = [f.strip() for f in os.getenv("YOUTUBE_FAKE_FAULTS", "429,500,503,quotaExceeded").split(",") if f.strip()]
+# An injected quotaExceeded spends the calling API key (the `key` param), like the real API: that
+# key keeps answering quotaExceeded for this long while other keys are unaffected, so key failover
+# (utils/youtube_keys.py) runs against it.
+FAKE_QUOTA_SECONDS = float(os.getenv("YOUTUBE_FAKE_QUOTA_SECONDS", "30"))
+
+API_ROOT = "https://www.googleapis.com/"
+
+_WORDS = (
+    "amazing tutorial review unboxing vlog guide tips challenge reaction live update build "
+    "setup budget pro beginner ultimate honest first week month year best worst easy fast"
+).split()
+_COMMENTS = [
+    "This is amazing, thanks for sharing!",
+    "Great video, really helpful tutorial",
+    "I don't like this one, too long",
+    "Can you make a video about the setup?",
+    "Love it! Best channel on YouTube",
+    "Not bad but the audio is terrible",
+    "Finally someone explains it properly",
+    "Please do a part 2",
+    "This was boring honestly",
+    "Wow, what a great idea, I will try this",
+]
+_DURATIONS = ["PT45S", "PT3M12S", "PT8M30S", "PT12M5S", "PT21M40S", "PT1H2M10S"]
+
+
+def _rng(*parts):
+    digest = hashlib.sha1("|".join([FAKE_SEED, *map(str, parts)]).encode("utf-8")).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+def _etag(body):
+    return '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest()[:27] + '"'
+
+
+def _error_body(code, reason, message):
+    return {"error": {"code": code, "message": message, "errors": [{"reason": reason, "message": message}]}}
+
+
+def _page(params, total, max_allowed):
+    """(start, end, next_token) for offset-based page tokens."""
+    try:
+        size = max(1, min(max_allowed, int(params.get("maxResults", 5))))
+    except ValueError:
+        size = 5
+    token = params.get("pageToken", "")
+    start = int(token[1:]) if re.fullmatch(r"p\d+", token or "") else 0
+    end = min(total, start + size)
+    return start, end, (f"p{end}" if end < total else None)
+
+
+class SyntheticYouTube:
+    """Deterministic fake data for channels / playlistItems / videos / commentThreads."""
+
+    def __init__(self, videos_per_channel=FAKE_VIDEOS_PER_CHANNEL, comments_per_video=FAKE_COMMENTS_PER_VIDEO):
+        self.videos_per_channel = videos_per_channel
+        self.comments_per_video = comments_per_video
+        self.epoch = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    # --- ids ---
+    @staticmethod
+    def _channel_key(channel_id):
+        return channel_id[2:] if channel_id.startswith(("UC", "UU")) else channel_id
+
+    def _video_id(self, channel_key, index):
+        # 11 chars like real ids; index 0 = newest upload
+        return (hashlib.sha1(channel_key.encode("utf-8")).hexdigest()[:5] + f"{index:06d}")[:11]
+
+    # --- endpoints ---
+    def channels(self, params):
+        if params.get("forHandle") or params.get("forUsername"):
+            name = (params.get("forHandle") or params.get("forUsername")).lstrip("@").lower()
+            ids = ["UC" + hashlib.sha1(name.encode("utf-8")).hexdigest()[:22]]
+        else:
+            ids = [cid for cid in params.get("id", "").split(",") if cid]
+
+        items = []
+        for cid in ids:
+            key = self._channel_key(cid)
+            rng = _rng("channel", key)
+            subs = rng.randint(1_000, 5_000_000)
+            items.append({
+                "kind": "youtube#channel",
+                "id": cid,
+                "snippet": {"title": f"Synthetic Channel {key[:6]}"},
+                "contentDetails": {"relatedPlaylists": {"uploads": "UU" + key}},
+                "statistics": {
+                    "subscriberCount": str(subs),
+                    "viewCount": str(subs * rng.randint(20, 400)),
+                    "videoCount": str(self.videos_per_channel),
+                },
+            })
+        return {"kind": "youtube#channelListResponse", "pageInfo": {"totalResults": len(items)}, "items": items}
+
+    def playlistItems(self, params):
+        key = self._channel_key(params.get("playlistId", ""))
+        if not key:
+            return None
+        start, end, next_token = _page(params, self.videos_per_channel, 50)
+        body = {
+            "kind": "youtube#playlistItemListResponse",
+            "pageInfo": {"totalResults": self.videos_per_channel, "resultsPerPage": end - start},
+            "items": [{"contentDetails": {"videoId": self._video_id(key, i)}} for i in range(start, end)],
+        }
+        if next_token:
+            body["nextPageToken"] = next_token
+        return body
+
+    def videos(self, params):
+        items = []
+        for vid in [v for v in params.get("id", "").split(",") if v][:50]:
+            index = int(vid[5:]) if vid[5:].isdigit() else 0
+            rng = _rng("video", vid)
+            views = int(rng.paretovariate(1.3) * 2_000)
+            published = self.epoch - timedelta(days=index * 3, hours=rng.randint(0, 23))
+            items.append({
+                "kind": "youtube#video",
+                "id": vid,
+                "snippet": {
+                    "title": " ".join(rng.choice(_WORDS) for _ in range(rng.randint(3, 8))).title(),
+                    "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "thumbnails": {"medium": {"url": f"https://i.ytimg.com/vi/{vid}/mqdefault.jpg"}},
+                },
+                "contentDetails": {"duration": rng.choice(_DURATIONS)},
+                "statistics": {
+                    "viewCount": str(views),
+                    "likeCount": str(int(views * rng.uniform(0.01, 0.08))),
+                    "commentCount": str(self.comments_per_video),
+                },
+            })
+        return {"kind": "youtube#videoListResponse", "pageInfo": {"totalResults": len(items)}, "items": items}
+
+    def commentThreads(self, params):
+        vid = params.get("videoId")
+        if not vid:
+            return None
+        start, end, next_token = _page(params, self.comments_per_video, 100)
+        items = []
+        for i in range(start, end):
+            rng = _rng("comment", vid, i)
+            author = f"user{rng.randint(1, 5000)}"
+            published = self.epoch - timedelta(minutes=i * 37)
+            items.append({
+                "kind": "youtube#commentThread",
+                "id": f"{vid}.{i}",
+                "snippet": {
+                    "videoId": vid,
+                    "topLevelComment": {"snippet": {
+                        "authorDisplayName": author,
+                        "authorChannelId": {"value": "UC" + hashlib.sha1(author.encode("utf-8")).hexdigest()[:22]},
+                        "textDisplay": rng.choice(_COMMENTS),
+                        "likeCount": rng.randint(0, 500),
+                        "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    }},
+                    "totalReplyCount": 0,
+                },
+            })
+        body = {"kind": "youtube#commentThreadListResponse", "items": items}
+        if next_token:
+            body["nextPageToken"] = next_token
+        return body
+
+    def search(self, params):
+        return {"kind": "youtube#searchListResponse", "items": []}
+
+    def respond(self, endpoint, params):
+        handler = getattr(self, endpoint, None) if endpoint in (
+            "channels", "playlistItems", "videos", "commentThreads", "search"
+        ) else None
+        body = handler(params) if handler else None
+        if body is None:
+            return 404, _error_body(404, "notFound", f"Unknown resource: {endpoint}")
+        return 200, body
+
+
+class FixtureStore:
+    """Recorded responses on disk, one JSON file per (endpoint, params) minus the API key."""
+
+    def __init__(self, root=FIXTURES_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _path(self, endpoint, params):
+        from utils.youtube_cache import make_cache_key
+        digest = hashlib.sha1(make_cache_key(endpoint, params).encode("utf-8")).hexdigest()
+        return os.path.join(self.root, endpoint, digest + ".json")
+
+    def load(self, endpoint, params):
+        try:
+            with open(self._path(endpoint, params), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, endpoint, params, body):
+        path = self._path(endpoint, params)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(body, f)
+
+
+def _latency_seconds():
+    spec = FAKE_LATENCY_MS.strip()
+    try:
+        if "-" in spec:
+            low, high = (float(x) for x in spec.split("-", 1))
+            return random.uniform(low, high) / 1000
+        return float(spec or 0) / 1000
+    except ValueError:
+        return 0.0
+
+
+def _pick_fault():
+    """Kind of failure to inject for this call, or None."""
+    if FAKE_FAULT_RATE <= 0 or not FAKE_FAULTS or random.random() >= FAKE_FAULT_RATE:
+        return None
+    return random.choice(FAKE_FAULTS)
+
+
+def _fault_response(kind):
+    """(status, body, headers) for an injected failure."""
+    if kind in ("quotaExceeded", "rateLimitExceeded", "userRateLimitExceeded"):
+        return 403, _error_body(403, kind, f"Injected {kind}"), {}
+    status = int(kind) if kind.isdigit() else 500
+    headers = {"Retry-After": "1"} if status == 429 else {}
+    return status, _error_body(status, "backendError" if status >= 500 else "rateLimitExceeded", "Injected fault"), headers
+
+
+class FakeApi:
+    """Fixtures -> synthetic data, plus latency, faults and conditional requests."""
+
+    def __init__(self, fixtures=None, synthetic=None):
+        self.fixtures = fixtures or FixtureStore()
+        self.synthetic = synthetic or SyntheticYouTube()
+        self.calls = 0
+        self.faults = 0
+        self._spent_keys = {}  # API key -> time.monotonic() until which it is out of quota
+        self._lock = threading.Lock()
+
+    def handle(self, endpoint, params, if_none_match=None):
+        """Return (status, body or None, headers)."""
+        with self._lock:
+            self.calls += 1
+
+        delay = _latency_seconds()
+        if delay > 0:
+            time.sleep(delay)
+
+        api_key = params.get("key", "")
+        now = time.monotonic()
+        with self._lock:
+            spent = self._spent_keys.get(api_key, 0) > now
+        kind = "quotaExceeded" if spent else _pick_fault()
+        if kind is not None:
+            with self._lock:
+                self.faults += 1
+                if kind == "quotaExceeded" and not spent:
+                    self._spent_keys[api_key] = now + FAKE_QUOTA_SECONDS
+            return _fault_response(kind)
+
+        params = {k: v for k, v in params.items() if k not in ("key", "fields")}
+        body = self.fixtures.load(endpoint, params)
+        status = 200
+        if body is None:
+            status, body = self.synthetic.respond(endpoint, params)
+        if status != 200:
+            return status, body, {}
+
+        body = dict(body)
+        body["etag"] = body.get("etag") or _etag(body)
+        if if_none_match and if_none_match == body["etag"]:
+            return 304, None, {"ETag": body["etag"]}
+        return 200, body, {"ETag": body["etag"]}
+
+
+def _build_response(request, status, body, headers):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.reason = {200: "OK", 304: "Not Modified"}.get(status, "Error")
+    resp.headers = CaseInsensitiveDict(headers)
+    resp._content = json.dumps(body).encode("utf-8") if body is not None else b""
+    if body is not None:
+        resp.headers["Content-Type"] = "application/json; charset=UTF-8"
+    resp.encoding = "utf-8"
+    resp.url = request.url
+    resp.request = request
+    return resp
+
+
+def _split_url(url):
+    parsed = urlparse(url)
+    endpoint = parsed.path.rstrip("/").rsplit("/", 1)[-1]
+    params = {k: v[-1] for k, v in parse_qs(parsed.query, keep_blank_values=True).items()}
+    return endpoint, params
+
+
+class FakeYouTubeAdapter(BaseAdapter):
+    """requests transport adapter answering googleapis.com calls from FakeApi (no network)."""
+
+    def __init__(self, api=None):
+        super().__init__()
+        self.api = api or FakeApi()
+
+    def send(self, request, **kwargs):
+        endpoint, params = _split_url(request.url)
+        status, body, headers = self.api.handle(endpoint, params, request.headers.get("If-None-Match"))
+        return _build_response(request, status, body, headers)
+
+    def close(self):
+        pass
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Real HTTP, but every successful response is also written to the fixture store."""
+
+    def __init__(self, fixtures=None, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures or FixtureStore()
+
+    def send(self, request, **kwargs):
+        resp = super().send(request, **kwargs)
+        if resp.status_code == 200:
+            endpoint, params = _split_url(request.url)
+            params = {k: v for k, v in params.items() if k not in ("key", "fields")}
+            try:
+                self.fixtures.save(endpoint, params, resp.json())
+            except Exception as e:
+                print(f"Fixture recording failed for {endpoint}: {e}")
+        return resp
+
+
+def build_adapter(**pool_kwargs):
+    """Adapter for googleapis.com according to YOUTUBE_API_MODE (None = live, use the normal one)."""
+    if API_MODE == "fake":
+        return FakeYouTubeAdapter()
+    if API_MODE == "record":
+        return RecordingAdapter(**pool_kwargs)
+    return None
+
+
+def serve(port=8765, host="127.0.0.1"):
+    """Serve the fake API over HTTP at http://host:port/youtube/v3/<endpoint>."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    api = FakeApi()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            endpoint, params = _split_url(self.path)
+            status, body, headers = api.handle(endpoint, params, self.headers.get("If-None-Match"))
+            payload = json.dumps(body).encode("utf-8") if body is not None else b""
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            if body is not None:
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Fake YouTube API on http://{host}:{port}/youtube/v3 (set YOUTUBE_API_BASE to use it)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[sys.argv.index("--port") + 1]) if "--port" in sys.argv else 8765
+    serve(port)
@@ -0,0 +1,121 @@
+# backend/utils/youtube_http.py
+
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# Pool sizing (tune per deployment through .env)
+#   YOUTUBE_POOL_CONNECTIONS -> how many distinct hosts keep a pool
+#   YOUTUBE_POOL_MAXSIZE     -> how many keep-alive sockets each host pool keeps
+#   YOUTUBE_POOL_BLOCK       -> wait for a free socket instead of opening a throwaway one
+POOL_CONNECTIONS = int(os.getenv("YOUTUBE_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.getenv("YOUTUBE_POOL_MAXSIZE", "32"))
+POOL_BLOCK = os.getenv("YOUTUBE_POOL_BLOCK", "0").lower() in ("1", "true", "yes")
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+_request_count = 0
+
+
+def _build_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=POOL_BLOCK,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    # YOUTUBE_API_MODE=fake / record swaps the googleapis.com transport (utils/youtube_fake.py)
+    if os.getenv("YOUTUBE_API_MODE", "live").lower() != "live":
+        from utils.youtube_fake import build_adapter, API_ROOT
+        fake = build_adapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, pool_block=POOL_BLOCK)
+        if fake is not None:
+            session.mount(API_ROOT, fake)
+    session.headers.update({"Accept-Encoding": "gzip, deflate"})
+    return session
+
+
+def get_session():
+    """
+    Return the process-wide keep-alive session.
+    The session is rebuilt after a fork (gunicorn workers) so sockets are never shared between processes.
+    """
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is not None and _session_pid == pid:
+        return _session
+
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            _session = _build_session()
+            _session_pid = pid
+    return _session
+
+
+def http_get(url: str, params: dict = None, headers: dict = None, timeout: int = 10):
+    """GET through the shared pooled session (one TCP+TLS handshake per pooled socket, not per call)."""
+    global _request_count
+    with _session_lock:
+        _request_count += 1
+    return get_session().get(url, params=params, headers=headers, timeout=timeout)
+
+
+def reset_session():
+    """Close every pooled socket (used by tests / admin tooling)."""
+    global _session, _session_pid
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _session_pid = None
+
+
+def get_pool_stats():
+    """
+    Snapshot of the connection pools behind the shared session.
+    num_connections = sockets ever opened, num_requests = requests sent through the pool,
+    so reuse_ratio close to 1.0 means almost every request reused a warm connection.
+    """
+    stats = {
+        "pool_connections": POOL_CONNECTIONS,
+        "pool_maxsize": POOL_MAXSIZE,
+        "pool_block": POOL_BLOCK,
+        "requests_sent": _request_count,
+        "hosts": [],
+    }
+
+    session = _session
+    if session is None or _session_pid != os.getpid():
+        return stats
+
+    seen = set()
+    for adapter in session.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+
+        manager = getattr(adapter, "poolmanager", None)
+        if manager is None:
+            continue
+
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            if pool is None:
+                continue
+            opened = getattr(pool, "num_connections", 0)
+            sent = getattr(pool, "num_requests", 0)
+            idle = pool.pool.qsize() if getattr(pool, "pool", None) is not None else 0
+            stats["hosts"].append({
+                "host": f"{pool.scheme}://{pool.host}:{pool.port}",
+                "connections_opened": opened,
+                "requests": sent,
+                "idle_connections": idle,
+                "reuse_ratio": round(1 - opened / sent, 3) if sent > 0 else 0,
+            })
+
+    return stats
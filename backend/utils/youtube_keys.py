@@ -0,0 +1,206 @@
+# backend/utils/youtube_keys.py
+
+import os
+import time
+import threading
+from datetime import datetime, timezone
+from utils.youtube_quota import QuotaBudgetExceeded, current_tracker
+
+try:
+    from zoneinfo import ZoneInfo
+    _QUOTA_TZ = ZoneInfo("America/Los_Angeles")  # YouTube daily quota resets at midnight Pacific
+except Exception:
+    _QUOTA_TZ = timezone.utc
+
+# API-key pool. Configure several keys (optionally weighted) instead of a single YOUTUBE_API_KEY:
+#   YOUTUBE_API_KEYS="keyA:2,keyB,keyC:1"
+# Keys are picked by smooth weighted round-robin. A key answering quotaExceeded is parked for a
+# short cooldown (doubling while it keeps answering quotaExceeded, reset by its next success) and
+# the call fails over to the next key; once the cooldown is over the key is simply tried again.
+# The last usable key is never parked: its caller gets the 403, the next request re-probes it.
+# Usage is tracked per key and per
+# tenant (the caller's role: business / creator, or anonymous for requests without a token).
+#
+# Tenant shares are opt-in. By default every tenant may use the whole pool; to keep one kind of
+# traffic from starving another, cap tenants at a fraction of the pool's daily capacity:
+#   YOUTUBE_TENANT_QUOTA_SHARES="business:0.6,creator:0.6"
+# Unlisted tenants get 1.0. The frontend calls most YouTube routes without a token, so capping
+# "anonymous" caps nearly all traffic. Counters are per worker process, like the quota ledger,
+# so a share limits each worker separately rather than the fleet as a whole.
+
+KEY_DAILY_QUOTA = int(os.getenv("YOUTUBE_KEY_DAILY_QUOTA", "10000"))
+# Cooldown of a key after quotaExceeded: base seconds, doubled per consecutive strike up to the max
+KEY_PARK_SECONDS = float(os.getenv("YOUTUBE_KEY_PARK_SECONDS", "60"))
+KEY_PARK_MAX_SECONDS = float(os.getenv("YOUTUBE_KEY_PARK_MAX_SECONDS", "3600"))
+
+# Max share of the pool's daily capacity per tenant (role); empty = no caps, unlisted tenants get 1.0
+TENANT_SHARES = {
+    name.strip(): float(share)
+    for name, share in (
+        item.split(":", 1)
+        for item in os.getenv("YOUTUBE_TENANT_QUOTA_SHARES", "").split(",")
+        if ":" in item
+    )
+}
+
+
+class KeyPoolExhausted(QuotaBudgetExceeded):
+    """No API key has quota left for this call (or the caller's tenant share is spent)."""
+
+
+class ApiKey:
+    def __init__(self, key, weight=1):
+        self.key = key
+        self.weight = max(1, int(weight))
+        self.used = 0
+        self.calls = 0
+        self.strikes = 0  # consecutive quotaExceeded answers
+        self.parked_until = 0.0  # time.monotonic() before which the key is skipped
+        self.current = 0  # smooth weighted round-robin state
+
+    @property
+    def label(self):
+        # Never expose a full key in stats / logs
+        return "..." + self.key[-4:] if len(self.key) > 4 else "..."
+
+
+def _parse_keys(value):
+    keys = []
+    for item in (value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        key, _, weight = item.partition(":")
+        try:
+            keys.append(ApiKey(key.strip(), int(weight) if weight else 1))
+        except ValueError:
+            keys.append(ApiKey(key.strip()))
+    return keys
+
+
+class KeyPool:
+    def __init__(self, keys, daily_quota=KEY_DAILY_QUOTA, tenant_shares=None,
+                 park_seconds=KEY_PARK_SECONDS, park_max_seconds=KEY_PARK_MAX_SECONDS):
+        self.keys = keys
+        self.daily_quota = daily_quota
+        self.park_seconds = park_seconds
+        self.park_max_seconds = park_max_seconds
+        self.tenant_shares = TENANT_SHARES if tenant_shares is None else tenant_shares
+        self.failovers = 0
+        self.by_tenant = {}
+        self._lock = threading.Lock()
+        self.day = self._today()
+
+    @staticmethod
+    def _today():
+        return datetime.now(_QUOTA_TZ).strftime("%Y-%m-%d")
+
+    def _roll_day(self):
+        today = self._today()
+        if today != self.day:
+            self.day = today
+            self.by_tenant = {}
+            for k in self.keys:
+                k.used = 0
+                k.calls = 0
+                k.strikes = 0
+                k.parked_until = 0.0
+
+    @property
+    def capacity(self):
+        return self.daily_quota * len(self.keys)
+
+    def acquire(self, cost=1, tenant=None, exclude=()):
+        """Pick a key for one upstream call and book `cost` units on it (and on the tenant)."""
+        if not self.keys:
+            # No key configured at all: let the request go out and fail upstream, like before
+            return None
+
+        if tenant is None:
+            tracker = current_tracker()
+            tenant = tracker.tenant if tracker is not None else "background"
+
+        with self._lock:
+            self._roll_day()
+
+            share = self.tenant_shares.get(tenant, 1.0)
+            used_by_tenant = self.by_tenant.get(tenant, 0)
+            if used_by_tenant + cost > share * self.capacity:
+                raise KeyPoolExhausted(f"Daily YouTube quota share for '{tenant}' users is used up")
+
+            now = time.monotonic()
+            candidates = [
+                k for k in self.keys
+                if k not in exclude and k.parked_until <= now and k.used + cost <= self.daily_quota
+            ]
+            if not candidates:
+                raise KeyPoolExhausted("Every YouTube API key is out of quota or cooling down")
+
+            total = sum(k.weight for k in candidates)
+            for k in candidates:
+                k.current += k.weight
+            best = max(candidates, key=lambda k: k.current)
+            best.current -= total
+
+            best.used += cost
+            best.calls += 1
+            self.by_tenant[tenant] = used_by_tenant + cost
+            return best
+
+    def park(self, api_key):
+        """
+        The key answered quotaExceeded: skip it for a cooldown so the call can fail over.
+        Returns False (and parks nothing) when it is the last usable key.
+        """
+        if api_key is None:
+            return False
+        with self._lock:
+            self._roll_day()
+            now = time.monotonic()
+            if not any(k is not api_key and k.parked_until <= now for k in self.keys):
+                return False
+            api_key.strikes += 1
+            cooldown = min(self.park_max_seconds, self.park_seconds * 2 ** (api_key.strikes - 1))
+            api_key.parked_until = now + cooldown
+            self.failovers += 1
+        print(f"YouTube API key {api_key.label} answered quotaExceeded, parked for {int(cooldown)}s")
+        return True
+
+    def mark_ok(self, api_key):
+        """The key answered normally: a later quotaExceeded starts again from the base cooldown."""
+        if api_key is not None and api_key.strikes:
+            with self._lock:
+                api_key.strikes = 0
+
+    def stats(self):
+        with self._lock:
+            self._roll_day()
+            now = time.monotonic()
+            return {
+                "day": self.day,
+                "scope": "worker",
+                "daily_quota_per_key": self.daily_quota,
+                "capacity": self.capacity,
+                "failovers": self.failovers,
+                "keys": [
+                    {
+                        "key": k.label,
+                        "weight": k.weight,
+                        "units": k.used,
+                        "calls": k.calls,
+                        "strikes": k.strikes,
+                        "parked_seconds": max(0, round(k.parked_until - now)),
+                    }
+                    for k in self.keys
+                ],
+                "by_tenant": {
+                    tenant: {
+                        "units": units,
+                        "share_limit": round(self.tenant_shares.get(tenant, 1.0) * self.capacity),
+                    }
+                    for tenant, units in sorted(self.by_tenant.items(), key=lambda x: x[1], reverse=True)
+                },
+            }
+
+
+key_pool = KeyPool(_parse_keys(os.getenv("YOUTUBE_API_KEYS") or os.getenv("YOUTUBE_API_KEY")))
@@ -0,0 +1,203 @@
+# backend/utils/youtube_quota.py
+
+import os
+import threading
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from flask import request, jsonify
+
+# YouTube Data API v3 quota cost (units) per call, by endpoint.
+# Only calls that actually reach googleapis.com are charged; cache hits are free.
+QUOTA_COSTS = {
+    "channels": 1,
+    "playlistItems": 1,
+    "videos": 1,
+    "commentThreads": 1,
+    "comments": 1,
+    "playlists": 1,
+    "search": 100,
+}
+DEFAULT_COST = 1
+
+# Max units a single HTTP request may spend (0 = unlimited).
+# Once reached, fan-out helpers stop and the route returns what it already has, flagged as partial.
+REQUEST_QUOTA_BUDGET = int(os.getenv("YOUTUBE_REQUEST_QUOTA_BUDGET", "0"))
+
+
+class QuotaBudgetExceeded(Exception):
+    """Raised by youtube_get when the current request has spent its quota budget."""
+
+
+def cost_for(endpoint: str):
+    return QUOTA_COSTS.get(endpoint, DEFAULT_COST)
+
+
+class QuotaTracker:
+    """Units spent by one incoming HTTP request (shared with its fan-out threads)."""
+
+    def __init__(self, route: str, user: str, budget: int = REQUEST_QUOTA_BUDGET, tenant: str = "anonymous"):
+        self.route = route
+        self.user = user
+        self.tenant = tenant
+        self.budget = budget
+        self.used = 0
+        self.calls = 0
+        self.by_endpoint = {}
+        self.partial = False
+        self._lock = threading.Lock()
+
+    def charge(self, endpoint: str):
+        cost = cost_for(endpoint)
+        with self._lock:
+            if self.budget > 0 and self.used + cost > self.budget:
+                self.partial = True
+                raise QuotaBudgetExceeded(
+                    f"YouTube quota budget of {self.budget} units exceeded for this request"
+                )
+            self.used += cost
+            self.calls += 1
+            self.by_endpoint[endpoint] = self.by_endpoint.get(endpoint, 0) + cost
+
+
+class QuotaLedger:
+    """Running totals for this worker process, grouped by route, user, tenant and endpoint (reset daily, UTC)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset(self._today())
+
+    @staticmethod
+    def _today():
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def _reset(self, day):
+        self.day = day
+        self.total_units = 0
+        self.total_calls = 0
+        self.requests = 0
+        self.partial_requests = 0
+        self.by_route = {}
+        self.by_user = {}
+        self.by_tenant = {}
+        self.by_endpoint = {}
+
+    def record(self, tracker: QuotaTracker):
+        with self._lock:
+            today = self._today()
+            if today != self.day:
+                self._reset(today)
+
+            self.requests += 1
+            self.total_units += tracker.used
+            self.total_calls += tracker.calls
+            if tracker.partial:
+                self.partial_requests += 1
+
+            route = self.by_route.setdefault(tracker.route, {"units": 0, "requests": 0, "max_units": 0})
+            route["units"] += tracker.used
+            route["requests"] += 1
+            route["max_units"] = max(route["max_units"], tracker.used)
+
+            self.by_user[tracker.user] = self.by_user.get(tracker.user, 0) + tracker.used
+            self.by_tenant[tracker.tenant] = self.by_tenant.get(tracker.tenant, 0) + tracker.used
+
+            for endpoint, units in tracker.by_endpoint.items():
+                self.by_endpoint[endpoint] = self.by_endpoint.get(endpoint, 0) + units
+
+    def stats(self):
+        with self._lock:
+            routes = sorted(self.by_route.items(), key=lambda x: x[1]["units"], reverse=True)
+            return {
+                "day": self.day,
+                "scope": "worker",
+                "pid": os.getpid(),
+                "request_budget": REQUEST_QUOTA_BUDGET,
+                "total_units": self.total_units,
+                "total_calls": self.total_calls,
+                "requests": self.requests,
+                "partial_requests": self.partial_requests,
+                "by_route": [
+                    {
+                        "route": name,
+                        "units": r["units"],
+                        "requests": r["requests"],
+                        "avg_units": round(r["units"] / r["requests"], 1) if r["requests"] else 0,
+                        "max_units": r["max_units"],
+                    }
+                    for name, r in routes
+                ],
+                "by_user": dict(sorted(self.by_user.items(), key=lambda x: x[1], reverse=True)),
+                "by_tenant": dict(sorted(self.by_tenant.items(), key=lambda x: x[1], reverse=True)),
+                "by_endpoint": dict(self.by_endpoint),
+            }
+
+
+quota_ledger = QuotaLedger()
+_current = ContextVar("youtube_quota_tracker", default=None)
+
+
+def current_tracker():
+    return _current.get()
+
+
+def charge(endpoint: str):
+    """Charge one upstream call to the current request (no-op outside a tracked request)."""
+    tracker = _current.get()
+    if tracker is not None:
+        tracker.charge(endpoint)
+
+
+def mark_partial():
+    tracker = _current.get()
+    if tracker is not None:
+        tracker.partial = True
+
+
+def _current_user():
+    """(user, tenant) for the request; tenant is the JWT role (creator / business / admin)."""
+    # YouTube routes don't require a login, so the JWT is optional here
+    try:
+        from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity, get_jwt
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+        if identity is None:
+            return "anonymous", "anonymous"
+        return str(identity), (get_jwt().get("role") or "creator").lower()
+    except Exception:
+        return "anonymous", "anonymous"
+
+
+def init_quota_tracking(app):
+    """Track YouTube quota for every /api/youtube/* request and surface budget overruns."""
+
+    @app.before_request
+    def _start_quota_tracker():
+        if not request.path.startswith("/api/youtube/"):
+            _current.set(None)
+            return
+        route = request.url_rule.rule if request.url_rule else request.path
+        user, tenant = _current_user()
+        _current.set(QuotaTracker(route, user, tenant=tenant))
+
+    @app.after_request
+    def _finish_quota_tracker(resp):
+        tracker = _current.get()
+        if tracker is None:
+            return resp
+
+        _current.set(None)
+        quota_ledger.record(tracker)
+        resp.headers["X-YouTube-Quota-Used"] = str(tracker.used)
+
+        if tracker.partial:
+            resp.headers["X-YouTube-Quota-Partial"] = "1"
+            body = resp.get_json(silent=True) if resp.is_json else None
+            if isinstance(body, dict):
+                body["partial"] = True
+                body["quota_used"] = tracker.used
+                resp.set_data(app.json.dumps(body))
+        return resp
+
+    @app.errorhandler(QuotaBudgetExceeded)
+    def _quota_budget_exceeded(e):
+        return jsonify({"error": str(e), "partial": True}), 429
@@ -0,0 +1,196 @@
+# backend/utils/youtube_retry.py
+
+import os
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+import requests
+
+# Retry policy for upstream YouTube calls
+RETRY_MAX_ATTEMPTS = max(1, int(os.getenv("YOUTUBE_RETRY_MAX_ATTEMPTS", "4")))
+RETRY_BASE_DELAY = float(os.getenv("YOUTUBE_RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("YOUTUBE_RETRY_MAX_DELAY", "8"))
+
+# Circuit breaker: after this many failed upstream attempts in a row, fail fast for the cooldown
+BREAKER_THRESHOLD = int(os.getenv("YOUTUBE_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.getenv("YOUTUBE_BREAKER_COOLDOWN", "30"))
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# quotaExceeded is not here: a key's daily quota doesn't come back within seconds, so it is
+# handled by failing over to another key (utils/youtube_keys.py) and never counts against the breaker
+RETRYABLE_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "backendError"}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling YouTube while the circuit breaker is open."""
+
+
+def error_reason(resp):
+    """Pull the first error reason (e.g. 'quotaExceeded') out of a YouTube error body."""
+    try:
+        errors = resp.json().get("error", {}).get("errors", [])
+        return errors[0].get("reason") if errors else None
+    except Exception:
+        return None
+
+
+def is_retryable(resp):
+    if resp.status_code in RETRYABLE_STATUSES:
+        return True
+    return resp.status_code == 403 and error_reason(resp) in RETRYABLE_REASONS
+
+
+def retry_after_seconds(resp):
+    """Parse Retry-After (seconds or HTTP date); None if missing or unparsable."""
+    value = resp.headers.get("Retry-After") if resp is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+def backoff_delay(attempt: int):
+    """Exponential backoff with full jitter: uniform(0, min(max, base * 2^attempt))."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    closed    -> calls go through, consecutive failures are counted
+    open      -> calls fail immediately with CircuitOpenError until the cooldown ends
+    half_open -> one probe call is let through; success closes, failure re-opens
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            if self.state == "open" and time.time() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+                self._probing = False
+
+            if self.state == "closed":
+                return
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return
+
+            self.rejected += 1
+            remaining = max(0, self.cooldown - (time.time() - self.opened_at))
+            raise CircuitOpenError(f"YouTube API temporarily unavailable (retry in {remaining:.0f}s)")
+
+    def release(self):
+        """The call ended without an upstream verdict (e.g. a local quota error): free the half-open probe."""
+        with self._lock:
+            if self.state == "half_open":
+                self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                if self.state != "open":
+                    self.times_opened += 1
+                self.state = "open"
+                self.opened_at = time.time()
+                self._probing = False
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "threshold": self.threshold,
+                "cooldown_seconds": self.cooldown,
+                "times_opened": self.times_opened,
+                "rejected_calls": self.rejected,
+            }
+
+
+breaker = CircuitBreaker()
+_retry_count = 0
+_retry_lock = threading.Lock()
+
+
+def _count_retry():
+    global _retry_count
+    with _retry_lock:
+        _retry_count += 1
+
+
+def call_with_retry(send):
+    """
+    Call send() (which performs one upstream request and returns the response) with retries.
+    Retries network errors, 429/5xx and 403 rate-limit reasons, honoring Retry-After.
+    Returns the last response (the caller still calls raise_for_status) or re-raises the last network error.
+    """
+    for attempt in range(RETRY_MAX_ATTEMPTS):
+        breaker.allow()
+        last_try = attempt == RETRY_MAX_ATTEMPTS - 1
+
+        try:
+            resp = send()
+        except (requests.ConnectionError, requests.Timeout):
+            breaker.record_failure()
+            if last_try:
+                raise
+            _count_retry()
+            time.sleep(backoff_delay(attempt))
+            continue
+        except Exception:
+            breaker.release()
+            raise
+
+        if not is_retryable(resp):
+            breaker.record_success()
+            return resp
+
+        breaker.record_failure()
+        if last_try:
+            return resp
+
+        delay = retry_after_seconds(resp)
+        if delay is None:
+            delay = backoff_delay(attempt)
+        elif delay > RETRY_MAX_DELAY:
+            # Upstream asked us to wait longer than we're willing to hold a worker thread
+            return resp
+
+        _count_retry()
+        time.sleep(delay)
+
+
+def retry_stats():
+    return {
+        "max_attempts": RETRY_MAX_ATTEMPTS,
+        "base_delay": RETRY_BASE_DELAY,
+        "max_delay": RETRY_MAX_DELAY,
+        "retries": _retry_count,
+        "breaker": breaker.stats(),
+    }
@@ -1,22 +1,150 @@
 # backend/utils/youtube_utils.py
 
 import os
+import json
+import time
 import requests
 from urllib.parse import urlparse
-
-API_KEY = os.getenv("YOUTUBE_API_KEY")
-YOUTUBE_API_BASE = "https://www.googleapis.com/youtube/v3"
+from utils.youtube_http import http_get
+from utils.concurrency import bounded_map, submit
+from utils.youtube_cache import response_cache, make_cache_key, ttl_for
+from utils.youtube_disk_cache import disk_cache
+from utils.single_flight import SingleFlight
+from utils.youtube_quota import QuotaBudgetExceeded, charge, mark_partial, cost_for
+from utils.youtube_retry import call_with_retry, CircuitOpenError, error_reason
+from utils.youtube_keys import key_pool
+from utils import video_catalog
+from utils.video_frame import VideoFrame
+
+YOUTUBE_API_BASE = os.getenv("YOUTUBE_API_BASE", "https://www.googleapis.com/youtube/v3")
+
+# Partial-response field masks (the API's `fields` parameter): each helper downloads only what it parses.
+# etag / nextPageToken are kept so revalidation and pagination keep working.
+CHANNEL_STATS_FIELDS = "etag,items(statistics(subscriberCount,viewCount),contentDetails/relatedPlaylists/uploads,snippet/title)"
+PLAYLIST_ITEMS_FIELDS = "etag,nextPageToken,items/contentDetails/videoId"
+VIDEO_STATS_FIELDS = "statistics(viewCount,likeCount,commentCount)"
+VIDEO_SNIPPET_FIELDS = "snippet(title,publishedAt,thumbnails(medium/url,default/url,high/url))"
+VIDEO_DURATION_FIELDS = "contentDetails/duration"
+FULL_VIDEO_PARTS = "statistics,snippet,contentDetails"
+COMMENT_FIELDS = "etag,nextPageToken,items/snippet/topLevelComment/snippet(textDisplay,publishedAt)"
+
+
+def video_fields(with_snippet: bool = True, with_duration: bool = False):
+    """Field mask for a videos call matching the parts fetch_video_stats asks for."""
+    masks = ["id", VIDEO_STATS_FIELDS]
+    if with_snippet:
+        masks.append(VIDEO_SNIPPET_FIELDS)
+    if with_duration:
+        masks.append(VIDEO_DURATION_FIELDS)
+    return "etag,items(" + ",".join(masks) + ")"
+
+
+# Identical upstream calls that are in flight at the same moment are sent only once.
+# Results and transport errors are shared; a leader's quota / key-pool refusal depends on its own
+# request budget and tenant, so coalesced callers retry under their own instead.
+in_flight = SingleFlight(private_errors=(QuotaBudgetExceeded,))
 
 
 # All controllers should access the YouTube API through this function.
-def youtube_get(endpoint: str, params: dict, timeout: int = 10):
+# Responses are cached per endpoint + params in two tiers: an in-process LRU (utils/youtube_cache.py)
+# and a host-wide SQLite file shared by every worker (utils/youtube_disk_cache.py).
+# Expired entries are revalidated with If-None-Match: a 304 just extends the TTL of the body we already have.
+# Concurrent callers asking for the same endpoint + params share one upstream request (single-flight).
+# Every upstream call is charged to the current request's quota tracker (utils/youtube_quota.py).
+# fields is the API's partial-response mask (e.g. "items(id,statistics)"); it is part of the cache key.
+# Pass use_cache=False to force a fresh upstream call.
+def youtube_get(endpoint: str, params: dict, timeout: int = 10, use_cache: bool = True, fields: str = None):
+    if fields:
+        params = dict(params)
+        params["fields"] = fields
+
+    cache_key = make_cache_key(endpoint, params)
+    if use_cache:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        on_disk = disk_cache.get(cache_key)
+        if on_disk is not None:
+            body, expires_at = on_disk
+            data = json.loads(body)
+            response_cache.set(cache_key, data, int(expires_at - time.time()), size=len(body), etag=data.get("etag"))
+            return data
+
+    return in_flight.do(
+        (cache_key, use_cache),
+        lambda: _fetch_upstream(endpoint, params, cache_key, timeout, use_cache),
+    )
+
+
+def _fetch_upstream(endpoint: str, params: dict, cache_key: str, timeout: int, use_cache: bool):
+    stale = _find_stale(cache_key) if use_cache else None
+
     params = dict(params)  # Make a copy to prevent the dictionary from being modified when it is sent in from outside
-    params["key"] = API_KEY
     url = f"{YOUTUBE_API_BASE}/{endpoint}"
+    ttl = ttl_for(endpoint, params)
+
+    headers = {"If-None-Match": stale["etag"]} if stale else None
+
+    def send():
+        # Quota is charged per upstream attempt (raises QuotaBudgetExceeded once this request's budget is spent)
+        charge(endpoint)
+
+        # Key from the pool; a key answering quotaExceeded cools down and the next one is tried
+        tried = []
+        while True:
+            api_key = key_pool.acquire(cost_for(endpoint), exclude=tried)
+            if api_key is not None:
+                params["key"] = api_key.key
+            # Shared keep-alive session: repeated calls reuse pooled connections to googleapis.com
+            resp = http_get(url, params=params, headers=headers, timeout=timeout)
+            if api_key is None:
+                return resp
+            if resp.status_code != 403 or error_reason(resp) != "quotaExceeded":
+                key_pool.mark_ok(api_key)
+                return resp
+            if not key_pool.park(api_key):
+                return resp
+            tried.append(api_key)
+
+    # Transient 429/5xx/rate-limit failures are retried with backoff; fails fast while the breaker is open
+    resp = call_with_retry(send)
+
+    if stale and resp.status_code == 304:
+        data = stale["data"]
+        if data is None:
+            # Only the disk tier had it: parse once and put it back in memory
+            data = json.loads(stale["body"])
+            response_cache.set(cache_key, data, ttl, size=len(stale["body"]), etag=stale["etag"])
+        else:
+            response_cache.refresh(cache_key, ttl)
+        disk_cache.refresh(cache_key, ttl)
+        return data
 
-    resp = requests.get(url, params=params, timeout=timeout)
     resp.raise_for_status()
-    return resp.json()
+    data = resp.json()
+
+    if use_cache:
+        etag = resp.headers.get("ETag") or data.get("etag")
+        response_cache.set(cache_key, data, ttl, size=len(resp.content), etag=etag)
+        disk_cache.set(cache_key, resp.content, ttl, etag=etag)
+
+    return data
+
+
+def _find_stale(cache_key: str):
+    """Look for an expired-but-revalidatable copy (memory first, then disk)."""
+    in_memory = response_cache.peek_stale(cache_key)
+    if in_memory is not None:
+        data, etag = in_memory
+        return {"data": data, "body": None, "etag": etag}
+
+    on_disk = disk_cache.get_stale(cache_key)
+    if on_disk is not None:
+        body, etag = on_disk
+        return {"data": None, "body": body, "etag": etag}
+
+    return None
 
 
 # got channelId (- Directly upload channelId (starting with UC)  / Upload YouTube Channel URL)
@@ -40,6 +168,12 @@ def extract_channel_id(url_or_id: str):
     except Exception:
         pass
 
+    # @handle, /user/ and /c/ URLs: resolved once through the channel index, then served from it
+    from utils.channel_index import parse_channel_alias, resolve_alias
+    alias = parse_channel_alias(url_or_id)
+    if alias:
+        return resolve_alias(alias)
+
     return None
 
 
@@ -52,7 +186,7 @@ def fetch_basic_channel_stats(channel_id: str):
         "maxResults": 1,
     }
 
-    data = youtube_get("channels", params)
+    data = youtube_get("channels", params, fields=CHANNEL_STATS_FIELDS)
     items = data.get("items", [])
     if not items:
         return None
@@ -62,6 +196,10 @@ def fetch_basic_channel_stats(channel_id: str):
     uploads_playlist = item["contentDetails"]["relatedPlaylists"]["uploads"]
     snippet = item.get("snippet", {})
 
+    # Keep the channel resolution index warm (no-op when it already knows this channel)
+    from utils.channel_index import remember_channel
+    remember_channel(channel_id, uploads_playlist, snippet.get("title", ""))
+
     return {
         "subscriberCount": int(stats.get("subscriberCount", 0)),
         "viewCount": int(stats.get("viewCount", 0)),
@@ -76,6 +214,7 @@ def fetch_video_ids(playlist_id: str, max_videos: int = 50):
     """Fetch up to max_videos videoIds from a channel uploads playlist.
 
     NOTE: YouTube Data API playlistItems maxResults is 50, so we must paginate.
+    Known uploads are kept per playlist, so usually only the newest page is fetched.
     """
     if not playlist_id:
         return []
@@ -88,8 +227,21 @@ def fetch_video_ids(playlist_id: str, max_videos: int = 50):
     if max_videos <= 0:
         return []
 
+    # Lazy import: uploads_sync depends on this module
+    from utils.uploads_sync import sync_uploads
+    return sync_uploads(playlist_id, max_videos)
+
+
+def page_playlist_ids(playlist_id: str, max_videos: int, known=None):
+    """
+    Page through playlistItems (newest first) and return (video_ids, exhausted, hit_known).
+    Stops at max_videos, at the end of the playlist (exhausted) or, when `known` is given,
+    at the first already-known id (hit_known; that id is not included).
+    """
     video_ids = []
     page_token = None
+    exhausted = False
+    hit_known = False
 
     while len(video_ids) < max_videos:
         remaining = max_videos - len(video_ids)
@@ -101,93 +253,208 @@ def fetch_video_ids(playlist_id: str, max_videos: int = 50):
         if page_token:
             params["pageToken"] = page_token
 
-        pl_data = youtube_get("playlistItems", params)
+        try:
+            pl_data = youtube_get("playlistItems", params, fields=PLAYLIST_ITEMS_FIELDS)
+        except QuotaBudgetExceeded:
+            # Out of budget: keep the ids we already have
+            mark_partial()
+            break
+        except (requests.RequestException, CircuitOpenError) as e:
+            # Upstream still failing after retries: keep earlier pages rather than failing the whole request
+            if not video_ids:
+                raise
+            print(f"Stopped paging playlist {playlist_id}: {e}")
+            mark_partial()
+            break
 
         for item in pl_data.get("items", []):
             vid = item.get("contentDetails", {}).get("videoId")
+            if known and vid in known:
+                hit_known = True
+                break
             if vid:
                 video_ids.append(vid)
             if len(video_ids) >= max_videos:
                 break
 
+        if hit_known:
+            break
+
         page_token = pl_data.get("nextPageToken")
         if not page_token:
+            exhausted = True
             break
 
-    return video_ids
+    return video_ids, exhausted, hit_known
 
 
 # Retrieve statistical information based on videoIds (shared with videos.list and similarity analysis)
 # UPDATED: Now includes thumbnail support
 
-def fetch_video_stats(video_ids, with_snippet: bool = True, with_duration: bool = False):
+def fetch_video_stats(video_ids, with_snippet: bool = True, with_duration: bool = False, concurrent: bool = True,
+                      as_frame: bool = False):
+    """
+    Stats (+ snippet / duration) of many videos, in input order.
+    as_frame=True returns a columnar VideoFrame (utils/video_frame.py) instead of a list of dicts.
+    """
+    videos = _fetch_video_stats(video_ids, with_snippet, with_duration, concurrent)
+    return VideoFrame.from_videos(videos) if as_frame else videos
+
+
+def _fetch_video_stats(video_ids, with_snippet: bool, with_duration: bool, concurrent: bool):
     if not video_ids:
         return []
 
-    # YouTube allows a maximum of 50 IDs at a time, so here's a simple breakdown.
+    video_ids = list(dict.fromkeys(video_ids))
+
+    if not with_snippet and not with_duration:
+        items = _fetch_video_items([(video_ids, "statistics", video_fields(False, False))], concurrent)
+        return [_build_video(vid, items[vid], {}, False, False) for vid in video_ids if vid in items]
+
+    # Snippet / contentDetails come from the local catalog; only statistics are volatile
+    known = video_catalog.lookup(video_ids)
+    cached = [vid for vid in video_ids if video_catalog.has_parts(known.get(vid), with_snippet, with_duration)]
+    cached_set = set(cached)
+    missing = [vid for vid in video_ids if vid not in cached_set]
+
+    # Unknown videos get every part at once (same quota) so later requests hit the catalog
+    items = _fetch_video_items([
+        (cached, "statistics", video_fields(False, False)),
+        (missing, FULL_VIDEO_PARTS, video_fields(True, True)),
+    ], concurrent)
+
+    fetched_meta = {vid: _parse_video_meta(items[vid]) for vid in missing if vid in items}
+    video_catalog.store(fetched_meta)
+
     all_videos = []
-    for i in range(0, len(video_ids), 50):
-        batch = video_ids[i: i + 50]
-        
-        # Build parts list based on what's needed
-        parts = ["statistics"]
-        if with_snippet:
-            parts.append("snippet")
-        if with_duration:
-            parts.append("contentDetails")
-        
-        part = ",".join(parts)
+    for vid in video_ids:
+        if vid not in items:
+            continue
+        meta = fetched_meta[vid] if vid in fetched_meta else known[vid]
+        all_videos.append(_build_video(vid, items[vid], meta, with_snippet, with_duration))
+
+    return all_videos
 
+
+def hydrate_videos(video_ids, concurrent: bool = True):
+    """
+    Bulk-load catalog metadata (title, publishedAt, thumbnail, duration) for many ids.
+    Only ids missing from the local store are requested, 50 per call, without statistics.
+    Returns {video_id: metadata}; ids YouTube doesn't know are absent.
+    """
+    video_ids = [vid for vid in dict.fromkeys(video_ids) if vid]
+    if not video_ids:
+        return {}
+
+    known = video_catalog.lookup(video_ids)
+    missing = [vid for vid in video_ids if not video_catalog.has_parts(known.get(vid), True, True)]
+    if missing:
+        fields = "etag,items(" + ",".join(["id", VIDEO_SNIPPET_FIELDS, VIDEO_DURATION_FIELDS]) + ")"
+        items = _fetch_video_items([(missing, "snippet,contentDetails", fields)], concurrent)
+        fetched = {vid: _parse_video_meta(item) for vid, item in items.items()}
+        video_catalog.store(fetched)
+        known.update(fetched)
+
+    return {vid: known[vid] for vid in video_ids if vid in known}
+
+
+def _fetch_video_items(groups, concurrent: bool = True):
+    """
+    videos.list for groups of (video_ids, part, fields) -> {video_id: raw item}.
+    All batches of all groups share one bounded fan-out. Failed batches are skipped (partial).
+    """
+    # YouTube allows a maximum of 50 IDs at a time, so here's a simple breakdown.
+    batches = [
+        (video_ids[i: i + 50], part, fields)
+        for video_ids, part, fields in groups
+        for i in range(0, len(video_ids), 50)
+    ]
+
+    def fetch_batch(task):
+        batch, part, fields = task
         params = {
             "part": part,
             "id": ",".join(batch),
             "maxResults": 50,
         }
+        try:
+            return youtube_get("videos", params, fields=fields)
+        except QuotaBudgetExceeded:
+            # Out of budget: skip this batch, the route returns the batches that made it
+            mark_partial()
+            return {}
+        except (requests.RequestException, CircuitOpenError) as e:
+            # One batch still failing after retries must not throw away the others
+            print(f"Skipped videos batch starting at {batch[0]}: {e}")
+            mark_partial()
+            return {}
+
+    # Batches are sent in parallel (bounded by YOUTUBE_MAX_CONCURRENCY); results keep input order.
+    responses = bounded_map(fetch_batch, batches, concurrent=concurrent)
+
+    items = {}
+    for data in responses:
+        for item in data.get("items", []):
+            if item.get("id"):
+                items[item["id"]] = item
+    return items
 
-        data = youtube_get("videos", params)
 
-        for item in data.get("items", []):
-            st = item.get("statistics", {})
-            sn = item.get("snippet", {}) if with_snippet else {}
-            cd = item.get("contentDetails", {}) if with_duration else {}
-
-            def safe_int(x):
-                try:
-                    return int(x)
-                except Exception:
-                    return 0
-
-            video = {
-                "id": item["id"],
-                "views": safe_int(st.get("viewCount")),
-                "likes": safe_int(st.get("likeCount")),
-                "comments": safe_int(st.get("commentCount")),
-            }
-
-            if with_snippet:
-                video["title"] = sn.get("title", "")
-                video["publishedAt"] = sn.get("publishedAt", "")
-                
-                # Add thumbnail support
-                thumbnails = sn.get("thumbnails", {})
-                thumbnail_url = ""
-                if "medium" in thumbnails:
-                    thumbnail_url = thumbnails["medium"]["url"]
-                elif "default" in thumbnails:
-                    thumbnail_url = thumbnails["default"]["url"]
-                elif "high" in thumbnails:
-                    thumbnail_url = thumbnails["high"]["url"]
-                
-                video["thumbnail"] = thumbnail_url
-            
-            if with_duration:
-                # Parse ISO 8601 duration (e.g., "PT15M33S" = 15 minutes 33 seconds)
-                duration_str = cd.get("duration", "PT0S")
-                video["duration"] = parse_iso8601_duration(duration_str)
-
-            all_videos.append(video)
+def _safe_int(x):
+    try:
+        return int(x)
+    except Exception:
+        return 0
 
-    return all_videos
+
+def _parse_video_meta(item):
+    """Catalog metadata (the parts that don't change) from a raw videos item."""
+    meta = {}
+    sn = item.get("snippet")
+    cd = item.get("contentDetails")
+
+    if sn is not None:
+        meta["title"] = sn.get("title", "")
+        meta["publishedAt"] = sn.get("publishedAt", "")
+
+        # Add thumbnail support
+        thumbnails = sn.get("thumbnails", {})
+        thumbnail_url = ""
+        if "medium" in thumbnails:
+            thumbnail_url = thumbnails["medium"]["url"]
+        elif "default" in thumbnails:
+            thumbnail_url = thumbnails["default"]["url"]
+        elif "high" in thumbnails:
+            thumbnail_url = thumbnails["high"]["url"]
+
+        meta["thumbnail"] = thumbnail_url
+
+    if cd is not None:
+        # Parse ISO 8601 duration (e.g., "PT15M33S" = 15 minutes 33 seconds)
+        meta["duration"] = parse_iso8601_duration(cd.get("duration", "PT0S"))
+
+    return meta
+
+
+def _build_video(video_id, item, meta, with_snippet: bool, with_duration: bool):
+    st = item.get("statistics", {})
+
+    video = {
+        "id": video_id,
+        "views": _safe_int(st.get("viewCount")),
+        "likes": _safe_int(st.get("likeCount")),
+        "comments": _safe_int(st.get("commentCount")),
+    }
+
+    if with_snippet:
+        video["title"] = meta.get("title", "")
+        video["publishedAt"] = meta.get("publishedAt", "")
+        video["thumbnail"] = meta.get("thumbnail", "")
+
+    if with_duration:
+        video["duration"] = meta.get("duration", 0)
+
+    return video
 
 
 def parse_iso8601_duration(duration_str):
@@ -214,22 +481,39 @@ def parse_iso8601_duration(duration_str):
     return hours * 3600 + minutes * 60 + seconds
 
 # Retrieve top-level comments for a given video
-def fetch_video_comments(video_id: str, max_comments: int = 50):
+def iter_video_comments(video_id: str, max_comments: int = 50):
     """
-    Fetch top-level comments from a video.
-    Returns a list of dicts with text + publishedAt.
+    Generator over a video's top-level comments, one page (list of {text, publishedAt}) at a time.
+    Follows nextPageToken until max_comments is reached or the thread runs out.
+    While the caller works on a page, the next page is already being fetched in the background.
     """
-    comments = []
     try:
+        max_comments = int(max_comments)
+    except Exception:
+        max_comments = 50
+
+    if not video_id or max_comments <= 0:
+        return
+
+    def fetch_page(page_token, remaining):
         params = {
             "part": "snippet",
             "videoId": video_id,
-            "maxResults": min(max_comments, 100),
+            "maxResults": min(remaining, 100),
             "textFormat": "plainText",
         }
+        if page_token:
+            params["pageToken"] = page_token
+        return youtube_get("commentThreads", params, fields=COMMENT_FIELDS)
+
+    remaining = max_comments
+    pending = submit(fetch_page, None, remaining)
 
-        data = youtube_get("commentThreads", params)
+    while pending is not None:
+        data = pending.result()
+        pending = None
 
+        page = []
         for item in data.get("items", []):
             snippet = (
                 item.get("snippet", {})
@@ -241,33 +525,50 @@ def fetch_video_comments(video_id: str, max_comments: int = 50):
             published_at = snippet.get("publishedAt")
 
             if text and published_at:
-                comments.append({
+                page.append({
                     "text": text,
                     "publishedAt": published_at
                 })
+            if len(page) >= remaining:
+                break
+
+        remaining -= len(page)
+        page_token = data.get("nextPageToken")
+
+        # Prefetch the next page before handing this one to the caller
+        if page_token and remaining > 0:
+            pending = submit(fetch_page, page_token, remaining)
+
+        if page:
+            yield page
 
+
+def fetch_video_comments(video_id: str, max_comments: int = 50):
+    """
+    Fetch top-level comments from a video (all pages, up to max_comments).
+    Returns a list of dicts with text + publishedAt.
+    """
+    comments = []
+    try:
+        for page in iter_video_comments(video_id, max_comments):
+            comments.extend(page)
     except Exception as e:
+        # Keep whatever pages arrived before the failure
         print(f"Error fetching comments for video {video_id}: {e}")
 
     return comments
 
 
+def fetch_video_titles(video_ids):
+    """
+    Fetch titles for many videos at once -> {video_id: title}.
+    Served from the local video catalog; only unknown ids are requested (50 per call).
+    """
+    return {vid: meta.get("title", "") for vid, meta in hydrate_videos(video_ids).items()}
+
+
 def fetch_video_title(video_id: str):
     """
     Fetch the title of a single video by ID.
     """
-    try:
-        params = {
-            "part": "snippet",
-            "id": video_id,
-            "maxResults": 1
-        }
-        data = youtube_get("videos", params)
-        items = data.get("items", [])
-        if not items:
-            return None
-        snippet = items[0].get("snippet", {})
-        return snippet.get("title", None)
-    except Exception as e:
-        print(f"Error fetching title for video {video_id}: {e}")
-        return None
+    return fetch_video_titles([video_id]).get(video_id) or None